@@ -8,7 +8,8 @@ import json
 import logging
 import queue
 import time
-from datetime import datetime
+from collections import Counter
+from datetime import date, datetime
 from functools import wraps
 from threading import Thread, Lock
 from typing import Any, Dict, Optional
@@ -16,17 +17,41 @@ from urllib.error import URLError
 import urllib.request
 from urllib.parse import quote_plus, urlparse, unquote
 
-from flask import Flask, jsonify, request, Response, stream_with_context
+from flask import Flask, current_app, jsonify, request, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from sqlalchemy import or_
+from sqlalchemy import String, cast, insert, or_, select, type_coerce, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import selectinload
 
 from config import get_config
-from models import db, Listing, ScraperJob, ScraperConfig, PriceHistory, Tag, ArchivedListing, listing_tags
+from models import (
+    db, Listing, ListingView, ScraperJob, ScraperConfig, PriceHistory, Tag, ArchivedListing, listing_tags,
+    bulk_attach_tags, ACTION_TYPES, JOB_STATUSES,
+    UserPreferences, ItemAnalysis, UserInteraction, LearnedPreference, BrandAffinity,
+)
+from ml_learning import (
+    analyze_interaction_patterns,
+    calculate_confidence,
+    get_effective_user_weights,
+    learn_from_interaction,
+)
+from scoring_engine import score_listings_batch
 from classifier import classify_item_type, classify_laptop_category
 from tag_extractor import extract_tags
-from scraper import KleinanzeigenScraper, RobotsChecker
+from scraper import BrowserUnavailableError, KleinanzeigenScraper, RobotsChecker, TokenBucket
 from sse import progress_manager
 
+try:
+    import redis
+except ImportError:  # Optional: without it listing payloads are serialized per request
+    redis = None
+
+try:
+    import orjson
+except ImportError:  # Optional: without it responses use the stdlib encoder
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,6 +60,49 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class JSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when it is installed.
+    
+    Model to_dict() methods return raw datetimes; both paths write them as
+    ISO 8601 (orjson natively, the stdlib fallback through default()).
+    """
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+    
+    def _orjson_option(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode()
+    
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._orjson_option(indent)),
+            mimetype=self.mimetype,
+        )
+
+
 def create_app(config=None):
     """
     Application factory for creating Flask app instances.
@@ -46,6 +114,7 @@ def create_app(config=None):
         Flask: Configured Flask application instance.
     """
     app = Flask(__name__)
+    app.json = JSONProvider(app)
     
     # Load configuration
     if config is None:
@@ -54,6 +123,14 @@ def create_app(config=None):
     
     # Initialize extensions
     db.init_app(app)
+    if redis is not None and app.config.get('CACHE_REDIS_URL'):
+        # Shared across gunicorn workers: listing payloads and the scraper config
+        app.extensions['redis_cache'] = RedisJSONCache(
+            redis.Redis.from_url(app.config['CACHE_REDIS_URL']),
+            app.json,
+            key_prefix=app.config.get('CACHE_KEY_PREFIX', ''),
+            default_timeout=app.config.get('CACHE_DEFAULT_TIMEOUT', 600),
+        )
     
     # Configure CORS
     CORS(app, origins=app.config.get('CORS_ORIGINS', ['http://localhost:5173']))
@@ -64,6 +141,112 @@ def create_app(config=None):
     return app
 
 
+class RedisJSONCache:
+    """
+    Shared cache on a Redis client that stores values as JSON.
+    
+    Values are encoded and decoded with the app's JSON provider, so nothing
+    read back from Redis is ever unpickled. Offers the get/set/delete and
+    get_many/set_many calls of Flask-Caching that the app uses.
+    """
+    
+    def __init__(self, client, json_provider, key_prefix: str = '', default_timeout: int = 600):
+        self.client = client
+        self.json = json_provider
+        self.key_prefix = key_prefix
+        self.default_timeout = default_timeout
+    
+    def _ttl(self, timeout: Optional[int]) -> Optional[int]:
+        # Like Flask-Caching: None means the default, 0 means no expiry
+        timeout = self.default_timeout if timeout is None else timeout
+        return timeout or None
+    
+    def _decode(self, raw: Optional[bytes]) -> Any:
+        return None if raw is None else self.json.loads(raw)
+    
+    def get(self, key: str) -> Any:
+        return self._decode(self.client.get(self.key_prefix + key))
+    
+    def set(self, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        self.client.set(self.key_prefix + key, self.json.dumps(value).encode(), ex=self._ttl(timeout))
+    
+    def delete(self, key: str) -> None:
+        self.client.delete(self.key_prefix + key)
+    
+    def get_many(self, *keys: str) -> list[Any]:
+        return [self._decode(raw) for raw in self.client.mget([self.key_prefix + key for key in keys])]
+    
+    def set_many(self, mapping: dict[str, Any], timeout: Optional[int] = None) -> None:
+        ttl = self._ttl(timeout)
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(self.key_prefix + key, self.json.dumps(value).encode(), ex=ttl)
+        pipe.execute()
+
+
+def load_price_history(listings: list) -> None:
+    """
+    Load price_history for a page of Listing rows with one SELECT ... IN.
+    
+    The relationship only loads on access, so endpoints that serialize
+    listings picked from a larger query call this for just the returned page.
+    """
+    ids = [listing.id for listing in listings]
+    if ids:
+        db.session.scalars(
+            db.select(Listing)
+            .where(Listing.id.in_(ids))
+            .options(selectinload(Listing.price_history))
+            .execution_options(populate_existing=True)
+        ).all()
+
+
+def serialize_listings(listings: list) -> list[dict[str, Any]]:
+    """
+    Serialize listings with to_dict(), reusing cached payloads when configured.
+    
+    Payloads are stored as JSON keyed by (id, updated_at), so a changed
+    listing gets a new key and its old entry simply expires. Falls back to
+    plain to_dict() when no cache is set up or the cache is unreachable.
+    
+    Args:
+        listings: Listing or ListingView instances.
+    
+    Returns:
+        List of listing dicts in the same order.
+    """
+    cache = current_app.extensions.get('redis_cache')
+    if cache is None or not listings:
+        return [listing.to_dict() for listing in listings]
+    
+    keys = [
+        f"listing:{listing.id}:{listing.updated_at.timestamp() if listing.updated_at else 0}"
+        for listing in listings
+    ]
+    try:
+        payloads = cache.get_many(*keys)
+    except Exception as e:
+        logger.warning(f"Listing cache read failed: {e}")
+        return [listing.to_dict() for listing in listings]
+    
+    results = []
+    misses = {}
+    for listing, key, payload in zip(listings, keys, payloads):
+        if payload is None:
+            data = listing.to_dict()
+            misses[key] = data
+        else:
+            data = payload
+        results.append(data)
+    
+    if misses:
+        try:
+            cache.set_many(misses)
+        except Exception as e:
+            logger.warning(f"Listing cache write failed: {e}")
+    return results
+
+
 def init_db(app):
     """
     Initialize database tables safely with proper locking.
@@ -187,7 +370,11 @@ def register_routes(app: Flask):
         # Keyword filter (filter by search keyword tag)
         keyword = request.args.get('keyword', '').strip()
         if keyword:
-            query = query.filter(Listing.search_keywords.ilike(f'%{keyword}%'))
+            if db.engine.dialect.name == 'postgresql':
+                # Array containment, served by the GIN index
+                query = query.filter(type_coerce(Listing.search_keywords, ARRAY(String)).contains([keyword]))
+            else:
+                query = query.filter(cast(Listing.search_keywords, String).contains(json.dumps(keyword)))
 
         # Item type filter (laptop/accessory/other)
         item_type = request.args.get('item_type', '').strip().lower()
@@ -291,11 +478,13 @@ def register_routes(app: Flask):
         else:
             query = query.order_by(sort_column.desc())
         
-        # Execute paginated query
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        # Execute paginated query; rows become plain ListingView objects, not ORM instances
+        pagination = query.with_entities(*ListingView.columns()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
         
         return jsonify({
-            'data': [listing.to_dict() for listing in pagination.items],
+            'data': serialize_listings(ListingView.from_rows(pagination.items)),
             'pagination': {
                 'page': pagination.page,
                 'per_page': pagination.per_page,
@@ -318,7 +507,7 @@ def register_routes(app: Flask):
             JSON response with listing data or 404 error.
         """
         listing = Listing.query.get_or_404(listing_id)
-        return jsonify({'data': listing.to_dict()})
+        return jsonify({'data': serialize_listings([listing])[0]})
     
     # Keywords endpoint
     @app.route('/api/v1/keywords', methods=['GET'])
@@ -330,20 +519,13 @@ def register_routes(app: Flask):
         Returns:
             JSON response with array of unique keywords and their counts.
         """
-        # Get all search_keywords from listings
-        listings_with_keywords = Listing.query.filter(
-            Listing.search_keywords.isnot(None),
-            Listing.search_keywords != ''
-        ).all()
+        # Get all search_keywords lists (column only, no Listing objects)
+        keyword_lists = db.session.query(Listing.search_keywords).filter(
+            Listing.search_keywords.isnot(None)
+        )
         
         # Count occurrences of each keyword
-        keyword_counts = {}
-        for listing in listings_with_keywords:
-            keywords = listing.search_keywords.split(',')
-            for kw in keywords:
-                kw = kw.strip()
-                if kw:
-                    keyword_counts[kw] = keyword_counts.get(kw, 0) + 1
+        keyword_counts = Counter(kw for (keywords,) in keyword_lists for kw in keywords)
         
         # Sort by count descending
         sorted_keywords = sorted(
@@ -550,20 +732,19 @@ def register_routes(app: Flask):
         Returns:
             JSON response with the generated sync code.
         """
-        # Generate a unique sync code
-        max_attempts = 10
-        for _ in range(max_attempts):
-            code = ArchivedListing.generate_sync_code()
-            # Check if code already exists
-            existing = ArchivedListing.query.filter_by(sync_code=code).first()
-            if not existing:
-                return jsonify({
-                    'data': {'sync_code': code}
-                })
+        # Draw a handful of candidates and check them in one query
+        candidates = {ArchivedListing.generate_sync_code() for _ in range(10)}
+        taken = {
+            code for (code,) in db.session.query(ArchivedListing.sync_code).filter(
+                ArchivedListing.sync_code.in_(candidates)
+            ).distinct()
+        }
+        free = candidates - taken
         
         # Fallback: return a code anyway (collision is very unlikely)
+        code = free.pop() if free else ArchivedListing.generate_sync_code()
         return jsonify({
-            'data': {'sync_code': ArchivedListing.generate_sync_code()}
+            'data': {'sync_code': code}
         })
     
     @app.route('/api/v1/archive', methods=['GET'])
@@ -582,13 +763,15 @@ def register_routes(app: Flask):
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
         
-        archived = ArchivedListing.query.filter_by(sync_code=sync_code).all()
+        listing_ids = db.session.scalars(
+            select(ArchivedListing.listing_id).where(ArchivedListing.sync_code == sync_code)
+        ).all()
         
         return jsonify({
             'data': {
                 'sync_code': sync_code,
-                'listing_ids': [a.listing_id for a in archived],
-                'count': len(archived)
+                'listing_ids': listing_ids,
+                'count': len(listing_ids)
             }
         })
     
@@ -908,7 +1091,7 @@ def register_routes(app: Flask):
             return {}
 
         # Get admin config for scraper settings
-        admin_config = ScraperConfig.get_config()
+        admin_config = ScraperConfig.get_cached()
 
         page_limit = page_limit_override if page_limit_override is not None else admin_config.page_limit
         page_limit = int(page_limit)
@@ -922,17 +1105,15 @@ def register_routes(app: Flask):
             concurrency = 1
         concurrency = max(1, min(concurrency, 4))
 
-        # Parse keywords into list (each will be searched separately)
-        keywords_raw = admin_config.keywords.strip() if admin_config.keywords else ''
-        keywords_list = [k.strip() for k in keywords_raw.split(',') if k.strip()]
+        # Keywords as a list (each will be searched separately)
+        keywords_list = admin_config.keywords_list
 
         # If no keywords, scrape base URL once
         if not keywords_list:
             keywords_list = ['']  # Empty string = no keyword filter
 
-        # Parse categories into list (scrape each category)
-        categories_raw = admin_config.categories.strip() if admin_config.categories else ''
-        categories_list = [c.strip() for c in categories_raw.split(',') if c.strip()] or ['c278']
+        # Categories as a list (scrape each category)
+        categories_list = admin_config.categories_list or ['c278']
 
         # Get city setting
         city_slug = admin_config.city.strip() if admin_config.city else ''
@@ -956,10 +1137,15 @@ def register_routes(app: Flask):
         total_pages_scraped = 0
         keywords_processed: set[str] = set()
 
+        # One bucket for the whole job: all workers together stay at one
+        # request per delay_seconds on average (bursts of 2)
+        delay_seconds = max(app.config['SCRAPER_DELAY_SECONDS'], KleinanzeigenScraper.MIN_DELAY_SECONDS)
         scraper_kwargs = {
-            'delay_seconds': app.config['SCRAPER_DELAY_SECONDS'],
+            'delay_seconds': delay_seconds,
             'page_limit': page_limit,
             'browser_type': app.config['PLAYWRIGHT_BROWSER'],
+            'fetch_mode': app.config.get('SCRAPER_FETCH_MODE', 'http'),
+            'rate_limiter': TokenBucket(capacity=2, rate=1 / delay_seconds),
         }
 
         seen_external_ids: set[str] = set()
@@ -1020,13 +1206,10 @@ def register_routes(app: Flask):
                     no_new_pages = 0
 
                 # Stop early if we keep seeing only duplicates / empty pages.
+                # (Pacing between pages comes from the job's rate limiter.)
                 if not page_listings or no_new_pages >= 2:
                     break
 
-                # Polite delay between pages
-                if page_num < page_limit:
-                    time.sleep(scraper.delay_seconds)
-
             return listings_data, pages_scraped_local
 
         def _merge_task_results(category: str, keyword: str, task_listings: list[dict[str, Any]]):
@@ -1061,13 +1244,16 @@ def register_routes(app: Flask):
             proxy_attempts.append(None)  # Always allow fallback to direct.
 
             last_open_error: Optional[Exception] = None
+            # Tasks before this index are done; a proxy switch resumes here
+            next_task = 0
             for attempt_proxy in proxy_attempts:
                 scraper = KleinanzeigenScraper(**scraper_kwargs, proxy=attempt_proxy)
                 try:
-                    with scraper.open_page() as page:
-                        robots_checker.fetch_robots(page)
+                    with scraper.page_session() as page:
+                        scraper.fetch_robots(robots_checker, page)
 
-                        for idx, (category, keyword) in enumerate(tasks):
+                        for idx in range(next_task, len(tasks)):
+                            category, keyword = tasks[idx]
                             elapsed = time.time() - start_time
                             current_display = _display_for_task(category, keyword)
                             if keyword:
@@ -1094,9 +1280,12 @@ def register_routes(app: Flask):
                                 logger.info(
                                     f"Task {idx + 1}/{total_tasks}: {len(task_listings)} listings, {len(listings_by_id)} unique total"
                                 )
+                            except BrowserUnavailableError:
+                                # Not this task's fault: retry it via the next proxy
+                                raise
                             except Exception as e:
                                 logger.error(f"Error scraping category={category} keyword='{keyword}': {e}")
-                                continue
+                            next_task = idx + 1
 
                     last_open_error = None
                     break
@@ -1105,6 +1294,8 @@ def register_routes(app: Flask):
                     proxy_label = attempt_proxy.get('server') if attempt_proxy else 'direct'
                     logger.warning(f"Playwright launch/navigation failed via proxy={proxy_label}: {e}")
                     continue
+                finally:
+                    scraper.close()
 
             if last_open_error is not None:
                 raise last_open_error
@@ -1131,17 +1322,20 @@ def register_routes(app: Flask):
                 proxy_attempts.append(None)  # Always allow fallback to direct.
 
                 last_error: Optional[Exception] = None
+                # Task interrupted by a browser that failed to start, retried via the next proxy
+                pending_task: Optional[tuple] = None
                 try:
                     for attempt_proxy in proxy_attempts:
                         worker_scraper = KleinanzeigenScraper(**scraper_kwargs, proxy=attempt_proxy)
                         proxy_label = attempt_proxy.get('server') if attempt_proxy else 'direct'
                         try:
-                            with worker_scraper.open_page() as page:
+                            with worker_scraper.page_session() as page:
                                 worker_robots = RobotsChecker('https://www.kleinanzeigen.de/s-notebooks/c278')
-                                worker_robots.fetch_robots(page)
+                                worker_scraper.fetch_robots(worker_robots, page)
 
                                 while True:
-                                    task = task_queue.get()
+                                    task = pending_task if pending_task is not None else task_queue.get()
+                                    pending_task = None
                                     if task is None:
                                         break
                                     idx, category, keyword = task
@@ -1167,6 +1361,9 @@ def register_routes(app: Flask):
                                             'worker_id': worker_id,
                                             'proxy': proxy_label,
                                         })
+                                    except BrowserUnavailableError:
+                                        pending_task = task
+                                        raise
                                     except Exception as e:
                                         result_queue.put({
                                             'event': 'task_error',
@@ -1189,8 +1386,21 @@ def register_routes(app: Flask):
                                 'error': str(e),
                             })
                             continue
+                        finally:
+                            worker_scraper.close()
 
                     if last_error is not None:
+                        if pending_task is not None:
+                            idx, category, keyword = pending_task
+                            result_queue.put({
+                                'event': 'task_error',
+                                'idx': idx,
+                                'category': category,
+                                'keyword': keyword,
+                                'error': str(last_error),
+                                'worker_id': worker_id,
+                                'proxy': proxy_label,
+                            })
                         result_queue.put({'event': 'worker_error', 'worker_id': worker_id, 'error': str(last_error)})
                 finally:
                     result_queue.put({'event': 'worker_done', 'worker_id': worker_id})
@@ -1271,28 +1481,25 @@ def register_routes(app: Flask):
                 t.join(timeout=1)
 
         # Process all collected results (unique by external_id)
-        new_count = 0
         updated_count = 0
 
-        # Helper function to get or create tags
-        def get_or_create_tags(title: str, description: str) -> list:
-            """Extract tags from listing text and return Tag objects."""
-            extracted = extract_tags(title, description)
-            tag_objects = []
-            for category, value in extracted:
-                # Try to find existing tag
-                tag = Tag.query.filter_by(category=category, value=value).first()
-                if not tag:
-                    tag = Tag(category=category, value=value)
-                    db.session.add(tag)
-                    db.session.flush()  # Get tag ID
-                tag_objects.append(tag)
-            return tag_objects
+        # Existing rows for this batch in one query, only the columns the
+        # update needs (price for history, keywords to merge)
+        existing_by_id = {
+            row.external_id: row
+            for row in db.session.execute(
+                select(Listing.id, Listing.external_id, Listing.price_eur, Listing.search_keywords)
+                .where(Listing.external_id.in_(list(listings_by_id)))
+            )
+        }
+        new_rows = []
+        update_rows = []
+        history_rows = []
+        tags_by_id = {}
 
         for ext_id, listing_info in listings_by_id.items():
             listing_data = listing_info['data']
             keywords_set = listing_info['keywords']
-            keywords_str = ','.join(sorted(keywords_set)) if keywords_set else ''
             new_price_cents = int(listing_data['price'] * 100) if listing_data.get('price') else None
             
             title = listing_data.get('title', '')
@@ -1305,58 +1512,69 @@ def register_routes(app: Flask):
                 laptop_category = classify_laptop_category(title, description)
             
             # Extract hardware tags
-            tags = get_or_create_tags(title, description)
+            tags_by_id[ext_id] = extract_tags(title, description)
 
-            existing = Listing.query.filter_by(external_id=ext_id).first()
+            existing = existing_by_id.get(ext_id)
             if existing:
                 # Track price history if price changed
                 if existing.price_eur != new_price_cents:
-                    db.session.add(PriceHistory(listing_id=existing.id, price=new_price_cents))
-
-                existing.title = listing_data['title']
-                existing.price_eur = new_price_cents
-                existing.price_negotiable = listing_data['price_negotiable']
-                existing.location_city = listing_data['city']
-                existing.location_state = listing_data['state']
-                existing.description = listing_data['description']
-                existing.condition = listing_data['condition']
-                existing.image_url = listing_data['image_url']
-                existing.item_type = item_type
-                existing.laptop_category = laptop_category
-                existing.updated_at = datetime.utcnow()
-
-                # Merge keywords
-                if existing.search_keywords:
-                    existing_keywords = {k.strip() for k in existing.search_keywords.split(',') if k.strip()}
-                    merged_keywords = existing_keywords | keywords_set
-                    existing.search_keywords = ','.join(sorted(merged_keywords))
-                else:
-                    existing.search_keywords = keywords_str
-                
-                # Update tags (replace with new extractions)
-                existing.tags = []
-                for tag in tags:
-                    if tag not in existing.tags.all():
-                        existing.tags.append(tag)
+                    history_rows.append({'listing_id': existing.id, 'price': new_price_cents})
+
+                update_rows.append({
+                    'id': existing.id,
+                    'title': listing_data['title'],
+                    'price_eur': new_price_cents,
+                    'price_negotiable': listing_data['price_negotiable'],
+                    'location_city': listing_data['city'],
+                    'location_state': listing_data['state'],
+                    'description': listing_data['description'],
+                    'condition': listing_data['condition'],
+                    'image_url': listing_data['image_url'],
+                    'item_type': item_type,
+                    'laptop_category': laptop_category,
+                    'updated_at': datetime.utcnow(),
+                    # Merge keywords
+                    'search_keywords': sorted(set(existing.search_keywords or []) | keywords_set),
+                })
 
                 updated_count += 1
             else:
                 listing_data['item_type'] = item_type
                 listing_data['laptop_category'] = laptop_category
-                new_listing = Listing.from_scraped_dict(listing_data)
-                new_listing.search_keywords = keywords_str
-                db.session.add(new_listing)
-                db.session.flush()  # Get the ID
-                
-                # Associate tags with new listing
-                for tag in tags:
-                    new_listing.tags.append(tag)
+                listing_data['search_keywords'] = sorted(keywords_set)
+                new_rows.append(listing_data)
+
+        # Existing listings: one executemany UPDATE by primary key
+        if update_rows:
+            db.session.execute(update(Listing), update_rows)
 
-                # Add initial price to history
-                if new_price_cents is not None:
-                    db.session.add(PriceHistory(listing_id=new_listing.id, price=new_price_cents))
+        # New listings: one batched INSERT ... RETURNING instead of an add/flush per row
+        new_ids = Listing.bulk_from_scraped(new_rows)
 
-                new_count += 1
+        # Add initial price to history
+        history_rows.extend(
+            {'listing_id': new_ids[data['external_id']], 'price': int(data['price'] * 100)}
+            for data in new_rows
+            if data['external_id'] in new_ids and data.get('price')
+        )
+        if history_rows:
+            db.session.execute(insert(PriceHistory), history_rows)
+
+        # Hardware tags: resolve every tag once, replace links of updated
+        # listings and attach all links in a single batch
+        tag_ids = Tag.resolve_ids(pair for pairs in tags_by_id.values() for pair in pairs)
+        listing_ids = {ext_id: listing.id for ext_id, listing in existing_by_id.items()}
+        listing_ids.update(new_ids)
+        if existing_by_id:
+            db.session.execute(listing_tags.delete().where(
+                listing_tags.c.listing_id.in_([listing.id for listing in existing_by_id.values()])
+            ))
+        bulk_attach_tags([
+            (listing_ids[ext_id], tag_ids[pair])
+            for ext_id, pairs in tags_by_id.items() if ext_id in listing_ids
+            for pair in pairs
+        ])
+        new_count = len(new_ids)
 
         db.session.commit()
 
@@ -1410,15 +1628,20 @@ def register_routes(app: Flask):
         per_page = request.args.get('per_page', 20, type=int)
         status = request.args.get('status', '').strip()
         
+        if status and status not in JOB_STATUSES:
+            return jsonify({'error': f'status must be one of: {", ".join(JOB_STATUSES)}'}), 400
+        
         query = ScraperJob.query
         if status:
             query = query.filter(ScraperJob.status == status)
         
         query = query.order_by(ScraperJob.created_at.desc())
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        pagination = query.with_entities(*ScraperJob.api_columns()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
         
         return jsonify({
-            'data': [job.to_dict() for job in pagination.items],
+            'data': [row._asdict() for row in pagination.items],
             'pagination': {
                 'page': pagination.page,
                 'per_page': pagination.per_page,
@@ -1455,7 +1678,7 @@ def register_routes(app: Flask):
         stream = bool(data.get('stream', False))
 
         # Get admin config for default settings
-        admin_config = ScraperConfig.get_config()
+        admin_config = ScraperConfig.get_cached()
         page_limit_raw = data.get('page_limit', admin_config.page_limit)
         concurrency_raw = data.get('concurrency', app.config.get('SCRAPER_CONCURRENCY', 1))
 
@@ -1651,7 +1874,7 @@ def register_routes(app: Flask):
         Returns:
             JSON response with scraper configuration settings.
         """
-        config = ScraperConfig.get_config()
+        config = ScraperConfig.get_cached()
         return jsonify({'data': config.to_dict()})
     
     @app.route('/api/v1/admin/config', methods=['PUT'])
@@ -1698,6 +1921,7 @@ def register_routes(app: Flask):
             config.is_active = bool(data['is_active'])
         
         db.session.commit()
+        ScraperConfig.invalidate()
         logger.info(f"Admin config updated: {config.to_dict()}")
         
         return jsonify({
@@ -1764,8 +1988,6 @@ def register_routes(app: Flask):
         Returns:
             JSON response with user preferences or empty defaults.
         """
-        from models import UserPreferences
-        
         sync_code = request.headers.get('X-Sync-Code', '').strip()
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
@@ -1808,8 +2030,6 @@ def register_routes(app: Flask):
         Returns:
             JSON response with saved preferences.
         """
-        from models import UserPreferences
-        
         sync_code = request.headers.get('X-Sync-Code', '').strip()
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
@@ -1881,9 +2101,6 @@ def register_routes(app: Flask):
         Returns:
             JSON response with must-see listings and their scores.
         """
-        from models import UserPreferences, ItemAnalysis, LearnedPreference, BrandAffinity
-        from scoring_engine import score_listing
-        
         sync_code = request.headers.get('X-Sync-Code', '').strip()
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
@@ -1899,24 +2116,26 @@ def register_routes(app: Flask):
             })
         
         # Get effective learned weights with time decay and confidence
-        from ml_learning import get_effective_learned_weights, get_effective_brand_affinities
-        learned_keywords = get_effective_learned_weights(sync_code, LearnedPreference, apply_decay=True)
-        brand_affinities = get_effective_brand_affinities(sync_code, BrandAffinity, apply_decay=True)
+        learned_keywords, brand_affinities = get_effective_user_weights(
+            sync_code, LearnedPreference, BrandAffinity, apply_decay=True
+        )
         
         # Check for cached analyses
         cached = ItemAnalysis.query.filter_by(
             sync_code=sync_code,
             classification='must_see'
+        ).options(
+            # One IN query for the listings (and one each for their tags and
+            # price history) instead of a lazy load per analysis
+            selectinload(ItemAnalysis.listing).selectinload(Listing.price_history)
         ).order_by(ItemAnalysis.total_score.desc()).limit(limit).all()
         
         if cached:
             # Return cached results with listings
-            results = []
-            for analysis in cached:
-                if analysis.listing:
-                    listing_dict = analysis.listing.to_dict()
-                    listing_dict['match_score'] = analysis.to_dict()
-                    results.append(listing_dict)
+            cached = [analysis for analysis in cached if analysis.listing]
+            results = serialize_listings([analysis.listing for analysis in cached])
+            for listing_dict, analysis in zip(results, cached):
+                listing_dict['match_score'] = analysis.to_dict()
             return jsonify({'data': results})
         
         # Calculate scores on-the-fly
@@ -1924,35 +2143,22 @@ def register_routes(app: Flask):
         cutoff = datetime.utcnow() - timedelta(days=2)
         listings = Listing.query.filter(Listing.posted_at >= cutoff).all()
         
-        results = []
-        for listing in listings:
-            score_data = score_listing(listing, prefs, learned_keywords, brand_affinities)
-            if score_data['classification'] == 'must_see':
-                # Cache the score
-                analysis = ItemAnalysis.query.filter_by(
-                    listing_id=listing.id, sync_code=sync_code
-                ).first()
-                if not analysis:
-                    analysis = ItemAnalysis(listing_id=listing.id, sync_code=sync_code)
-                    db.session.add(analysis)
-                
-                analysis.keyword_score = score_data['keyword_score']
-                analysis.price_score = score_data['price_score']
-                analysis.brand_score = score_data['brand_score']
-                analysis.learned_bonus = score_data['learned_bonus']
-                analysis.total_score = score_data['total_score']
-                analysis.classification = score_data['classification']
-                analysis.analyzed_at = datetime.utcnow()
-                
-                listing_dict = listing.to_dict()
-                listing_dict['match_score'] = score_data
-                results.append(listing_dict)
-        
+        # Score the whole batch at once and cache every match in one upsert
+        matched = [
+            (listing, score_data)
+            for listing, score_data in score_listings_batch(listings, prefs, learned_keywords, brand_affinities)
+            if score_data.classification == 'must_see'
+        ]
+        ItemAnalysis.bulk_upsert(sync_code, [(listing.id, score_data) for listing, score_data in matched])
         db.session.commit()
         
-        # Sort by score and limit
-        results.sort(key=lambda x: x['match_score']['total_score'], reverse=True)
-        return jsonify({'data': results[:limit]})
+        # Already sorted by score; serialize only the returned page
+        matched = matched[:limit]
+        load_price_history([listing for listing, _ in matched])
+        results = serialize_listings([listing for listing, _ in matched])
+        for listing_dict, (_, score_data) in zip(results, matched):
+            listing_dict['match_score'] = score_data._asdict()
+        return jsonify({'data': results})
     
     @app.route('/api/v1/items/recommended', methods=['GET'])
     @app.route('/api/v1/items/recommended/', methods=['GET'])
@@ -1969,9 +2175,6 @@ def register_routes(app: Flask):
         Returns:
             JSON response with recommended listings and their scores.
         """
-        from models import UserPreferences, ItemAnalysis, LearnedPreference, BrandAffinity
-        from scoring_engine import score_listing
-        
         sync_code = request.headers.get('X-Sync-Code', '').strip()
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
@@ -1986,23 +2189,23 @@ def register_routes(app: Flask):
             })
         
         # Get effective learned weights with time decay and confidence
-        from ml_learning import get_effective_learned_weights, get_effective_brand_affinities
-        learned_keywords = get_effective_learned_weights(sync_code, LearnedPreference, apply_decay=True)
-        brand_affinities = get_effective_brand_affinities(sync_code, BrandAffinity, apply_decay=True)
+        learned_keywords, brand_affinities = get_effective_user_weights(
+            sync_code, LearnedPreference, BrandAffinity, apply_decay=True
+        )
         
         # Check for cached analyses
         cached = ItemAnalysis.query.filter_by(
             sync_code=sync_code,
             classification='recommended'
+        ).options(
+            selectinload(ItemAnalysis.listing).selectinload(Listing.price_history)
         ).order_by(ItemAnalysis.total_score.desc()).limit(limit).all()
         
         if cached:
-            results = []
-            for analysis in cached:
-                if analysis.listing:
-                    listing_dict = analysis.listing.to_dict()
-                    listing_dict['match_score'] = analysis.to_dict()
-                    results.append(listing_dict)
+            cached = [analysis for analysis in cached if analysis.listing]
+            results = serialize_listings([analysis.listing for analysis in cached])
+            for listing_dict, analysis in zip(results, cached):
+                listing_dict['match_score'] = analysis.to_dict()
             return jsonify({'data': results})
         
         # Calculate scores on-the-fly
@@ -2010,34 +2213,22 @@ def register_routes(app: Flask):
         cutoff = datetime.utcnow() - timedelta(days=2)
         listings = Listing.query.filter(Listing.posted_at >= cutoff).all()
         
-        results = []
-        for listing in listings:
-            score_data = score_listing(listing, prefs, learned_keywords, brand_affinities)
-            if score_data['classification'] == 'recommended':
-                # Cache the score
-                analysis = ItemAnalysis.query.filter_by(
-                    listing_id=listing.id, sync_code=sync_code
-                ).first()
-                if not analysis:
-                    analysis = ItemAnalysis(listing_id=listing.id, sync_code=sync_code)
-                    db.session.add(analysis)
-                
-                analysis.keyword_score = score_data['keyword_score']
-                analysis.price_score = score_data['price_score']
-                analysis.brand_score = score_data['brand_score']
-                analysis.learned_bonus = score_data['learned_bonus']
-                analysis.total_score = score_data['total_score']
-                analysis.classification = score_data['classification']
-                analysis.analyzed_at = datetime.utcnow()
-                
-                listing_dict = listing.to_dict()
-                listing_dict['match_score'] = score_data
-                results.append(listing_dict)
-        
+        # Score the whole batch at once and cache every match in one upsert
+        matched = [
+            (listing, score_data)
+            for listing, score_data in score_listings_batch(listings, prefs, learned_keywords, brand_affinities)
+            if score_data.classification == 'recommended'
+        ]
+        ItemAnalysis.bulk_upsert(sync_code, [(listing.id, score_data) for listing, score_data in matched])
         db.session.commit()
         
-        results.sort(key=lambda x: x['match_score']['total_score'], reverse=True)
-        return jsonify({'data': results[:limit]})
+        # Already sorted by score; serialize only the returned page
+        matched = matched[:limit]
+        load_price_history([listing for listing, _ in matched])
+        results = serialize_listings([listing for listing, _ in matched])
+        for listing_dict, (_, score_data) in zip(results, matched):
+            listing_dict['match_score'] = score_data._asdict()
+        return jsonify({'data': results})
     
     @app.route('/api/v1/interactions', methods=['POST'])
     def log_interaction():
@@ -2055,8 +2246,6 @@ def register_routes(app: Flask):
         Returns:
             JSON response confirming the interaction.
         """
-        from models import UserInteraction, LearnedPreference, BrandAffinity
-        
         sync_code = request.headers.get('X-Sync-Code', '').strip()
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
@@ -2069,7 +2258,7 @@ def register_routes(app: Flask):
         if not listing_id:
             return jsonify({'error': 'listing_id is required'}), 400
         
-        valid_actions = {'view', 'click', 'save', 'dismiss', 'contact'}
+        valid_actions = set(ACTION_TYPES)
         if action_type not in valid_actions:
             return jsonify({'error': f'action_type must be one of: {valid_actions}'}), 400
         
@@ -2088,7 +2277,6 @@ def register_routes(app: Flask):
         db.session.add(interaction)
         
         # Use enhanced ML learning
-        from ml_learning import learn_from_interaction
         learning_result = learn_from_interaction(
             interaction=interaction,
             listing=listing,
@@ -2124,14 +2312,6 @@ def register_routes(app: Flask):
             JSON response with learned keyword weights, brand affinities,
             and optionally interaction statistics.
         """
-        from models import LearnedPreference, BrandAffinity, UserInteraction
-        from ml_learning import (
-            get_effective_learned_weights,
-            get_effective_brand_affinities,
-            calculate_confidence,
-            analyze_interaction_patterns,
-        )
-        
         sync_code = request.headers.get('X-Sync-Code', '').strip()
         if not sync_code:
             return jsonify({'error': 'X-Sync-Code header is required'}), 400
@@ -2148,11 +2328,8 @@ def register_routes(app: Flask):
         ).all()
         
         # Get effective weights with time decay and confidence
-        effective_keywords = get_effective_learned_weights(
-            sync_code, LearnedPreference, apply_decay=True
-        )
-        effective_brands = get_effective_brand_affinities(
-            sync_code, BrandAffinity, apply_decay=True
+        effective_keywords, effective_brands = get_effective_user_weights(
+            sync_code, LearnedPreference, BrandAffinity, apply_decay=True
         )
         
         response_data = {
@@ -2163,7 +2340,7 @@ def register_routes(app: Flask):
                     'effective_weight': round(effective_keywords.get(lp.keyword, 0), 3),
                     'confidence': round(calculate_confidence(lp.interaction_count or 0), 2),
                     'interactions': lp.interaction_count or 0,
-                    'last_updated': lp.last_updated.isoformat() if lp.last_updated else None,
+                    'last_updated': lp.last_updated,
                 }
                 for lp in learned_prefs
             ],
@@ -2174,7 +2351,7 @@ def register_routes(app: Flask):
                     'effective_affinity': round(effective_brands.get(ba.brand, 0), 3),
                     'confidence': round(calculate_confidence(ba.interaction_count or 0), 2),
                     'interactions': ba.interaction_count or 0,
-                    'last_updated': ba.last_updated.isoformat() if ba.last_updated else None,
+                    'last_updated': ba.last_updated,
                 }
                 for ba in brand_affs
             ]
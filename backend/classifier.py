@@ -3,13 +3,24 @@ Lightweight listing classification helpers.
 
 This module intentionally avoids Playwright/BS4 imports so it can be used in
 startup/migration code and anywhere else that only needs heuristic text rules.
+
+Each pattern group is fused into a single alternation and compiled with RE2
+(google-re2) when available, which matches in linear time without
+backtracking. None of the patterns use backreferences or lookaround, so they
+are RE2-compatible; the stdlib ``re`` engine is used as a fallback.
 """
 
 from __future__ import annotations
 
-import re
 from typing import Optional
 
+try:
+    import re2 as _re
+except ImportError:  # pragma: no cover - google-re2 is optional
+    import re as _re
+
+__all__ = ("classify_item_type", "classify_laptop_category")
+
 
 _LAPTOP_WORD_PATTERNS = (
     r"\bnotebook\b",
@@ -225,6 +236,49 @@ _2IN1_PATTERNS = (
 )
 
 
+def _compile_group(patterns: tuple) -> "_re.Pattern":
+    """Fuse a pattern group into one compiled alternation (one scan per group)."""
+    return _re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+_LAPTOP_WORD_RE = _compile_group(_LAPTOP_WORD_PATTERNS)
+_LAPTOP_MODEL_RE = _compile_group(_LAPTOP_MODEL_PATTERNS)
+_HARDWARE_RE = _compile_group(_HARDWARE_PATTERNS)
+_STRONG_ACCESSORY_RE = _compile_group(_STRONG_ACCESSORY_PATTERNS)
+_COMMON_ACCESSORY_RE = _compile_group(_COMMON_ACCESSORY_PATTERNS)
+_TABLET_RE = _compile_group(_TABLET_PATTERNS)
+
+_GAMING_LAPTOP_RE = _compile_group(_GAMING_LAPTOP_PATTERNS)
+_BUSINESS_LAPTOP_RE = _compile_group(_BUSINESS_LAPTOP_PATTERNS)
+_ULTRABOOK_RE = _compile_group(_ULTRABOOK_PATTERNS)
+_WORKSTATION_RE = _compile_group(_WORKSTATION_PATTERNS)
+_2IN1_RE = _compile_group(_2IN1_PATTERNS)
+
+# Only the compiled alternations are needed at runtime; drop the source tuples
+# so preloaded gunicorn workers share just the compiled objects.
+del (
+    _LAPTOP_WORD_PATTERNS, _LAPTOP_MODEL_PATTERNS, _HARDWARE_PATTERNS,
+    _STRONG_ACCESSORY_PATTERNS, _COMMON_ACCESSORY_PATTERNS, _TABLET_PATTERNS,
+    _GAMING_LAPTOP_PATTERNS, _BUSINESS_LAPTOP_PATTERNS, _ULTRABOOK_PATTERNS,
+    _WORKSTATION_PATTERNS, _2IN1_PATTERNS,
+)
+
+
+# RE2's \s, \w and \b are ASCII-only, while the patterns were written for
+# Unicode ``re``. Scraped text keeps NBSP and similar spaces, so fold every
+# other whitespace character to a plain space before matching.
+_WHITESPACE_TO_SPACE = {
+    c: " " for c in range(0x3001) if chr(c).isspace() and chr(c) not in " \t\n\r\f"
+}
+
+
+def _match_text(title: str, description: Optional[str]) -> tuple[str, str]:
+    """Lowercased (title, title + description) with whitespace folded to ASCII."""
+    title_text = title.lower().translate(_WHITESPACE_TO_SPACE)
+    description_text = (description or '').lower().translate(_WHITESPACE_TO_SPACE)
+    return title_text, f"{title_text}\n{description_text}"
+
+
 def classify_item_type(title: str, description: Optional[str] = None) -> str:
     """
     Classify a listing as 'laptop', 'accessory', or 'other' using heuristics.
@@ -232,15 +286,14 @@ def classify_item_type(title: str, description: Optional[str] = None) -> str:
     This does not attempt to be perfect; it is tuned for UI filtering and can
     be overridden by selecting "All" in the UI.
     """
-    title_text = title.lower()
-    text = f"{title_text}\n{(description or '').lower()}"
+    title_text, text = _match_text(title, description)
 
-    has_hardware = any(re.search(p, text) for p in _HARDWARE_PATTERNS)
-    has_laptop_word = any(re.search(p, text) for p in _LAPTOP_WORD_PATTERNS)
-    has_laptop_model = any(re.search(p, text) for p in _LAPTOP_MODEL_PATTERNS)
-    has_strong_accessory = any(re.search(p, title_text) for p in _STRONG_ACCESSORY_PATTERNS)
-    has_common_accessory = any(re.search(p, title_text) for p in _COMMON_ACCESSORY_PATTERNS)
-    has_tablet = any(re.search(p, text) for p in _TABLET_PATTERNS)
+    has_hardware = _HARDWARE_RE.search(text) is not None
+    has_laptop_word = _LAPTOP_WORD_RE.search(text) is not None
+    has_laptop_model = _LAPTOP_MODEL_RE.search(text) is not None
+    has_strong_accessory = _STRONG_ACCESSORY_RE.search(title_text) is not None
+    has_common_accessory = _COMMON_ACCESSORY_RE.search(title_text) is not None
+    has_tablet = _TABLET_RE.search(text) is not None
 
     # If it looks like a real device (CPU/RAM/screen size), treat it as a laptop.
     if has_hardware:
@@ -283,22 +336,22 @@ def classify_laptop_category(title: str, description: Optional[str] = None) -> O
     Returns:
         One of: 'gaming', 'business', 'ultrabook', 'workstation', '2in1', or None.
     """
-    text = f"{title.lower()}\n{(description or '').lower()}"
+    _, text = _match_text(title, description)
     
     # Check patterns in priority order
-    if any(re.search(p, text) for p in _GAMING_LAPTOP_PATTERNS):
+    if _GAMING_LAPTOP_RE.search(text):
         return 'gaming'
     
-    if any(re.search(p, text) for p in _WORKSTATION_PATTERNS):
+    if _WORKSTATION_RE.search(text):
         return 'workstation'
     
-    if any(re.search(p, text) for p in _2IN1_PATTERNS):
+    if _2IN1_RE.search(text):
         return '2in1'
     
-    if any(re.search(p, text) for p in _BUSINESS_LAPTOP_PATTERNS):
+    if _BUSINESS_LAPTOP_RE.search(text):
         return 'business'
     
-    if any(re.search(p, text) for p in _ULTRABOOK_PATTERNS):
+    if _ULTRABOOK_RE.search(text):
         return 'ultrabook'
     
     # No specific category detected
@@ -8,6 +8,8 @@ database connections, scraper settings, and security parameters.
 import os
 from pathlib import Path
 
+from sqlalchemy.pool import NullPool
+
 
 class Config:
     """Base configuration class with default settings."""
@@ -24,6 +26,36 @@ class Config:
     )
     SQLALCHEMY_DATABASE_URI = DATABASE_URL
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool for server databases. Scraper worker threads and API
+    # requests share one engine per gunicorn worker, so size it above the
+    # default 5+10; pre_ping drops connections the server has closed.
+    if not DATABASE_URL.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', '10')),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '20')),
+            'pool_timeout': 30,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True,
+        }
+
+    # psycopg2 (the default PostgreSQL driver): besides folding executemany
+    # INSERTs into multi-row VALUES, send the bulk UPDATEs of the scraper's
+    # change path through execute_batch in pages instead of one round trip
+    # per row
+    if DATABASE_URL.startswith(('postgresql://', 'postgresql+psycopg2://')):
+        SQLALCHEMY_ENGINE_OPTIONS.update({
+            'executemany_mode': 'values_plus_batch',
+            'insertmanyvalues_page_size': 1000,
+            'executemany_batch_page_size': 500,
+        })
+
+    # One-shot init script (INIT_DB_MODE=1 python init_db.py): don't pool, so no
+    # idle connection outlives the script and occupies a slot gunicorn needs
+    if os.environ.get('INIT_DB_MODE') == '1':
+        SQLALCHEMY_ENGINE_OPTIONS = {'poolclass': NullPool}
+        if DATABASE_URL.startswith('postgresql'):
+            SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {'connect_timeout': 5}
     
     # Scraper settings
     SCRAPER_BASE_URL = os.environ.get(
@@ -34,6 +66,8 @@ class Config:
     SCRAPER_DELAY_SECONDS = float(os.environ.get('SCRAPER_DELAY_SECONDS', '3.0'))
     SCRAPER_CONCURRENCY = int(os.environ.get('SCRAPER_CONCURRENCY', '1'))
     PLAYWRIGHT_BROWSER = os.environ.get('PLAYWRIGHT_BROWSER', 'chromium')
+    # 'http': plain request first, browser only as fallback; 'playwright': always render
+    SCRAPER_FETCH_MODE = os.environ.get('SCRAPER_FETCH_MODE', 'http')
     
     # Proxy settings (optional)
     HTTP_PROXY = os.environ.get('HTTP_PROXY')
@@ -41,6 +75,11 @@ class Config:
     SCRAPER_PROXY_URLS = os.environ.get('SCRAPER_PROXY_URLS', '')
     SCRAPER_PROXY_LIST_URL = os.environ.get('SCRAPER_PROXY_LIST_URL', '')
     
+    # Listing payload cache (JSON values in Redis); disabled unless a Redis URL is set
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', '')
+    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_DEFAULT_TIMEOUT', '600'))
+    CACHE_KEY_PREFIX = 'kleinanzeigen:'
+    
     # Rate limiting
     RATELIMIT_DEFAULT = os.environ.get('RATELIMIT_DEFAULT', '100 per hour')
     
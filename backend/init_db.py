@@ -6,28 +6,41 @@ Run this before starting gunicorn to ensure tables exist.
 Handles race conditions by using advisory locks.
 """
 
+import json
+import multiprocessing
+import os
 import sys
 import time
-from sqlalchemy import text, inspect
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+from sqlalchemy import text, inspect, update
 from sqlalchemy.exc import IntegrityError, ProgrammingError, OperationalError
 
 from app import create_app
-from classifier import classify_item_type, classify_laptop_category
-from models import db, ScraperConfig, Listing, PriceHistory, Tag, listing_tags, ArchivedListing
+from models import (
+    db, ScraperConfig, Listing, PriceHistory, Tag, listing_tags, ArchivedListing, SchemaMeta,
+    ACTION_TYPES, ITEM_CLASSIFICATIONS, JOB_STATUSES,
+)
 
+# Bump this whenever apply_migrations() gains a new step. Databases already
+# recorded at this version skip all migration introspection on startup.
+TARGET_SCHEMA_VERSION = 17
 
-def wait_for_db(app, max_retries=30, delay=1):
-    """Wait for database to be ready."""
+
+def wait_for_db(app, max_retries=30, initial_delay=0.1, max_delay=5.0):
+    """Wait for database to be ready, backing off exponentially between probes."""
     with app.app_context():
         for i in range(max_retries):
             try:
-                db.session.execute(text("SELECT 1"))
-                db.session.close()
+                # Probe on a raw connection; no session bookkeeping needed here
+                with db.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
                 print(f"Database is ready")
                 return True
             except OperationalError as e:
                 print(f"Waiting for database... ({i+1}/{max_retries})")
-                time.sleep(delay)
+                time.sleep(min(initial_delay * 2 ** i, max_delay))
         return False
 
 
@@ -57,177 +70,485 @@ def seed_default_config(app):
             db.session.rollback()
 
 
+# Rows per UPDATE ... WHERE id IN (...) statement (and per commit) during backfills
+BACKFILL_BATCH_SIZE = 500
+
+# Classification is CPU-bound regex work. Spawning a process pool costs about a
+# second (workers re-import the app), so it is only used on multi-core hosts once a
+# full batch shows the backfill is large; smaller backfills classify inline.
+CLASSIFY_BATCH_SIZE = 2000
+
+# Lock ID 12345 is arbitrary - just needs to be consistent across processes
+MIGRATION_LOCK_ID = 12345
+
+
+def lock_migrations(conn):
+    """
+    Serialize schema changes across concurrently starting workers.
+    
+    Uses a transaction-scoped advisory lock (PostgreSQL only), so it is released
+    automatically when the surrounding transaction commits or rolls back.
+    """
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {'id': MIGRATION_LOCK_ID})
+
+
+def table_exists(conn, table_name):
+    """Check whether a table exists, via pg_class on PostgreSQL."""
+    if conn.dialect.name == 'postgresql':
+        # to_regclass hits pg_class directly; information_schema is far slower
+        return bool(conn.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"),
+            {'name': f'public.{table_name}'},
+        ).scalar())
+    return inspect(conn).has_table(table_name)
+
+
+def get_schema_version(conn):
+    """Return the recorded schema version, or None if it is not recorded yet."""
+    # schema_meta does not exist on pre-versioning databases
+    if not table_exists(conn, 'schema_meta'):
+        return None
+    return conn.execute(text("SELECT schema_version FROM schema_meta WHERE id = 1")).scalar()
+
+
+def mark_schema_version(app, version=TARGET_SCHEMA_VERSION):
+    """Record that the schema is up to date with the given version."""
+    with app.app_context():
+        try:
+            db.metadata.create_all(db.engine, tables=[SchemaMeta.__table__], checkfirst=True)
+            meta = db.session.get(SchemaMeta, 1)
+            if not meta:
+                meta = SchemaMeta(id=1)
+                db.session.add(meta)
+            meta.schema_version = version
+            db.session.commit()
+            print(f"Schema version {version} recorded")
+        except Exception as e:
+            print(f"Note: Could not record schema version: {e}")
+            db.session.rollback()
+
+
+class _SchemaCache:
+    """
+    One-shot snapshot of table and column names for migration checks.
+    
+    Loaded with a single catalog query on PostgreSQL and updated in place as
+    migrations add tables/columns, so each check is a set lookup rather than a
+    round-trip. Elsewhere the table list is read once and a table's columns are
+    only introspected the first time one of them is checked.
+    """
+
+    def __init__(self, conn):
+        self._inspector = None
+        # None marks a table whose columns have not been introspected yet
+        self.columns: dict[str, set[str] | None] = {}
+        if conn.dialect.name == 'postgresql':
+            rows = conn.execute(text(
+                "SELECT c.relname, a.attname FROM pg_class c "
+                "JOIN pg_attribute a ON a.attrelid = c.oid "
+                "WHERE c.relnamespace = 'public'::regnamespace AND c.relkind IN ('r', 'p') "
+                "AND a.attnum > 0 AND NOT a.attisdropped"
+            ))
+            for table_name, column_name in rows:
+                self.columns.setdefault(table_name, set()).add(column_name)
+        else:
+            self._inspector = inspect(conn)
+            self.columns = dict.fromkeys(self._inspector.get_table_names())
+
+    def _table_columns(self, table_name: str) -> set[str]:
+        columns = self.columns.get(table_name)
+        if columns is None:
+            if table_name not in self.columns:
+                return set()
+            columns = {c['name'] for c in self._inspector.get_columns(table_name)}
+            self.columns[table_name] = columns
+        return columns
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self.columns
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self._table_columns(table_name)
+
+    def add_table(self, table) -> None:
+        self.columns[table.name] = {c.name for c in table.columns}
+
+    def add_column(self, table_name: str, column_name: str) -> None:
+        columns = self._table_columns(table_name)
+        columns.add(column_name)
+        self.columns[table_name] = columns
+
+
+def _classify_row(classify, title, description):
+    """Module-level (picklable) classification step for the backfill process pool."""
+    return classify(title or '', description)
+
+
+def _backfill_column(column, rows, classify):
+    """
+    Classify listings and write the results with one UPDATE per label.
+    
+    Rows are streamed (server-side cursor on PostgreSQL) as plain tuples, so
+    only the listing ids are kept in memory while classifying. Large backfills
+    classify across a process pool. Updates are committed every
+    BACKFILL_BATCH_SIZE rows once the cursor is exhausted.
+    
+    Args:
+        column: Listing column to set (e.g. Listing.item_type).
+        rows: Query yielding (id, title, description) tuples.
+        classify: Function mapping (title, description) to a label or None.
+    
+    Returns:
+        int: Number of listings updated.
+    """
+    buckets = defaultdict(list)
+    stream = iter(rows.execution_options(stream_results=True).yield_per(500))
+    executor = None
+    try:
+        # Classify in bounded batches so the stream is never fully materialized
+        while batch := list(islice(stream, CLASSIFY_BATCH_SIZE)):
+            if executor is None and len(batch) == CLASSIFY_BATCH_SIZE and (os.cpu_count() or 1) > 1:
+                # Spawn rather than fork so workers never inherit (and on exit
+                # close) the open database connection and its streaming cursor
+                executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+            ids, titles, descriptions = zip(*batch)
+            if executor is not None:
+                labels = executor.map(_classify_row, repeat(classify), titles, descriptions, chunksize=256)
+            else:
+                labels = map(_classify_row, repeat(classify), titles, descriptions)
+            for listing_id, label in zip(ids, labels):
+                if label:
+                    buckets[label].append(listing_id)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    updated = 0
+    for label, ids in buckets.items():
+        for start in range(0, len(ids), BACKFILL_BATCH_SIZE):
+            chunk = ids[start:start + BACKFILL_BATCH_SIZE]
+            db.session.execute(
+                update(Listing).where(Listing.id.in_(chunk)).values({column.key: label}),
+                execution_options={'synchronize_session': False},
+            )
+            # Commit per batch to keep transactions (and row locks) short
+            db.session.commit()
+            updated += len(chunk)
+    return updated
+
+
 def apply_migrations(app):
-    """Apply any pending schema migrations."""
+    """
+    Apply any pending schema migrations.
+    
+    All existence probes and DDL run in one transaction under the migration
+    lock, so a failed step rolls back as a whole and never leaves the lock held.
+    Column additions use IF NOT EXISTS on PostgreSQL so a racing migrator that
+    slipped past the lock cannot fail on "column already exists".
+    Data backfills run afterwards through the ORM session.
+    
+    Returns:
+        bool: True if every step succeeded, so the schema version may be
+        recorded. Optional indexes that could not be created don't count.
+    """
     with app.app_context():
+        ok = True
         try:
-            inspector = inspect(db.engine)
-            added_item_type = False
+            with db.engine.begin() as conn:
+                lock_migrations(conn)
+                schema = _SchemaCache(conn)
+                has_table = schema.has_table
+                has_column = schema.has_column
+                added_item_type = False
+                added_laptop_category = False
 
-            def has_table(table_name: str) -> bool:
-                try:
-                    return table_name in inspector.get_table_names()
-                except Exception:
-                    return False
+                # PostgreSQL 9.6+ makes ADD COLUMN idempotent; SQLite has no IF NOT EXISTS here
+                if_not_exists = 'IF NOT EXISTS ' if conn.dialect.name == 'postgresql' else ''
 
-            def has_column(table_name: str, column_name: str) -> bool:
-                try:
-                    return any(c.get('name') == column_name for c in inspector.get_columns(table_name))
-                except Exception:
-                    return False
-
-            # Migration 1: Add search_keywords column to listings if it doesn't exist
-            if has_table('listings') and not has_column('listings', 'search_keywords'):
-                print("Adding search_keywords column to listings table...")
-                db.session.execute(text("ALTER TABLE listings ADD COLUMN search_keywords TEXT"))
-                db.session.commit()
-                print("search_keywords column added successfully")
+                def add_column(table_name: str, column_name: str, ddl_type: str) -> None:
+                    conn.execute(text(
+                        f"ALTER TABLE {table_name} ADD COLUMN {if_not_exists}{column_name} {ddl_type}"
+                    ))
+                    schema.add_column(table_name, column_name)
 
-            # Migration 2: Add item_type column to listings if it doesn't exist
-            if has_table('listings') and not has_column('listings', 'item_type'):
-                print("Adding item_type column to listings table...")
-                db.session.execute(text("ALTER TABLE listings ADD COLUMN item_type VARCHAR(20)"))
-                db.session.commit()
-                print("item_type column added successfully")
-                added_item_type = True
+                def create_index(statement: str) -> None:
+                    # Optional index; a savepoint keeps a failure from aborting the batch
+                    try:
+                        with conn.begin_nested():
+                            conn.execute(text(statement))
+                    except Exception:
+                        pass
 
-                # Optional index for faster filtering
-                try:
-                    db.session.execute(text("CREATE INDEX IF NOT EXISTS idx_listings_item_type ON listings(item_type)"))
-                    db.session.commit()
-                except Exception:
-                    db.session.rollback()
+                def column_type(table_name: str, column_name: str):
+                    # information_schema data_type of a column (PostgreSQL only)
+                    return conn.execute(text(
+                        "SELECT data_type FROM information_schema.columns "
+                        "WHERE table_schema = current_schema() "
+                        "AND table_name = :table_name AND column_name = :column_name"
+                    ), {'table_name': table_name, 'column_name': column_name}).scalar()
 
-            # Migration 3: Create price_history table if it doesn't exist
-            if not has_table('price_history'):
-                print("Creating price_history table...")
-                db.metadata.create_all(db.engine, tables=[PriceHistory.__table__], checkfirst=True)
-                db.session.commit()
-                print("price_history table created successfully")
+                # Migration 1: Add search_keywords column to listings if it doesn't exist
+                if has_table('listings') and not has_column('listings', 'search_keywords'):
+                    print("Adding search_keywords column to listings table...")
+                    add_column('listings', 'search_keywords', 'TEXT')
+                    print("search_keywords column added successfully")
 
-            # Migration 4: Add progress_json column to scraper_jobs if it doesn't exist
-            if has_table('scraper_jobs') and not has_column('scraper_jobs', 'progress_json'):
-                print("Adding progress_json column to scraper_jobs table...")
-                db.session.execute(text("ALTER TABLE scraper_jobs ADD COLUMN progress_json TEXT"))
-                db.session.commit()
-                print("progress_json column added successfully")
+                # Migration 2: Add item_type column to listings if it doesn't exist
+                if has_table('listings') and not has_column('listings', 'item_type'):
+                    print("Adding item_type column to listings table...")
+                    add_column('listings', 'item_type', 'VARCHAR(20)')
+                    print("item_type column added successfully")
+                    added_item_type = True
 
-            # Migration 5: Create tags table if it doesn't exist
-            if not has_table('tags'):
-                print("Creating tags table...")
-                db.metadata.create_all(db.engine, tables=[Tag.__table__], checkfirst=True)
-                db.session.commit()
-                print("tags table created successfully")
+                    # Optional index for faster filtering
+                    create_index("CREATE INDEX IF NOT EXISTS idx_listings_item_type ON listings(item_type)")
 
-            # Migration 6: Create listing_tags association table if it doesn't exist
-            if not has_table('listing_tags'):
-                print("Creating listing_tags table...")
-                db.metadata.create_all(db.engine, tables=[listing_tags], checkfirst=True)
-                db.session.commit()
-                print("listing_tags table created successfully")
+                # Migration 3: Create price_history table if it doesn't exist
+                if not has_table('price_history'):
+                    print("Creating price_history table...")
+                    db.metadata.create_all(conn, tables=[PriceHistory.__table__], checkfirst=True)
+                    schema.add_table(PriceHistory.__table__)
+                    print("price_history table created successfully")
 
-            # Migration 7: Create archived_listings table if it doesn't exist
-            if not has_table('archived_listings'):
-                print("Creating archived_listings table...")
-                db.metadata.create_all(db.engine, tables=[ArchivedListing.__table__], checkfirst=True)
-                db.session.commit()
-                print("archived_listings table created successfully")
+                # Migration 4: Add progress_json column to scraper_jobs if it doesn't exist
+                if has_table('scraper_jobs') and not has_column('scraper_jobs', 'progress_json'):
+                    print("Adding progress_json column to scraper_jobs table...")
+                    add_column('scraper_jobs', 'progress_json', 'TEXT')
+                    print("progress_json column added successfully")
 
-            # Migration 8: Add laptop_category column to listings if it doesn't exist
-            added_laptop_category = False
-            if has_table('listings') and not has_column('listings', 'laptop_category'):
-                print("Adding laptop_category column to listings table...")
-                db.session.execute(text("ALTER TABLE listings ADD COLUMN laptop_category VARCHAR(30)"))
-                db.session.commit()
-                print("laptop_category column added successfully")
-                added_laptop_category = True
+                # Migration 5: Create tags table if it doesn't exist
+                if not has_table('tags'):
+                    print("Creating tags table...")
+                    db.metadata.create_all(conn, tables=[Tag.__table__], checkfirst=True)
+                    schema.add_table(Tag.__table__)
+                    print("tags table created successfully")
 
-                # Add index for faster filtering
-                try:
-                    db.session.execute(text("CREATE INDEX IF NOT EXISTS idx_listings_laptop_category ON listings(laptop_category)"))
-                    db.session.commit()
-                except Exception:
-                    db.session.rollback()
+                # Migration 6: Create listing_tags association table if it doesn't exist
+                if not has_table('listing_tags'):
+                    print("Creating listing_tags table...")
+                    db.metadata.create_all(conn, tables=[listing_tags], checkfirst=True)
+                    schema.add_table(listing_tags)
+                    print("listing_tags table created successfully")
+
+                # Migration 7: Create archived_listings table if it doesn't exist
+                if not has_table('archived_listings'):
+                    print("Creating archived_listings table...")
+                    db.metadata.create_all(conn, tables=[ArchivedListing.__table__], checkfirst=True)
+                    schema.add_table(ArchivedListing.__table__)
+                    print("archived_listings table created successfully")
+
+                # Migration 8: Add laptop_category column to listings if it doesn't exist
+                if has_table('listings') and not has_column('listings', 'laptop_category'):
+                    print("Adding laptop_category column to listings table...")
+                    add_column('listings', 'laptop_category', 'VARCHAR(30)')
+                    print("laptop_category column added successfully")
+                    added_laptop_category = True
+
+                    # Add index for faster filtering
+                    create_index("CREATE INDEX IF NOT EXISTS idx_listings_laptop_category ON listings(laptop_category)")
+
+                # Migration 9: Composite index for per-user interaction aggregates
+                if has_table('user_interactions'):
+                    create_index(
+                        "CREATE INDEX IF NOT EXISTS ix_user_interactions_sync_created "
+                        "ON user_interactions(sync_code, created_at)"
+                    )
+
+                # Migration 10: fillfactor headroom for frequently updated preference rows
+                # (the only place it is set; the models leave it to this migration)
+                if conn.dialect.name == 'postgresql':
+                    for table_name in ('learned_preferences', 'brand_affinity'):
+                        if has_table(table_name):
+                            conn.execute(text(f"ALTER TABLE {table_name} SET (fillfactor = 70)"))
+
+                # Migration 11: Unique (sync_code, key) indexes backing preference lookups and
+                # the ON CONFLICT upserts. Named after the model constraints, so this is a no-op
+                # wherever create_all already built them (PostgreSQL names the index after the
+                # constraint); only tables that predate the constraints get one.
+                if conn.dialect.name == 'postgresql':
+                    if has_table('learned_preferences'):
+                        create_index(
+                            "CREATE UNIQUE INDEX IF NOT EXISTS uq_learned_pref_user_keyword "
+                            "ON learned_preferences(sync_code, keyword)"
+                        )
+                    if has_table('brand_affinity'):
+                        create_index(
+                            "CREATE UNIQUE INDEX IF NOT EXISTS uq_brand_affinity_user_brand "
+                            "ON brand_affinity(sync_code, brand)"
+                        )
+
+                # Migration 12: search_keywords from comma-separated TEXT to a list column
+                # (varchar[] with a GIN index on PostgreSQL, JSON text elsewhere)
+                if has_table('listings') and has_column('listings', 'search_keywords'):
+                    if conn.dialect.name == 'postgresql':
+                        if column_type('listings', 'search_keywords') == 'text':
+                            print("Converting search_keywords to varchar[]...")
+                            conn.execute(text(
+                                "ALTER TABLE listings ALTER COLUMN search_keywords TYPE varchar[] "
+                                "USING array_remove(string_to_array(search_keywords, ','), '')"
+                            ))
+                        create_index(
+                            "CREATE INDEX IF NOT EXISTS ix_listings_search_keywords_gin "
+                            "ON listings USING gin (search_keywords)"
+                        )
+                    else:
+                        csv_rows = conn.execute(text(
+                            "SELECT id, search_keywords FROM listings "
+                            "WHERE search_keywords IS NOT NULL AND search_keywords NOT LIKE '[%'"
+                        )).all()
+                        if csv_rows:
+                            print(f"Converting search_keywords to JSON ({len(csv_rows)} listings)...")
+                            conn.execute(text("UPDATE listings SET search_keywords = :value WHERE id = :id"), [
+                                {'id': row_id, 'value': json.dumps([k.strip() for k in value.split(',') if k.strip()])}
+                                for row_id, value in csv_rows
+                            ])
+
+                # Migration 13: Composite indexes for the listings feed filters and sorts
+                if has_table('listings'):
+                    create_index("CREATE INDEX IF NOT EXISTS ix_listings_feed ON listings(item_type, posted_at)")
+                    create_index(
+                        "CREATE INDEX IF NOT EXISTS ix_listings_category_feed ON listings(laptop_category, posted_at)"
+                    )
+                    create_index("CREATE INDEX IF NOT EXISTS ix_listings_price_range ON listings(item_type, price_eur)")
+
+                # Migration 14: Closed-set VARCHAR columns to native ENUM types (PostgreSQL only)
+                if conn.dialect.name == 'postgresql':
+                    enum_columns = (
+                        ('scraper_job_status', 'scraper_jobs', 'status', JOB_STATUSES),
+                        ('item_classification', 'items_analysis', 'classification', ITEM_CLASSIFICATIONS),
+                        ('interaction_action_type', 'user_interactions', 'action_type', ACTION_TYPES),
+                    )
+                    for type_name, table_name, column_name, values in enum_columns:
+                        if not has_table(table_name) or column_type(table_name, column_name) != 'character varying':
+                            continue
+                        labels = ', '.join(f"'{value}'" for value in values)
+                        try:
+                            with conn.begin_nested():
+                                conn.execute(text(
+                                    f"DO $$ BEGIN CREATE TYPE {type_name} AS ENUM ({labels}); "
+                                    f"EXCEPTION WHEN duplicate_object THEN NULL; END $$"
+                                ))
+                                conn.execute(text(
+                                    f"ALTER TABLE {table_name} ALTER COLUMN {column_name} "
+                                    f"TYPE {type_name} USING {column_name}::{type_name}"
+                                ))
+                            print(f"{table_name}.{column_name} converted to {type_name}")
+                        except Exception as e:
+                            # Rows outside the value set; leave the column as VARCHAR
+                            print(f"Note: Could not convert {table_name}.{column_name}: {e}")
+
+                # Migration 15: Price history per listing in recorded order
+                if has_table('price_history'):
+                    create_index(
+                        "CREATE INDEX IF NOT EXISTS ix_price_history_listing_recorded "
+                        "ON price_history(listing_id, recorded_at)"
+                    )
+                    # Covered by the leading column of the composite index
+                    create_index("DROP INDEX IF EXISTS ix_price_history_listing_id")
+
+                # Migration 16: Trigram indexes behind the ILIKE '%q%' listing search (PostgreSQL only)
+                if conn.dialect.name == 'postgresql' and has_table('listings'):
+                    try:
+                        with conn.begin_nested():
+                            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                            for column_name in ('title', 'description'):
+                                conn.execute(text(
+                                    f"CREATE INDEX IF NOT EXISTS ix_listings_{column_name}_trgm "
+                                    f"ON listings USING gin ({column_name} gin_trgm_ops)"
+                                ))
+                    except Exception as e:
+                        # pg_trgm unavailable or not permitted; search falls back to a scan
+                        print(f"Note: Could not create trigram indexes: {e}")
+
+                # Migration 17: City/price, recency and priced-listing indexes
+                if has_table('listings'):
+                    create_index(
+                        "CREATE INDEX IF NOT EXISTS ix_listings_city_price ON listings(location_city, price_eur)"
+                    )
+                    create_index(
+                        "CREATE INDEX IF NOT EXISTS ix_listings_scraped_desc ON listings(scraped_at DESC, id)"
+                    )
+                    create_index(
+                        "CREATE INDEX IF NOT EXISTS ix_listings_has_price ON listings(price_eur) "
+                        "WHERE price_eur IS NOT NULL"
+                    )
+                    # Covered by the leading column of ix_listings_city_price
+                    create_index("DROP INDEX IF EXISTS ix_listings_location_city")
+
+                listings_present = has_table('listings')
+                backfill_item_type = listings_present and (added_item_type or has_column('listings', 'item_type'))
+                backfill_laptop_category = listings_present and (
+                    added_laptop_category or has_column('listings', 'laptop_category')
+                )
 
             # Data migration: backfill item_type for existing rows
-            if has_table('listings') and (added_item_type or has_column('listings', 'item_type')):
+            if backfill_item_type:
                 try:
-                    # Refresh inspector cache (important after ALTER TABLE on some backends)
-                    inspector = inspect(db.engine)
-                    missing = Listing.query.filter(
+                    rows = db.session.query(Listing.id, Listing.title, Listing.description).filter(
                         (Listing.item_type.is_(None)) | (Listing.item_type == '')
-                    ).limit(5000).all()
-                    if missing:
-                        print(f"Backfilling item_type for {len(missing)} listings...")
-                        for listing in missing:
-                            listing.item_type = classify_item_type(listing.title or '', listing.description)
-                        db.session.commit()
-                        print("item_type backfill complete")
+                    )
+                    from classifier import classify_item_type
+                    updated = _backfill_column(Listing.item_type, rows, classify_item_type)
+                    if updated:
+                        print(f"item_type backfill complete ({updated} listings)")
                 except Exception as e:
                     print(f"Note: Could not backfill item_type: {e}")
                     db.session.rollback()
+                    ok = False
 
             # Data migration: backfill laptop_category for existing laptop listings
-            if has_table('listings') and (added_laptop_category or has_column('listings', 'laptop_category')):
+            if backfill_laptop_category:
                 try:
-                    inspector = inspect(db.engine)
-                    missing = Listing.query.filter(
+                    rows = db.session.query(Listing.id, Listing.title, Listing.description).filter(
                         Listing.item_type == 'laptop',
                         (Listing.laptop_category.is_(None)) | (Listing.laptop_category == '')
-                    ).limit(5000).all()
-                    if missing:
-                        print(f"Backfilling laptop_category for {len(missing)} listings...")
-                        for listing in missing:
-                            listing.laptop_category = classify_laptop_category(listing.title or '', listing.description)
-                        db.session.commit()
-                        print("laptop_category backfill complete")
+                    )
+                    from classifier import classify_laptop_category
+                    updated = _backfill_column(Listing.laptop_category, rows, classify_laptop_category)
+                    if updated:
+                        print(f"laptop_category backfill complete ({updated} listings)")
                 except Exception as e:
                     print(f"Note: Could not backfill laptop_category: {e}")
                     db.session.rollback()
+                    ok = False
             
         except Exception as e:
             print(f"Note: Could not apply migrations (may be SQLite or column exists): {e}")
             db.session.rollback()
+            ok = False
+        return ok
 
 
 def init_database(app):
-    """Initialize database tables with advisory lock to prevent race conditions."""
+    """
+    Initialize database tables with advisory lock to prevent race conditions.
+    
+    Returns:
+        bool: True if the schema is already at TARGET_SCHEMA_VERSION, in which
+        case migrations can be skipped entirely.
+    """
     with app.app_context():
         try:
-            # Acquire advisory lock (PostgreSQL specific)
-            # Lock ID 12345 is arbitrary - just needs to be consistent
-            db.session.execute(text("SELECT pg_advisory_lock(12345)"))
-            
-            try:
-                # Check if tables exist
-                result = db.session.execute(
-                    text("SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'listings')")
-                )
-                tables_exist = result.scalar()
+            # Probe and create in one transaction; the xact lock releases on commit
+            with db.engine.begin() as conn:
+                lock_migrations(conn)
+                
+                # Fast path: schema already recorded at the target version
+                if get_schema_version(conn) == TARGET_SCHEMA_VERSION:
+                    print(f"Database schema is up to date (version {TARGET_SCHEMA_VERSION})")
+                    return True
                 
-                if not tables_exist:
+                if not table_exists(conn, 'listings'):
                     print("Creating database tables...")
-                    db.create_all()
+                    db.metadata.create_all(conn)
                     print("Database tables created successfully")
                 else:
                     print("Database tables already exist")
-                    
-                db.session.commit()
-                
-            finally:
-                # Release advisory lock
-                db.session.execute(text("SELECT pg_advisory_unlock(12345)"))
-                db.session.commit()
                 
         except Exception as e:
             print(f"Error during database initialization: {e}")
-            db.session.rollback()
-            # Try simple create_all as fallback (for SQLite)
-            try:
-                db.create_all()
-                print("Tables created with fallback method")
-            except Exception:
-                pass
+        return False
 
 
 def main():
@@ -238,8 +559,13 @@ def main():
         print("ERROR: Could not connect to database")
         sys.exit(1)
     
-    init_database(app)
-    apply_migrations(app)
+    if not init_database(app):
+        # Only a complete run may record the version; otherwise the next
+        # start retries the migrations and any unfinished backfill
+        if apply_migrations(app):
+            mark_schema_version(app)
+        else:
+            print("Migrations incomplete; schema version not recorded")
     seed_default_config(app)
     print("Database initialization complete")
     sys.exit(0)
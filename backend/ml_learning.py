@@ -12,8 +12,19 @@ from __future__ import annotations
 
 import math
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
-from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import case, func, literal, select, union_all, update
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+    prange = range
+
+from tag_extractor import extract_tags
 
 if TYPE_CHECKING:
     from models import Listing, UserInteraction, LearnedPreference, BrandAffinity
@@ -29,6 +40,10 @@ TIME_DECAY_HALF_LIFE_DAYS = 7
 # Minimum interactions needed for high confidence
 MIN_INTERACTIONS_FOR_CONFIDENCE = 5
 
+# Precomputed so the per-preference helpers multiply instead of divide/log
+_NEG_INV_HALF_LIFE = -1.0 / TIME_DECAY_HALF_LIFE_DAYS
+_INV_LOG_CONFIDENCE_BASE = 1.0 / math.log(MIN_INTERACTIONS_FOR_CONFIDENCE + 10)
+
 # Maximum weight magnitude (prevents runaway values)
 MAX_WEIGHT_MAGNITUDE = 3.0
 
@@ -48,6 +63,13 @@ VIEW_DURATION_BONUSES = [
     (300, 0.15),   # 5+ minutes = extra 0.15
 ]
 
+# Unpacked tiers for calculate_action_weight (update alongside the list above)
+(
+    (_VIEW_THRESHOLD_1, _VIEW_BONUS_1),
+    (_VIEW_THRESHOLD_2, _VIEW_BONUS_2),
+    (_VIEW_THRESHOLD_3, _VIEW_BONUS_3),
+) = VIEW_DURATION_BONUSES
+
 
 # =============================================================================
 # Time Decay Functions
@@ -78,7 +100,7 @@ def calculate_time_decay(interaction_time: datetime, now: Optional[datetime] = N
     age_days = (now - interaction_time).total_seconds() / 86400
     
     # Exponential decay: factor = 2^(-age/half_life)
-    decay_factor = math.pow(2, -age_days / TIME_DECAY_HALF_LIFE_DAYS)
+    decay_factor = math.exp2(age_days * _NEG_INV_HALF_LIFE)
     
     return max(0.01, min(1.0, decay_factor))
 
@@ -121,7 +143,7 @@ def calculate_confidence(interaction_count: int) -> float:
     # Reaches ~0.7 at MIN_INTERACTIONS_FOR_CONFIDENCE
     # Reaches ~0.85 at 10 interactions
     # Reaches ~0.95 at 50 interactions
-    confidence = math.log(interaction_count + 1) / math.log(MIN_INTERACTIONS_FOR_CONFIDENCE + 10)
+    confidence = math.log(interaction_count + 1) * _INV_LOG_CONFIDENCE_BASE
     
     return min(1.0, confidence)
 
@@ -175,11 +197,14 @@ def calculate_action_weight(
     """
     base_weight = ACTION_WEIGHTS.get(action_type, 0.0)
     
-    # Add duration bonus for views
+    # Add duration bonus for views (cumulative; unrolled over the fixed tiers)
     if action_type == 'view' and duration_seconds:
-        for threshold, bonus in VIEW_DURATION_BONUSES:
-            if duration_seconds >= threshold:
-                base_weight += bonus
+        d = duration_seconds
+        base_weight += (
+            _VIEW_BONUS_1 * (d >= _VIEW_THRESHOLD_1)
+            + _VIEW_BONUS_2 * (d >= _VIEW_THRESHOLD_2)
+            + _VIEW_BONUS_3 * (d >= _VIEW_THRESHOLD_3)
+        )
     
     return base_weight
 
@@ -221,6 +246,77 @@ def apply_weight_decay(current_weight: float, decay_rate: float = 0.99) -> float
 # Learning Functions
 # =============================================================================
 
+@lru_cache(maxsize=4096)
+def _cached_tags(title: str, description: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Memoized extract_tags for the interaction path.
+    
+    A view -> click -> save sequence hits the same listing repeatedly, so the
+    regex extraction is done once per (title, description). Returned as a
+    tuple so the cached value can't be mutated by callers.
+    """
+    return tuple(extract_tags(title, description or None))
+
+
+def _fetch_existing(Model, key_column, sync_code: str, keys: List[str]) -> Dict[str, Any]:
+    """Load a user's rows for the given keys in one query, keyed by key value."""
+    if not keys:
+        return {}
+    rows = Model.query.filter(Model.sync_code == sync_code, key_column.in_(keys)).all()
+    return {getattr(row, key_column.key): row for row in rows}
+
+
+def _upsert_rows(db_session, Model, key_field: str, rows: List[Dict[str, Any]], existing: Dict[str, Any]) -> None:
+    """
+    Write computed preference rows in one statement where possible.
+    
+    On PostgreSQL this is a single INSERT ... ON CONFLICT (sync_code, key)
+    DO UPDATE; elsewhere existing rows get one bulk UPDATE by primary key and
+    new ones are added to the session.
+    
+    Args:
+        db_session: SQLAlchemy database session.
+        Model: LearnedPreference or BrandAffinity model class.
+        key_field: Name of the per-user unique column ('keyword' or 'brand').
+        rows: Column dicts to write.
+        existing: Rows loaded by _fetch_existing, keyed by key value.
+    """
+    if not rows:
+        return
+    
+    if db_session.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        
+        stmt = insert(Model).values(rows)
+        update_cols = {
+            name: stmt.excluded[name]
+            for name in rows[0]
+            if name not in ('sync_code', key_field, 'interaction_count')
+        }
+        update_cols['interaction_count'] = Model.__table__.c.interaction_count + 1
+        db_session.execute(stmt.on_conflict_do_update(
+            index_elements=['sync_code', key_field],
+            set_=update_cols,
+        ))
+        # Loaded objects are now stale; refresh on next access
+        for obj in existing.values():
+            db_session.expire(obj)
+        return
+    
+    # Existing rows: one executemany UPDATE by primary key, no per-instance dirty tracking
+    updates = [
+        dict(row, id=existing[row[key_field]].id)
+        for row in rows
+        if row[key_field] in existing
+    ]
+    if updates:
+        db_session.execute(update(Model), updates)
+        for obj in existing.values():
+            db_session.expire(obj)
+    
+    db_session.add_all(Model(**row) for row in rows if row[key_field] not in existing)
+
+
 def learn_from_interaction(
     interaction: 'UserInteraction',
     listing: 'Listing',
@@ -244,8 +340,6 @@ def learn_from_interaction(
     Returns:
         Dict with updated preferences and their new values.
     """
-    from tag_extractor import extract_tags
-    
     sync_code = interaction.sync_code
     action_type = interaction.action_type
     duration = interaction.duration_seconds
@@ -256,75 +350,78 @@ def learn_from_interaction(
     if base_weight == 0:
         return {'updated': []}
     
+    # One timestamp for every row written by this interaction
+    now = datetime.utcnow()
+    
     # Extract tags/keywords from the listing
-    tags = extract_tags(listing.title, listing.description)
+    tags = _cached_tags(listing.title or '', listing.description or '')
     
-    updated_prefs = []
-    updated_brands = []
+    # Each keyword is applied once per interaction
+    keywords = list(dict.fromkeys(value for _, value in tags))
+    brands = list(dict.fromkeys(value for category, value in tags if category == 'brand'))
     
-    for category, value in tags:
-        # Update learned preference for this keyword
-        learned = LearnedPreferenceModel.query.filter_by(
-            sync_code=sync_code, keyword=value
-        ).first()
-        
-        if not learned:
-            learned = LearnedPreferenceModel(
-                sync_code=sync_code,
-                keyword=value,
-                learned_weight=0.0,
-                interaction_count=0
-            )
-            db_session.add(learned)
+    # One SELECT per model for all existing rows, instead of one per tag
+    existing_prefs = _fetch_existing(
+        LearnedPreferenceModel, LearnedPreferenceModel.keyword, sync_code, keywords
+    )
+    existing_brands = _fetch_existing(
+        BrandAffinityModel, BrandAffinityModel.brand, sync_code, brands
+    )
+    
+    updated_prefs = []
+    pref_rows = []
+    for value in keywords:
+        learned = existing_prefs.get(value)
+        old_weight = (learned.learned_weight or 0.0) if learned else 0.0
+        old_count = (learned.interaction_count or 0) if learned else 0
         
         # Apply weight with diminishing returns for repeated actions
         # Uses sqrt to reduce impact of repeated similar actions
-        repetition_factor = 1.0 / math.sqrt(max(1, learned.interaction_count // 5 + 1))
+        repetition_factor = 1.0 / math.sqrt(max(1, old_count // 5 + 1))
         adjusted_weight = base_weight * repetition_factor
         
         # Update and normalize
-        new_weight = normalize_weight((learned.learned_weight or 0.0) + adjusted_weight)
-        learned.learned_weight = new_weight
-        learned.interaction_count = (learned.interaction_count or 0) + 1
-        learned.last_updated = datetime.utcnow()
-        
+        new_weight = normalize_weight(old_weight + adjusted_weight)
+        pref_rows.append({
+            'sync_code': sync_code,
+            'keyword': value,
+            'learned_weight': new_weight,
+            'interaction_count': old_count + 1,
+            'last_updated': now,
+        })
         updated_prefs.append({
             'keyword': value,
             'weight': new_weight,
-            'count': learned.interaction_count
+            'count': old_count + 1
         })
+    
+    updated_brands = []
+    brand_rows = []
+    for value in brands:
+        affinity = existing_brands.get(value)
+        old_score = (affinity.affinity_score or 0.0) if affinity else 0.0
+        old_count = (affinity.interaction_count or 0) if affinity else 0
+        
+        # Brand affinity is clamped to [-1, 1]
+        repetition_factor = 1.0 / math.sqrt(max(1, old_count // 3 + 1))
+        brand_adjustment = base_weight * repetition_factor * 0.5  # Brands adjust slower
         
-        # Update brand affinity if this is a brand tag
-        if category == 'brand':
-            affinity = BrandAffinityModel.query.filter_by(
-                sync_code=sync_code, brand=value
-            ).first()
-            
-            if not affinity:
-                affinity = BrandAffinityModel(
-                    sync_code=sync_code,
-                    brand=value,
-                    affinity_score=0.0,
-                    interaction_count=0
-                )
-                db_session.add(affinity)
-            
-            # Brand affinity is clamped to [-1, 1]
-            repetition_factor = 1.0 / math.sqrt(max(1, affinity.interaction_count // 3 + 1))
-            brand_adjustment = base_weight * repetition_factor * 0.5  # Brands adjust slower
-            
-            new_affinity = max(-1.0, min(1.0, 
-                (affinity.affinity_score or 0.0) + brand_adjustment
-            ))
-            affinity.affinity_score = new_affinity
-            affinity.interaction_count = (affinity.interaction_count or 0) + 1
-            affinity.last_updated = datetime.utcnow()
-            
-            updated_brands.append({
-                'brand': value,
-                'affinity': new_affinity,
-                'count': affinity.interaction_count
-            })
+        new_affinity = max(-1.0, min(1.0, old_score + brand_adjustment))
+        brand_rows.append({
+            'sync_code': sync_code,
+            'brand': value,
+            'affinity_score': new_affinity,
+            'interaction_count': old_count + 1,
+            'last_updated': now,
+        })
+        updated_brands.append({
+            'brand': value,
+            'affinity': new_affinity,
+            'count': old_count + 1
+        })
+    
+    _upsert_rows(db_session, LearnedPreferenceModel, 'keyword', pref_rows, existing_prefs)
+    _upsert_rows(db_session, BrandAffinityModel, 'brand', brand_rows, existing_brands)
     
     return {
         'updated_keywords': updated_prefs,
@@ -334,6 +431,93 @@ def learn_from_interaction(
     }
 
 
+def _effective_kernel_numpy(
+    weights: np.ndarray,
+    counts: np.ndarray,
+    age_days: np.ndarray,
+    decayed: np.ndarray,
+    max_adjustment: float,
+) -> np.ndarray:
+    """NumPy implementation of the effective-weight math (see _effective_weights)."""
+    # Confidence: log(count + 1) / log(MIN + 10), capped at 1, zero without interactions
+    confidence = np.where(
+        counts > 0,
+        np.minimum(1.0, np.log(counts + 1) * _INV_LOG_CONFIDENCE_BASE),
+        0.0,
+    )
+    effective = weights * confidence
+    if max_adjustment > 0:
+        effective = np.clip(effective * 10, -max_adjustment, max_adjustment)
+    
+    decay = np.clip(np.exp2(age_days * _NEG_INV_HALF_LIFE), 0.01, 1.0)
+    return np.where(decayed, effective * decay, effective)
+
+
+def _effective_kernel_loop(weights, counts, age_days, decayed, max_adjustment):
+    """Scalar-loop version of _effective_kernel_numpy, compiled with numba when available."""
+    out = np.empty_like(weights)
+    for i in prange(weights.shape[0]):
+        effective = 0.0
+        if counts[i] > 0:
+            effective = weights[i] * min(1.0, math.log(counts[i] + 1) * _INV_LOG_CONFIDENCE_BASE)
+        if max_adjustment > 0:
+            effective = max(-max_adjustment, min(max_adjustment, effective * 10))
+        if decayed[i]:
+            effective *= max(0.01, min(1.0, 2.0 ** (age_days[i] * _NEG_INV_HALF_LIFE)))
+        out[i] = effective
+    return out
+
+
+# Only used when numba is installed; the pure-Python loop would be slower than NumPy
+_effective_kernel_jit = (
+    njit(parallel=True, fastmath=True, cache=True)(_effective_kernel_loop) if njit is not None else None
+)
+
+
+def _effective_weights(
+    rows: List[Tuple[str, Optional[float], Optional[int], Optional[datetime]]],
+    max_adjustment: Optional[float],
+    threshold: float,
+    apply_decay: bool,
+) -> Dict[str, float]:
+    """
+    Vectorized confidence + time decay over (key, weight, count, last_updated) rows.
+    
+    Array equivalent of get_confidence_adjusted_weight / calculate_confidence
+    followed by calculate_time_decay, applied to every row at once.
+    
+    Args:
+        rows: Column tuples as returned by the preference queries.
+        max_adjustment: If set, scale by 10 and clamp like
+            get_confidence_adjusted_weight; if None, use weight * confidence.
+        threshold: Minimum absolute effective value to keep.
+        apply_decay: Whether to apply time decay.
+    
+    Returns:
+        Dict of key -> effective value.
+    """
+    if not rows:
+        return {}
+    
+    keys, weights, counts, times = zip(*rows)
+    weights = np.array([w or 0.0 for w in weights], dtype=np.float64)
+    counts = np.array([c or 0 for c in counts], dtype=np.float64)
+    
+    stamps = np.array(times, dtype='datetime64[us]')
+    age_days = (np.datetime64(datetime.utcnow(), 'us') - stamps) / np.timedelta64(1, 'D')
+    # Rows without a timestamp are left undecayed
+    decayed = ~np.isnat(stamps) if apply_decay else np.zeros(len(keys), dtype=np.bool_)
+    age_days = np.where(decayed, age_days, 0.0)
+    
+    # 0.0 disables the scale-and-clamp step in the kernels
+    clamp = 0.0 if max_adjustment is None else float(max_adjustment)
+    kernel = _effective_kernel_jit if _effective_kernel_jit is not None else _effective_kernel_numpy
+    effective = kernel(weights, counts, age_days, decayed, clamp)
+    
+    mask = np.abs(effective) > threshold
+    return dict(zip(np.array(keys, dtype=object)[mask].tolist(), effective[mask].tolist()))
+
+
 def get_effective_learned_weights(
     sync_code: str,
     LearnedPreferenceModel,
@@ -350,27 +534,15 @@ def get_effective_learned_weights(
     Returns:
         Dict of keyword -> effective weight.
     """
-    learned_prefs = LearnedPreferenceModel.query.filter_by(sync_code=sync_code).all()
-    
-    weights = {}
-    now = datetime.utcnow()
-    
-    for pref in learned_prefs:
-        weight = pref.learned_weight or 0.0
-        count = pref.interaction_count or 0
-        
-        # Apply confidence scaling
-        effective = get_confidence_adjusted_weight(weight, count)
-        
-        # Apply time decay if enabled
-        if apply_decay and pref.last_updated:
-            decay = calculate_time_decay(pref.last_updated, now)
-            effective *= decay
-        
-        if abs(effective) > 0.1:  # Only include meaningful weights
-            weights[pref.keyword] = effective
+    rows = LearnedPreferenceModel.query.with_entities(
+        LearnedPreferenceModel.keyword,
+        LearnedPreferenceModel.learned_weight,
+        LearnedPreferenceModel.interaction_count,
+        LearnedPreferenceModel.last_updated,
+    ).filter_by(sync_code=sync_code).all()
     
-    return weights
+    # Only include meaningful weights
+    return _effective_weights(rows, max_adjustment=20.0, threshold=0.1, apply_decay=apply_decay)
 
 
 def get_effective_brand_affinities(
@@ -389,28 +561,62 @@ def get_effective_brand_affinities(
     Returns:
         Dict of brand -> effective affinity.
     """
-    affinities = BrandAffinityModel.query.filter_by(sync_code=sync_code).all()
+    rows = BrandAffinityModel.query.with_entities(
+        BrandAffinityModel.brand,
+        BrandAffinityModel.affinity_score,
+        BrandAffinityModel.interaction_count,
+        BrandAffinityModel.last_updated,
+    ).filter_by(sync_code=sync_code).all()
     
-    result = {}
-    now = datetime.utcnow()
+    # Confidence affects magnitude, not sign; only include meaningful affinities
+    return _effective_weights(rows, max_adjustment=None, threshold=0.05, apply_decay=apply_decay)
+
+
+def get_effective_user_weights(
+    sync_code: str,
+    LearnedPreferenceModel,
+    BrandAffinityModel,
+    apply_decay: bool = True,
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Get both effective keyword weights and brand affinities in one round-trip.
     
-    for aff in affinities:
-        score = aff.affinity_score or 0.0
-        count = aff.interaction_count or 0
-        
-        # Apply confidence (affects magnitude, not sign)
-        confidence = calculate_confidence(count)
-        effective = score * confidence
-        
-        # Apply time decay
-        if apply_decay and aff.last_updated:
-            decay = calculate_time_decay(aff.last_updated, now)
-            effective *= decay
-        
-        if abs(effective) > 0.05:  # Only include meaningful affinities
-            result[aff.brand] = effective
+    Equivalent to calling get_effective_learned_weights and
+    get_effective_brand_affinities, but both tables are read with a single
+    UNION ALL query (discriminated by a kind column).
     
-    return result
+    Args:
+        sync_code: User identifier.
+        LearnedPreferenceModel: The LearnedPreference model class.
+        BrandAffinityModel: The BrandAffinity model class.
+        apply_decay: Whether to apply time decay.
+    
+    Returns:
+        Tuple of (keyword -> effective weight, brand -> effective affinity).
+    """
+    keywords = select(
+        literal('k').label('kind'),
+        LearnedPreferenceModel.keyword.label('name'),
+        LearnedPreferenceModel.learned_weight.label('weight'),
+        LearnedPreferenceModel.interaction_count,
+        LearnedPreferenceModel.last_updated,
+    ).where(LearnedPreferenceModel.sync_code == sync_code)
+    brands = select(
+        literal('b'),
+        BrandAffinityModel.brand,
+        BrandAffinityModel.affinity_score,
+        BrandAffinityModel.interaction_count,
+        BrandAffinityModel.last_updated,
+    ).where(BrandAffinityModel.sync_code == sync_code)
+    
+    keyword_rows, brand_rows = [], []
+    for kind, *row in LearnedPreferenceModel.query.session.execute(union_all(keywords, brands)):
+        (keyword_rows if kind == 'k' else brand_rows).append(tuple(row))
+    
+    return (
+        _effective_weights(keyword_rows, max_adjustment=20.0, threshold=0.1, apply_decay=apply_decay),
+        _effective_weights(brand_rows, max_adjustment=None, threshold=0.05, apply_decay=apply_decay),
+    )
 
 
 # =============================================================================
@@ -440,19 +646,22 @@ def decay_all_weights(
     Returns:
         Number of records updated.
     """
-    count = 0
-    
-    # Decay keyword weights
-    for pref in LearnedPreferenceModel.query.filter_by(sync_code=sync_code).all():
-        if pref.learned_weight:
-            pref.learned_weight = apply_weight_decay(pref.learned_weight, decay_rate)
-            count += 1
-    
-    # Decay brand affinities
-    for aff in BrandAffinityModel.query.filter_by(sync_code=sync_code).all():
-        if aff.affinity_score:
-            aff.affinity_score = apply_weight_decay(aff.affinity_score, decay_rate)
-            count += 1
+    # One UPDATE per table instead of loading and flushing every row
+    count = LearnedPreferenceModel.query.filter(
+        LearnedPreferenceModel.sync_code == sync_code,
+        LearnedPreferenceModel.learned_weight != 0,
+    ).update(
+        {LearnedPreferenceModel.learned_weight: LearnedPreferenceModel.learned_weight * decay_rate},
+        synchronize_session=False,
+    )
+    
+    count += BrandAffinityModel.query.filter(
+        BrandAffinityModel.sync_code == sync_code,
+        BrandAffinityModel.affinity_score != 0,
+    ).update(
+        {BrandAffinityModel.affinity_score: BrandAffinityModel.affinity_score * decay_rate},
+        synchronize_session=False,
+    )
     
     db_session.commit()
     return count
@@ -476,12 +685,23 @@ def analyze_interaction_patterns(
     """
     cutoff = datetime.utcnow() - timedelta(days=days)
     
-    interactions = UserInteractionModel.query.filter(
+    # Aggregate in the database: one row per action type instead of every interaction
+    view_duration = case(
+        (
+            (UserInteractionModel.action_type == 'view') & (UserInteractionModel.duration_seconds != 0),
+            UserInteractionModel.duration_seconds,
+        ),
+    )
+    rows = UserInteractionModel.query.with_entities(
+        UserInteractionModel.action_type,
+        func.count(),
+        func.avg(view_duration),
+    ).filter(
         UserInteractionModel.sync_code == sync_code,
         UserInteractionModel.created_at >= cutoff
-    ).all()
+    ).group_by(UserInteractionModel.action_type).all()
     
-    if not interactions:
+    if not rows:
         return {
             'total_interactions': 0,
             'action_counts': {},
@@ -490,20 +710,16 @@ def analyze_interaction_patterns(
             'dismiss_rate': 0,
         }
     
-    action_counts = defaultdict(int)
-    view_durations = []
-    
-    for i in interactions:
-        action_counts[i.action_type] += 1
-        if i.action_type == 'view' and i.duration_seconds:
-            view_durations.append(i.duration_seconds)
-    
-    total = len(interactions)
+    action_counts = {action_type: count for action_type, count, _ in rows}
+    avg_view_duration = next(
+        (float(avg) for action_type, _, avg in rows if action_type == 'view' and avg is not None), 0
+    )
+    total = sum(action_counts.values())
     
     return {
         'total_interactions': total,
-        'action_counts': dict(action_counts),
-        'avg_view_duration': sum(view_durations) / len(view_durations) if view_durations else 0,
+        'action_counts': action_counts,
+        'avg_view_duration': avg_view_duration,
         'save_rate': action_counts.get('save', 0) / total if total else 0,
         'dismiss_rate': action_counts.get('dismiss', 0) / total if total else 0,
         'contact_rate': action_counts.get('contact', 0) / total if total else 0,
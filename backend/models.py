@@ -5,24 +5,131 @@ Contains the Listing model and related database entities for storing
 scraped notebook listings with normalized data.
 """
 
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
-import random
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import TypeDecorator
+import secrets
 import string
 
 db = SQLAlchemy()
 
 
+class utcnow(FunctionElement):
+    """
+    Current UTC timestamp, evaluated by the database.
+    
+    Used as a column default so INSERT/UPDATE statements render the
+    timestamp inline instead of calling datetime.utcnow per row and binding
+    the result. Naive UTC, matching the datetime.utcnow values written
+    elsewhere in the app.
+    """
+    
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return 'CURRENT_TIMESTAMP'
+
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, 'sqlite')
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has second precision on SQLite
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+class StringList(TypeDecorator):
+    """
+    List of strings: a native varchar[] on PostgreSQL, JSON elsewhere.
+    
+    Values round-trip as Python lists, so readers don't re-split
+    comma-separated text on every serialization.
+    """
+    
+    impl = db.JSON
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import ARRAY
+            return dialect.type_descriptor(ARRAY(db.String))
+        return dialect.type_descriptor(db.JSON(none_as_null=True))
+
+
+# Closed value sets; stored as native ENUM types on PostgreSQL
+JOB_STATUSES = ('pending', 'running', 'completed', 'failed')
+ITEM_CLASSIFICATIONS = ('must_see', 'recommended', 'browse')
+ACTION_TYPES = ('view', 'click', 'save', 'dismiss', 'contact')
+
+
 # Association table for many-to-many relationship between Listing and Tag
 listing_tags = db.Table(
     'listing_tags',
     db.Column('listing_id', db.Integer, db.ForeignKey('listings.id', ondelete='CASCADE'), primary_key=True),
     db.Column('tag_id', db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
-    db.Column('created_at', db.DateTime, default=datetime.utcnow)
+    db.Column('created_at', db.DateTime, default=utcnow())
 )
 
 
+def _insert_ignore_conflicts(target, index_elements: List[str]):
+    """
+    Build an INSERT that skips rows conflicting on index_elements.
+    
+    Uses ON CONFLICT DO NOTHING on PostgreSQL and SQLite; other backends
+    get a plain INSERT.
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy import insert
+        return insert(target)
+    return insert(target).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def bulk_attach_tags(pairs: List[Tuple[int, int]]) -> None:
+    """
+    Link listings to tags with one executemany INSERT into listing_tags.
+    
+    Pairs that are already linked are skipped.
+    
+    Args:
+        pairs: (listing_id, tag_id) tuples.
+    """
+    rows = [{'listing_id': listing_id, 'tag_id': tag_id} for listing_id, tag_id in set(pairs)]
+    if rows:
+        db.session.execute(_insert_ignore_conflicts(listing_tags, ['listing_id', 'tag_id']), rows)
+
+
+
+def _csv_list(instance: Any, column: str) -> List[str]:
+    """
+    Return a comma-separated text column as a list of stripped values.
+    
+    The parsed list is memoised on the instance and reparsed only when the
+    column's value changes, so repeated to_dict calls don't rescan it.
+    """
+    raw = getattr(instance, column)
+    cache = instance.__dict__.setdefault('_csv_lists', {})
+    cached = cache.get(column)
+    if cached is None or cached[0] != raw:
+        cached = (raw, [v.strip() for v in (raw or '').split(',') if v.strip()])
+        cache[column] = cached
+    return cached[1]
+
 class Tag(db.Model):
     """
     Hardware specification tag for filtering listings.
@@ -43,7 +150,7 @@ class Tag(db.Model):
     category = db.Column(db.String(50), nullable=False, index=True)
     value = db.Column(db.String(100), nullable=False)
     display_name = db.Column(db.String(100), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
     
     __table_args__ = (
         db.UniqueConstraint('category', 'value', name='uq_tag_category_value'),
@@ -60,6 +167,41 @@ class Tag(db.Model):
             'value': self.value,
             'display_name': self.display_name or self.value,
         }
+    
+    @classmethod
+    def resolve_ids(cls, pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+        """
+        Look up tag ids for (category, value) pairs, creating missing tags.
+        
+        Existing tags are fetched with one tuple IN query and missing ones
+        inserted in one batch, instead of a query (and flush) per tag.
+        
+        Args:
+            pairs: (category, value) tuples as returned by extract_tags.
+        
+        Returns:
+            Dict mapping (category, value) to tag id.
+        """
+        wanted = set(pairs)
+        if not wanted:
+            return {}
+        
+        def lookup(keys):
+            rows = db.session.query(cls.id, cls.category, cls.value).filter(
+                db.tuple_(cls.category, cls.value).in_(list(keys))
+            )
+            return {(category, value): tag_id for tag_id, category, value in rows}
+        
+        ids = lookup(wanted)
+        missing = wanted - ids.keys()
+        if missing:
+            db.session.execute(
+                _insert_ignore_conflicts(cls, ['category', 'value']),
+                [{'category': category, 'value': value} for category, value in missing],
+            )
+            # Re-read rather than RETURNING so tags created concurrently are included
+            ids.update(lookup(missing))
+        return ids
 
 
 class ArchivedListing(db.Model):
@@ -81,7 +223,7 @@ class ArchivedListing(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     listing_id = db.Column(db.Integer, db.ForeignKey('listings.id', ondelete='CASCADE'), nullable=False, index=True)
     sync_code = db.Column(db.String(8), nullable=False, index=True)
-    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    archived_at = db.Column(db.DateTime, default=utcnow())
     
     __table_args__ = (
         db.UniqueConstraint('listing_id', 'sync_code', name='uq_archived_listing_sync'),
@@ -96,7 +238,7 @@ class ArchivedListing(db.Model):
             'id': self.id,
             'listing_id': self.listing_id,
             'sync_code': self.sync_code,
-            'archived_at': self.archived_at.isoformat() if self.archived_at else None,
+            'archived_at': self.archived_at,
         }
     
     @staticmethod
@@ -105,9 +247,15 @@ class ArchivedListing(db.Model):
         Generate a unique 8-character alphanumeric sync code.
         Format: 4 uppercase letters + 4 digits (e.g., 'GAME2024').
         """
-        letters = ''.join(random.choices(string.ascii_uppercase, k=4))
-        digits = ''.join(random.choices(string.digits, k=4))
-        return letters + digits
+        # One 64-bit CSPRNG draw split into 4 base-10 and 4 base-26 digits;
+        # 26**4 * 10**4 is tiny next to 2**64, so the modulo bias is negligible
+        n = int.from_bytes(secrets.token_bytes(8), 'big')
+        n, digits = divmod(n, 10 ** 4)
+        letters = []
+        for _ in range(4):
+            n, r = divmod(n, 26)
+            letters.append(string.ascii_uppercase[r])
+        return ''.join(letters) + f'{digits:04d}'
 
 
 class Listing(db.Model):
@@ -147,7 +295,7 @@ class Listing(db.Model):
     price_negotiable = db.Column(db.Boolean, default=False)
     
     # Location
-    location_city = db.Column(db.String(200), nullable=True, index=True)
+    location_city = db.Column(db.String(200), nullable=True)
     location_state = db.Column(db.String(100), nullable=True)
     
     # Listing details
@@ -156,15 +304,15 @@ class Listing(db.Model):
     
     # Timestamps
     posted_at = db.Column(db.DateTime, nullable=True)
-    scraped_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    scraped_at = db.Column(db.DateTime, default=utcnow(), nullable=False)
+    updated_at = db.Column(db.DateTime, default=utcnow(), onupdate=utcnow())
     
     # Additional metadata
     image_url = db.Column(db.String(500), nullable=True)
     seller_type = db.Column(db.String(50), nullable=True)
     
-    # Keywords that matched this listing (comma-separated)
-    search_keywords = db.Column(db.Text, nullable=True)
+    # Keywords that matched this listing (GIN-indexed on PostgreSQL)
+    search_keywords = db.Column(StringList, nullable=True)
 
     # Heuristic classification to support laptop-focused views
     item_type = db.Column(db.String(20), nullable=True, index=True)
@@ -175,12 +323,32 @@ class Listing(db.Model):
     # Debug field - not populated by default
     raw_html = db.Column(db.Text, nullable=True)
     
-    # Relationship to price history
-    price_history = db.relationship('PriceHistory', backref='listing', lazy='dynamic', cascade='all, delete-orphan')
+    # Composite indexes for the listings feed: type/category filter with the
+    # default posted_at ordering, and type filter with a price range. City
+    # lookups share the city/price index; the partial price index covers the
+    # stats aggregates, which skip listings without a price.
+    __table_args__ = (
+        db.Index('ix_listings_feed', 'item_type', 'posted_at'),
+        db.Index('ix_listings_category_feed', 'laptop_category', 'posted_at'),
+        db.Index('ix_listings_price_range', 'item_type', 'price_eur'),
+        db.Index('ix_listings_city_price', 'location_city', 'price_eur'),
+        db.Index('ix_listings_scraped_desc', scraped_at.desc(), 'id'),
+        db.Index(
+            'ix_listings_has_price', 'price_eur',
+            postgresql_where=db.text('price_eur IS NOT NULL'),
+            sqlite_where=db.text('price_eur IS NOT NULL'),
+        ),
+    )
+    
+    # Relationship to price history (oldest first). Loaded on access only, so
+    # bulk queries (e.g. for scoring) don't pull every listing's history;
+    # endpoints serializing a page of listings opt in with selectinload().
+    price_history = db.relationship('PriceHistory', backref='listing', lazy='select',
+                                    order_by='PriceHistory.recorded_at', cascade='all, delete-orphan')
     
-    # Relationship to hardware tags (many-to-many)
-    tags = db.relationship('Tag', secondary=listing_tags, lazy='dynamic',
-                           backref=db.backref('listings', lazy='dynamic'))
+    # Relationship to hardware tags (many-to-many), loaded with one SELECT ... IN
+    # per batch of listings rather than one query per listing
+    tags = db.relationship('Tag', secondary=listing_tags, lazy='selectin', backref='listings')
     
     def __repr__(self) -> str:
         return f'<Listing {self.external_id}: {self.title[:50]}>'
@@ -195,11 +363,6 @@ class Listing(db.Model):
         Returns:
             Dict containing all listing fields in JSON-serializable format.
         """
-        # Parse search_keywords into list
-        keywords_list = []
-        if self.search_keywords:
-            keywords_list = [k.strip() for k in self.search_keywords.split(',') if k.strip()]
-        
         result = {
             'id': self.id,
             'external_id': self.external_id,
@@ -213,20 +376,19 @@ class Listing(db.Model):
             },
             'description': self.description,
             'condition': self.condition,
-            'posted_at': self.posted_at.isoformat() if self.posted_at else None,
-            'scraped_at': self.scraped_at.isoformat() if self.scraped_at else None,
+            'posted_at': self.posted_at,
+            'scraped_at': self.scraped_at,
             'image_url': self.image_url,
             'seller_type': self.seller_type,
-            'search_keywords': keywords_list,
+            'search_keywords': self.search_keywords or [],
             'item_type': self.item_type,
             'laptop_category': self.laptop_category,
-            'tags': [tag.to_dict() for tag in self.tags.all()] if self.tags else [],
+            'tags': [tag.to_dict() for tag in self.tags],
         }
         
         # Include price history if requested
         if include_price_history:
-            history = self.price_history.order_by(PriceHistory.recorded_at.asc()).limit(20).all()
-            result['price_history'] = [h.to_dict() for h in history]
+            result['price_history'] = [h.to_dict() for h in self.price_history[:20]]
         
         return result
     
@@ -256,29 +418,142 @@ class Listing(db.Model):
         Returns:
             Listing: New Listing instance (not yet added to session).
         """
+        return cls(**cls.scraped_columns(data))
+    
+    @staticmethod
+    def scraped_columns(data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Map a scraped data dictionary to Listing column values.
+        
+        Shared by from_scraped_dict and bulk_from_scraped so both paths
+        normalize prices and field names the same way.
+        
+        Args:
+            data: Scraped listing dictionary (see from_scraped_dict).
+        
+        Returns:
+            Dict of column name to value.
+        """
         # Convert price from euros to cents
         price_cents = None
         if data.get('price') is not None:
             price_cents = int(data['price'] * 100)
         
-        return cls(
-            external_id=data['external_id'],
-            url=data['url'],
-            title=data['title'],
-            price_eur=price_cents,
-            price_negotiable=data.get('price_negotiable', False),
-            location_city=data.get('city'),
-            location_state=data.get('state'),
-            description=data.get('description'),
-            condition=data.get('condition'),
-            posted_at=data.get('posted_at'),
-            image_url=data.get('image_url'),
-            seller_type=data.get('seller_type'),
-            item_type=data.get('item_type'),
-            laptop_category=data.get('laptop_category'),
-        )
+        return {
+            'external_id': data['external_id'],
+            'url': data['url'],
+            'title': data['title'],
+            'price_eur': price_cents,
+            'price_negotiable': data.get('price_negotiable', False),
+            'location_city': data.get('city'),
+            'location_state': data.get('state'),
+            'description': data.get('description'),
+            'condition': data.get('condition'),
+            'posted_at': data.get('posted_at'),
+            'image_url': data.get('image_url'),
+            'seller_type': data.get('seller_type'),
+            'search_keywords': data.get('search_keywords'),
+            'item_type': data.get('item_type'),
+            'laptop_category': data.get('laptop_category'),
+        }
+    
+    @classmethod
+    def bulk_from_scraped(cls, data_list: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Insert many scraped listings in one batched INSERT ... RETURNING.
+        
+        Rows whose external_id already exists are skipped (ON CONFLICT DO
+        NOTHING on PostgreSQL and SQLite), so a concurrent job inserting the
+        same listing does not abort the batch.
+        
+        Args:
+            data_list: Scraped listing dictionaries (see from_scraped_dict).
+        
+        Returns:
+            Dict mapping external_id to the new row id, for inserted rows only.
+        """
+        if not data_list:
+            return {}
+        
+        stmt = _insert_ignore_conflicts(cls, ['external_id'])
+        mappings = [cls.scraped_columns(data) for data in data_list]
+        result = db.session.execute(stmt.returning(cls.id, cls.external_id), mappings)
+        return {external_id: listing_id for listing_id, external_id in result}
+
 
 
+@dataclass(slots=True)
+class ListingView:
+    """
+    Read-only listing row for list endpoints, built without ORM instances.
+    
+    Fields mirror the Listing columns that to_dict() reads (plus updated_at
+    for cache keys); to_dict() is Listing's own, so payloads are identical.
+    """
+    
+    id: int
+    external_id: str
+    url: str
+    title: str
+    price_eur: Optional[int]
+    price_negotiable: bool
+    location_city: Optional[str]
+    location_state: Optional[str]
+    description: Optional[str]
+    condition: Optional[str]
+    posted_at: Optional[datetime]
+    scraped_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    image_url: Optional[str]
+    seller_type: Optional[str]
+    search_keywords: Optional[List[str]]
+    item_type: Optional[str]
+    laptop_category: Optional[str]
+    tags: List['Tag'] = field(default_factory=list)
+    price_history: List['PriceHistory'] = field(default_factory=list)
+    
+    to_dict = Listing.to_dict
+    
+    @classmethod
+    def columns(cls) -> List[Any]:
+        """Listing columns to select, in field order, for from_rows()."""
+        return [getattr(Listing, f.name) for f in fields(cls) if f.name not in ('tags', 'price_history')]
+    
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> List['ListingView']:
+        """
+        Build views from rows selected with columns().
+        
+        Tags and price history for all rows are loaded with one query each.
+        
+        Args:
+            rows: Result rows in columns() order.
+        
+        Returns:
+            List of ListingView in the same order.
+        """
+        views = [cls(*row) for row in rows]
+        if not views:
+            return views
+        
+        by_id = {view.id: view for view in views}
+        tag_rows = db.session.execute(
+            db.select(listing_tags.c.listing_id, Tag)
+            .join(Tag, Tag.id == listing_tags.c.tag_id)
+            .where(listing_tags.c.listing_id.in_(list(by_id)))
+        )
+        for listing_id, tag in tag_rows:
+            by_id[listing_id].tags.append(tag)
+        
+        history = db.session.scalars(
+            db.select(PriceHistory)
+            .where(PriceHistory.listing_id.in_(list(by_id)))
+            .order_by(PriceHistory.recorded_at)
+        )
+        for entry in history:
+            by_id[entry.listing_id].price_history.append(entry)
+        return views
+
 class PriceHistory(db.Model):
     """
     Tracks price changes for listings over time.
@@ -296,9 +571,14 @@ class PriceHistory(db.Model):
     __tablename__ = 'price_history'
     
     id = db.Column(db.Integer, primary_key=True)
-    listing_id = db.Column(db.Integer, db.ForeignKey('listings.id', ondelete='CASCADE'), nullable=False, index=True)
+    listing_id = db.Column(db.Integer, db.ForeignKey('listings.id', ondelete='CASCADE'), nullable=False)
     price = db.Column(db.Integer, nullable=True)  # Price in cents
-    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    recorded_at = db.Column(db.DateTime, default=utcnow(), nullable=False)
+    
+    # One listing's history is a single contiguous, already-ordered index range
+    __table_args__ = (
+        db.Index('ix_price_history_listing_recorded', 'listing_id', 'recorded_at'),
+    )
     
     def __repr__(self) -> str:
         return f'<PriceHistory listing={self.listing_id} price={self.price}>'
@@ -307,7 +587,7 @@ class PriceHistory(db.Model):
         """Convert price history entry to dictionary."""
         return {
             'price': self.price / 100 if self.price else None,
-            'recorded_at': self.recorded_at.isoformat() if self.recorded_at else None,
+            'recorded_at': self.recorded_at,
         }
 
 
@@ -337,35 +617,99 @@ class ScraperConfig(db.Model):
     update_interval_minutes = db.Column(db.Integer, default=60, nullable=False)
     page_limit = db.Column(db.Integer, default=5, nullable=False)
     is_active = db.Column(db.Boolean, default=False, nullable=False)
-    last_modified = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_modified = db.Column(db.DateTime, default=utcnow(), onupdate=utcnow())
     
     def __repr__(self) -> str:
         return f'<ScraperConfig keywords={self.keywords[:30]}>'
     
+    @property
+    def keywords_list(self) -> List[str]:
+        """Search keywords as a list."""
+        return _csv_list(self, 'keywords')
+    
+    @property
+    def categories_list(self) -> List[str]:
+        """Category slugs as a list."""
+        return _csv_list(self, 'categories')
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary for API responses."""
         return {
             'id': self.id,
             'keywords': self.keywords,
-            'keywords_list': [k.strip() for k in self.keywords.split(',') if k.strip()],
+            'keywords_list': self.keywords_list,
             'city': self.city,
             'categories': self.categories,
-            'categories_list': [c.strip() for c in self.categories.split(',') if c.strip()],
+            'categories_list': self.categories_list,
             'update_interval_minutes': self.update_interval_minutes,
             'page_limit': self.page_limit,
             'is_active': self.is_active,
-            'last_modified': self.last_modified.isoformat() if self.last_modified else None,
+            'last_modified': self.last_modified,
         }
     
+    # Seconds a shared snapshot is served before the row is read again
+    CACHE_TTL = 30
+    
+    @classmethod
+    def get_cached(cls) -> 'ScraperConfig':
+        """
+        Get a read-only view of the config, shared through the app cache.
+        
+        With a Redis cache configured, the row is read at most once per
+        CACHE_TTL across all workers and update paths call invalidate().
+        Without one this is get_config(), so workers never disagree.
+        
+        Returns:
+            ScraperConfig: A detached copy (cache hit) or the session instance.
+            Use get_config() for changes.
+        """
+        cache = current_app.extensions.get('redis_cache')
+        if cache is None:
+            return cls.get_config()
+        
+        try:
+            values = cache.get('scraper_config')
+        except Exception:
+            values = None
+        if values is not None:
+            # The cache stores JSON, so last_modified comes back as ISO 8601
+            if isinstance(values.get('last_modified'), str):
+                values['last_modified'] = datetime.fromisoformat(values['last_modified'])
+            return cls(**values)
+        
+        config = cls.get_config()
+        try:
+            cache.set(
+                'scraper_config',
+                {column.key: getattr(config, column.key) for column in cls.__table__.columns},
+                timeout=cls.CACHE_TTL,
+            )
+        except Exception:
+            pass
+        return config
+    
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the shared snapshot after the config row changes."""
+        cache = current_app.extensions.get('redis_cache')
+        if cache is not None:
+            try:
+                cache.delete('scraper_config')
+            except Exception:
+                pass
+    
     @classmethod
     def get_config(cls) -> 'ScraperConfig':
         """
         Get the singleton config instance, creating it if needed.
         
+        Session.get checks the identity map first, so repeated calls within
+        one request return the loaded instance without another query.
+        
         Returns:
             ScraperConfig: The configuration instance.
         """
-        config = cls.query.get(1)
+        config = db.session.get(cls, 1)
         if not config:
             config = cls(id=1)
             db.session.add(config)
@@ -373,6 +717,29 @@ class ScraperConfig(db.Model):
         return config
 
 
+class SchemaMeta(db.Model):
+    """
+    Records the applied schema version (single row, id=1).
+    
+    init_db.py compares this against TARGET_SCHEMA_VERSION so restarts against
+    an up-to-date database skip all migration introspection.
+    
+    Attributes:
+        id: Primary key (always 1).
+        schema_version: Last schema version fully applied by init_db.py.
+        applied_at: When that version was recorded.
+    """
+    
+    __tablename__ = 'schema_meta'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    schema_version = db.Column(db.Integer, nullable=False, default=0)
+    applied_at = db.Column(db.DateTime, default=utcnow(), onupdate=utcnow())
+    
+    def __repr__(self) -> str:
+        return f'<SchemaMeta version={self.schema_version}>'
+
+
 class ScraperJob(db.Model):
     """
     Tracks scraper job executions for monitoring and debugging.
@@ -392,7 +759,7 @@ class ScraperJob(db.Model):
     __tablename__ = 'scraper_jobs'
     
     id = db.Column(db.Integer, primary_key=True)
-    status = db.Column(db.String(20), default='pending', nullable=False)
+    status = db.Column(db.Enum(*JOB_STATUSES, name='scraper_job_status'), default='pending', nullable=False)
     started_at = db.Column(db.DateTime, nullable=True)
     completed_at = db.Column(db.DateTime, nullable=True)
     pages_scraped = db.Column(db.Integer, default=0)
@@ -402,26 +769,27 @@ class ScraperJob(db.Model):
     error_message = db.Column(db.Text, nullable=True)
     # Optional JSON string with live progress data (for SSE/polling)
     progress_json = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
     
     def __repr__(self) -> str:
         return f'<ScraperJob {self.id}: {self.status}>'
     
+    @classmethod
+    def api_columns(cls) -> List[Any]:
+        """
+        Columns of to_dict(), for list endpoints that select plain rows.
+        
+        row._asdict() of a row selected with these equals to_dict() of the
+        job, without building an ORM instance.
+        """
+        return [cls.__table__.columns[key] for key in (
+            'id', 'status', 'started_at', 'completed_at', 'pages_scraped', 'listings_found',
+            'listings_new', 'listings_updated', 'error_message', 'progress_json', 'created_at',
+        )]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert job to dictionary for API responses."""
-        return {
-            'id': self.id,
-            'status': self.status,
-            'started_at': self.started_at.isoformat() if self.started_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'pages_scraped': self.pages_scraped,
-            'listings_found': self.listings_found,
-            'listings_new': self.listings_new,
-            'listings_updated': self.listings_updated,
-            'error_message': self.error_message,
-            'progress_json': self.progress_json,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-        }
+        return {column.key: getattr(self, column.key) for column in self.api_columns()}
 
 
 # =============================================================================
@@ -457,8 +825,8 @@ class UserPreferences(db.Model):
     weight_price = db.Column(db.Float, default=0.3, nullable=False)
     weight_specs = db.Column(db.Float, default=0.4, nullable=False)
     weight_brand = db.Column(db.Float, default=0.3, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=utcnow())
+    updated_at = db.Column(db.DateTime, default=utcnow(), onupdate=utcnow())
     
     def __repr__(self) -> str:
         return f'<UserPreferences sync={self.sync_code}>'
@@ -467,18 +835,18 @@ class UserPreferences(db.Model):
         """Convert preferences to dictionary for API responses."""
         return {
             'sync_code': self.sync_code,
-            'keywords': [k.strip() for k in (self.keywords or '').split(',') if k.strip()],
+            'keywords': _csv_list(self, 'keywords'),
             'min_price': self.min_price / 100 if self.min_price else None,
             'max_price': self.max_price / 100 if self.max_price else None,
-            'brands': [b.strip() for b in (self.brands or '').split(',') if b.strip()],
-            'laptop_categories': [c.strip() for c in (self.laptop_categories or '').split(',') if c.strip()],
+            'brands': _csv_list(self, 'brands'),
+            'laptop_categories': _csv_list(self, 'laptop_categories'),
             'weights': {
                 'price': self.weight_price,
                 'specs': self.weight_specs,
                 'brand': self.weight_brand,
             },
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
 
 
@@ -509,8 +877,8 @@ class ItemAnalysis(db.Model):
     brand_score = db.Column(db.Float, default=0.0)
     learned_bonus = db.Column(db.Float, default=0.0)
     total_score = db.Column(db.Float, default=0.0, index=True)
-    classification = db.Column(db.String(20), index=True)  # must_see, recommended, browse
-    analyzed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    classification = db.Column(db.Enum(*ITEM_CLASSIFICATIONS, name='item_classification'), index=True)
+    analyzed_at = db.Column(db.DateTime, default=utcnow())
     
     __table_args__ = (
         db.UniqueConstraint('listing_id', 'sync_code', name='uq_item_analysis_listing_user'),
@@ -518,7 +886,9 @@ class ItemAnalysis(db.Model):
     )
     
     # Relationship to listing
-    listing = db.relationship('Listing', backref=db.backref('analyses', lazy='dynamic', cascade='all, delete-orphan'))
+    listing = db.relationship('Listing', backref=db.backref(
+        'analyses', lazy='select', cascade='all, delete-orphan', passive_deletes=True,
+    ))
     
     def __repr__(self) -> str:
         return f'<ItemAnalysis listing={self.listing_id} score={self.total_score:.1f}>'
@@ -533,8 +903,60 @@ class ItemAnalysis(db.Model):
             'learned_bonus': round(self.learned_bonus, 1),
             'total_score': round(self.total_score, 1),
             'classification': self.classification,
-            'analyzed_at': self.analyzed_at.isoformat() if self.analyzed_at else None,
+            'analyzed_at': self.analyzed_at,
+        }
+    
+    @classmethod
+    def bulk_upsert(cls, sync_code: str, scores: Sequence[Tuple[int, Any]]) -> None:
+        """
+        Write scores for many listings of one user in one statement.
+        
+        Uses INSERT ... ON CONFLICT (listing_id, sync_code) DO UPDATE on
+        PostgreSQL and SQLite; other backends load the existing rows in one
+        query and update them through the session.
+        
+        Args:
+            sync_code: User identifier.
+            scores: (listing_id, ScoreResult from the scoring engine) pairs.
+        """
+        if not scores:
+            return
+        
+        fields = ('keyword_score', 'price_score', 'brand_score', 'learned_bonus', 'total_score', 'classification')
+        rows = [
+            dict(score._asdict(), listing_id=listing_id, sync_code=sync_code)
+            for listing_id, score in scores
+        ]
+        
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(cls)
+            set_ = {name: stmt.excluded[name] for name in fields}
+            set_['analyzed_at'] = utcnow()
+            db.session.execute(
+                stmt.on_conflict_do_update(index_elements=['listing_id', 'sync_code'], set_=set_),
+                rows,
+            )
+            return
+        
+        existing = {
+            analysis.listing_id: analysis
+            for analysis in cls.query.filter(
+                cls.sync_code == sync_code,
+                cls.listing_id.in_([listing_id for listing_id, _ in scores]),
+            )
         }
+        for row in rows:
+            analysis = existing.get(row['listing_id'])
+            if analysis is None:
+                db.session.add(cls(**row))
+            else:
+                for name in fields:
+                    setattr(analysis, name, row[name])
 
 
 class UserInteraction(db.Model):
@@ -556,12 +978,16 @@ class UserInteraction(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     sync_code = db.Column(db.String(8), nullable=False, index=True)
     listing_id = db.Column(db.Integer, db.ForeignKey('listings.id', ondelete='CASCADE'), nullable=False, index=True)
-    action_type = db.Column(db.String(20), nullable=False)  # view, click, save, dismiss, contact
+    action_type = db.Column(db.Enum(*ACTION_TYPES, name='interaction_action_type'), nullable=False)
     duration_seconds = db.Column(db.Integer, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, default=utcnow(), index=True)
+    
+    __table_args__ = (
+        db.Index('ix_user_interactions_sync_created', 'sync_code', 'created_at'),
+    )
     
     # Relationship to listing
-    listing = db.relationship('Listing', backref=db.backref('interactions', lazy='dynamic'))
+    listing = db.relationship('Listing', backref=db.backref('interactions', lazy='select', passive_deletes=True))
     
     def __repr__(self) -> str:
         return f'<UserInteraction {self.action_type} listing={self.listing_id}>'
@@ -573,7 +999,7 @@ class UserInteraction(db.Model):
             'listing_id': self.listing_id,
             'action_type': self.action_type,
             'duration_seconds': self.duration_seconds,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
         }
 
 
@@ -598,10 +1024,12 @@ class LearnedPreference(db.Model):
     keyword = db.Column(db.String(100), nullable=False)
     learned_weight = db.Column(db.Float, default=0.0)
     interaction_count = db.Column(db.Integer, default=0)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=utcnow(), onupdate=utcnow())
     
     __table_args__ = (
         db.UniqueConstraint('sync_code', 'keyword', name='uq_learned_pref_user_keyword'),
+        # fillfactor=70 (HOT headroom for frequent weight updates) is set by
+        # init_db migration 10, as SQLAlchemy 2.0 has no table-level WITH option
     )
     
     def __repr__(self) -> str:
@@ -628,10 +1056,12 @@ class BrandAffinity(db.Model):
     brand = db.Column(db.String(50), nullable=False)
     affinity_score = db.Column(db.Float, default=0.0)
     interaction_count = db.Column(db.Integer, default=0)
-    last_updated = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    last_updated = db.Column(db.DateTime, default=utcnow(), onupdate=utcnow())
     
     __table_args__ = (
         db.UniqueConstraint('sync_code', 'brand', name='uq_brand_affinity_user_brand'),
+        # fillfactor=70 (HOT headroom for frequent weight updates) is set by
+        # init_db migration 10, as SQLAlchemy 2.0 has no table-level WITH option
     )
     
     def __repr__(self) -> str:
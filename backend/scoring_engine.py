@@ -8,13 +8,93 @@ with support for machine learning adjustments from user behavior.
 from __future__ import annotations
 
 import re
+from bisect import bisect_left
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    import re2
+except ImportError:  # pragma: no cover - google-re2 is optional
+    re2 = None
 
 if TYPE_CHECKING:
     from models import Listing, UserPreferences, LearnedPreference, BrandAffinity
 
 
+# Price score tiers above the budget: up to 10% over, 10-20%, 20-50%, more.
+# A ratio equal to a break belongs to the lower tier, hence bisect_left.
+_OVER_BREAKS = (0.1, 0.2, 0.5)
+_OVER_SCORES = (80.0, 60.0, 30.0, 10.0)
+
+
+class ScoreResult(NamedTuple):
+    """
+    Score of one listing, as produced by the scoring engine.
+    
+    Field names match the ItemAnalysis columns. Use _asdict() where a dict
+    is needed (JSON responses, upserts); JSON encoders write a tuple as a list.
+    """
+    
+    keyword_score: float
+    price_score: float
+    brand_score: float
+    learned_bonus: float
+    total_score: float
+    classification: str
+
+
+def _round1(values: np.ndarray) -> List[float]:
+    """
+    round(value, 1) for a whole array, matching Python's round exactly.
+    
+    np.round scales by 10 and rounds half to even on the (inexact) product,
+    so values sitting near a .x5 boundary can round differently from
+    Python's correctly rounded round(); only those are redone in Python.
+    """
+    scaled = values * 10
+    result = (np.rint(scaled) / 10).tolist()
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        result[i] = round(values[i].item(), 1)
+    return result
+
+
+class _KeywordSet:
+    """
+    Finds which of many keywords occur (as substrings) in a text.
+    
+    With google-re2 the escaped keywords are compiled into one RE2 set that
+    reports every matching keyword, overlapping ones included, in a single
+    linear pass. Without it, for a handful of keywords (where `in` scans are
+    cheaper than a set match) or if the set is too large to compile, each
+    keyword is tested with `in`.
+    """
+    
+    # Fewest keywords for which one set match beats per-keyword `in` scans
+    MIN_KEYWORDS = 5
+    
+    def __init__(self, keywords: List[str]):
+        self.keywords = keywords
+        self._set = None
+        if re2 is not None and len(keywords) >= self.MIN_KEYWORDS:
+            keyword_set = re2.Set.SearchSet()
+            try:
+                for keyword in keywords:
+                    keyword_set.Add(re2.escape(keyword))
+                keyword_set.Compile()
+            except re2.error:
+                pass
+            else:
+                self._set = keyword_set
+    
+    def find(self, text: str) -> List[int]:
+        """Indices of the keywords contained in text, ascending."""
+        if self._set is None:
+            return [i for i, keyword in enumerate(self.keywords) if keyword in text]
+        return sorted(self._set.Match(text) or ())
+
+
 class AdaptiveScoringEngine:
     """
     Calculate match scores for listings based on user preferences.
@@ -40,7 +120,7 @@ class AdaptiveScoringEngine:
         preferences: 'UserPreferences',
         learned_keywords: Optional[Dict[str, float]] = None,
         brand_affinities: Optional[Dict[str, float]] = None,
-    ) -> Dict[str, Any]:
+    ) -> ScoreResult:
         """
         Calculate weighted score for a listing.
         
@@ -51,7 +131,7 @@ class AdaptiveScoringEngine:
             brand_affinities: Dict of brand -> affinity_score (-1 to +1).
         
         Returns:
-            Dict with keyword_score, price_score, brand_score, 
+            ScoreResult with keyword_score, price_score, brand_score,
             learned_bonus, total_score, classification.
         """
         learned_keywords = learned_keywords or {}
@@ -74,13 +154,7 @@ class AdaptiveScoringEngine:
         adjusted_brand_score = min(100, max(0, brand_score * (1 + brand_adjustment)))
         
         # Weighted total (ensure weights sum to 1.0)
-        weights_sum = preferences.weight_specs + preferences.weight_price + preferences.weight_brand
-        if weights_sum > 0:
-            w_specs = preferences.weight_specs / weights_sum
-            w_price = preferences.weight_price / weights_sum
-            w_brand = preferences.weight_brand / weights_sum
-        else:
-            w_specs, w_price, w_brand = 0.4, 0.3, 0.3
+        w_specs, w_price, w_brand = self._normalized_weights(preferences)
         
         # Calculate total before learned bonus
         base_score = (
@@ -100,14 +174,158 @@ class AdaptiveScoringEngine:
         else:
             classification = 'browse'
         
-        return {
-            'keyword_score': round(keyword_score, 1),
-            'price_score': round(price_score, 1),
-            'brand_score': round(adjusted_brand_score, 1),
-            'learned_bonus': round(learned_bonus, 1),
-            'total_score': round(total_score, 1),
-            'classification': classification,
-        }
+        return ScoreResult(
+            keyword_score=round(keyword_score, 1),
+            price_score=round(price_score, 1),
+            brand_score=round(adjusted_brand_score, 1),
+            learned_bonus=round(learned_bonus, 1),
+            total_score=round(total_score, 1),
+            classification=classification,
+        )
+    
+    def calculate_scores(
+        self,
+        listings: List['Listing'],
+        preferences: 'UserPreferences',
+        learned_keywords: Optional[Dict[str, float]] = None,
+        brand_affinities: Optional[Dict[str, float]] = None,
+    ) -> List[ScoreResult]:
+        """
+        Calculate scores for many listings at once.
+        
+        Produces the same results as calculate_score, in input order. Each
+        listing's text is matched against all preference (and all learned)
+        keywords in one pass (see _KeywordSet); the price, weighting, clamping
+        and classification steps are NumPy array operations over the batch.
+        
+        Args:
+            listings: Listings to score.
+            preferences: User-defined preferences.
+            learned_keywords: Dict of keyword -> learned_weight adjustments.
+            brand_affinities: Dict of brand -> affinity_score (-1 to +1).
+        
+        Returns:
+            List of ScoreResult aligned with listings.
+        """
+        if not listings:
+            return []
+        learned_keywords = learned_keywords or {}
+        brand_affinities = brand_affinities or {}
+        n = len(listings)
+        
+        titles = [listing.title.lower() for listing in listings]
+        texts = [f"{listing.title} {listing.description or ''}".lower() for listing in listings]
+        tags = [listing.tags for listing in listings]
+        tag_brands = [
+            next((tag.value.lower() for tag in listing_tags if tag.category == 'brand'), None)
+            for listing_tags in tags
+        ]
+        
+        # Keyword score: share of preference keywords found in text or tags
+        pref_keywords = self._parse_csv(preferences.keywords)
+        if pref_keywords:
+            keyword_set = _KeywordSet(pref_keywords)
+            matches = np.array([
+                len(set(keyword_set.find(text)).union(
+                    *(keyword_set.find(tag.value.lower()) for tag in listing_tags)
+                ))
+                for text, listing_tags in zip(texts, tags)
+            ], dtype=float)
+            keyword_score = matches / len(pref_keywords) * 100
+        else:
+            keyword_score = np.full(n, 50.0)
+        
+        price_score = self._score_prices(
+            [listing.price_eur for listing in listings], preferences.min_price, preferences.max_price
+        )
+        
+        # Brand score: 100 on any preferred brand in title or brand tag, else neutral
+        pref_brands = self._parse_csv(preferences.brands)
+        brand_score = np.full(n, 50.0)
+        if pref_brands:
+            # Reposted listings share titles; scan each distinct title/brand tag once
+            brand_keys = list(zip(titles, tag_brands))
+            brand_hits = {
+                key: any(brand in key[0] or (key[1] and brand in key[1]) for brand in pref_brands)
+                for key in set(brand_keys)
+            }
+            brand_score[[brand_hits[key] for key in brand_keys]] = 100.0
+        
+        # Learned bonus: 10 points per weight unit of every learned keyword in text
+        learned_bonus = np.zeros(n)
+        if learned_keywords:
+            # Summed in dict order, as calculate_score does, so floats match exactly
+            learned_set = _KeywordSet([keyword.lower() for keyword in learned_keywords])
+            points = [weight * 10 for weight in learned_keywords.values()]
+            for row, text in enumerate(texts):
+                for index in learned_set.find(text):
+                    learned_bonus[row] += points[index]
+        
+        # Brand adjustment: first learned brand (in dict order) found in the title
+        brand_adjustment = np.zeros(n)
+        if brand_affinities:
+            lowered = [(brand.lower(), affinity * 0.5) for brand, affinity in brand_affinities.items()]
+            adjustments = {
+                title: next((adjustment for brand, adjustment in lowered if brand in title), 0.0)
+                for title in set(titles)
+            }
+            brand_adjustment[:] = [adjustments[title] for title in titles]
+        
+        adjusted_brand_score = np.clip(brand_score * (1 + brand_adjustment), 0, 100)
+        
+        w_specs, w_price, w_brand = self._normalized_weights(preferences)
+        
+        base_score = keyword_score * w_specs + price_score * w_price + adjusted_brand_score * w_brand
+        total_score = np.clip(base_score + np.clip(learned_bonus, -20, 20), 0, 100)
+        classification = np.select(
+            [total_score >= self.MUST_SEE_THRESHOLD, total_score >= self.RECOMMENDED_THRESHOLD],
+            ['must_see', 'recommended'],
+            default='browse',
+        )
+        
+        # Rounded once per column at the end, matching calculate_score's round(x, 1)
+        return list(map(
+            ScoreResult,
+            _round1(keyword_score), _round1(price_score), _round1(adjusted_brand_score),
+            _round1(learned_bonus), _round1(total_score), classification.tolist(),
+        ))
+    
+    def _score_prices(
+        self,
+        prices: List[Optional[int]],
+        min_price: Optional[int],
+        max_price: Optional[int],
+    ) -> np.ndarray:
+        """Vectorized _score_price over a batch of prices (cents, None allowed)."""
+        price = np.array([np.nan if p is None else p for p in prices], dtype=float)
+        known = ~np.isnan(price)
+        
+        if min_price is None and max_price is None:
+            return np.where(known, 50.0, 30.0)
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            below_min = known & (price < min_price) if min_price is not None else np.zeros(len(price), bool)
+            above_max = known & (price > max_price) if max_price is not None else np.zeros(len(price), bool)
+            below_score = np.maximum(20, price / min_price * 80) if min_price else np.full(len(price), 80.0)
+            over_ratio = (price - max_price) / max_price if max_price else np.zeros(len(price))
+        over_score = np.take(_OVER_SCORES, np.searchsorted(_OVER_BREAKS, over_ratio, side='left'))
+        
+        return np.select(
+            [~known, below_min, above_max & bool(max_price), above_max],
+            [30.0, below_score, over_score, 50.0],
+            default=100.0,
+        )
+    
+    def _normalized_weights(self, preferences: 'UserPreferences') -> Tuple[float, float, float]:
+        """Specs, price and brand weights scaled to sum to 1.0 (defaults if all zero)."""
+        weights_sum = preferences.weight_specs + preferences.weight_price + preferences.weight_brand
+        if weights_sum > 0:
+            return (
+                preferences.weight_specs / weights_sum,
+                preferences.weight_price / weights_sum,
+                preferences.weight_brand / weights_sum,
+            )
+        return 0.4, 0.3, 0.3
     
     def _parse_csv(self, value: Optional[str]) -> List[str]:
         """Parse comma-separated values into list."""
@@ -127,22 +345,17 @@ class AdaptiveScoringEngine:
         # Combine title and description for matching
         text = f"{listing.title} {listing.description or ''}".lower()
         
-        # Also check tags
-        tag_values = []
-        if hasattr(listing, 'tags') and listing.tags:
-            try:
-                tag_values = [tag.value.lower() for tag in listing.tags.all()]
-            except Exception:
-                pass
+        # Also check tags (a plain list, batch-loaded with the listing)
+        tag_values = [tag.value.lower() for tag in listing.tags]
         
+        # Keywords come lowercased from _parse_csv
         matches = 0
         for keyword in keywords:
-            keyword_lower = keyword.lower()
             # Check in text
-            if keyword_lower in text:
+            if keyword in text:
                 matches += 1
             # Check in tags
-            elif any(keyword_lower in tag for tag in tag_values):
+            elif any(keyword in tag for tag in tag_values):
                 matches += 1
         
         # Score: percentage of keywords matched, scaled 0-100
@@ -188,14 +401,7 @@ class AdaptiveScoringEngine:
         if not below_max and max_price:
             # Above maximum
             over_ratio = (price_cents - max_price) / max_price
-            if over_ratio <= 0.1:
-                return 80.0  # Up to 10% over
-            elif over_ratio <= 0.2:
-                return 60.0  # 10-20% over
-            elif over_ratio <= 0.5:
-                return 30.0  # 20-50% over
-            else:
-                return 10.0  # More than 50% over
+            return _OVER_SCORES[bisect_left(_OVER_BREAKS, over_ratio)]
         
         return 50.0
     
@@ -215,21 +421,13 @@ class AdaptiveScoringEngine:
         title_lower = listing.title.lower()
         
         # Also check tags for brand
-        listing_brand = None
-        if hasattr(listing, 'tags') and listing.tags:
-            try:
-                for tag in listing.tags.all():
-                    if tag.category == 'brand':
-                        listing_brand = tag.value.lower()
-                        break
-            except Exception:
-                pass
+        listing_brand = next((tag.value.lower() for tag in listing.tags if tag.category == 'brand'), None)
         
+        # Brands come lowercased from _parse_csv
         for brand in brands:
-            brand_lower = brand.lower()
-            if brand_lower in title_lower:
+            if brand in title_lower:
                 return 100.0
-            if listing_brand and brand_lower in listing_brand:
+            if listing_brand and brand in listing_brand:
                 return 100.0
         
         # No match - return neutral
@@ -296,7 +494,7 @@ def score_listing(
     preferences: 'UserPreferences',
     learned_keywords: Optional[Dict[str, float]] = None,
     brand_affinities: Optional[Dict[str, float]] = None,
-) -> Dict[str, Any]:
+) -> ScoreResult:
     """Convenience function to score a single listing."""
     return scoring_engine.calculate_score(
         listing, preferences, learned_keywords, brand_affinities
@@ -308,15 +506,13 @@ def score_listings_batch(
     preferences: 'UserPreferences',
     learned_keywords: Optional[Dict[str, float]] = None,
     brand_affinities: Optional[Dict[str, float]] = None,
-) -> List[Tuple['Listing', Dict[str, Any]]]:
+) -> List[Tuple['Listing', ScoreResult]]:
     """Score multiple listings and return sorted by total_score DESC."""
-    results = []
-    for listing in listings:
-        score_data = scoring_engine.calculate_score(
-            listing, preferences, learned_keywords, brand_affinities
-        )
-        results.append((listing, score_data))
+    scores = scoring_engine.calculate_scores(
+        listings, preferences, learned_keywords, brand_affinities
+    )
     
-    # Sort by total_score descending
-    results.sort(key=lambda x: x[1]['total_score'], reverse=True)
-    return results
+    # Sort by total_score descending; stable, so ties keep input order
+    totals = np.array([score.total_score for score in scores])
+    order = np.argsort(-totals, kind='stable')
+    return [(listings[i], scores[i]) for i in order.tolist()]
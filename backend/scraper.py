@@ -1,22 +1,32 @@
 """
 Kleinanzeigen notebook listings scraper module.
 
-Uses Playwright for JavaScript rendering and BeautifulSoup for HTML parsing.
+Uses Playwright for JavaScript rendering and lxml for HTML parsing.
 Implements rate limiting, robots.txt compliance, and polite backoff strategies.
 """
 
+import atexit
+import codecs
+import functools
 import hashlib
+import io
+import itertools
 import logging
+import queue
 import random
 import re
+import threading
 import time
-from contextlib import contextmanager
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+import urllib.error
+import urllib.request
+from urllib.parse import quote, unquote, urljoin, urlparse, urlunparse
 
-from bs4 import BeautifulSoup
+from lxml import etree
 from playwright.sync_api import sync_playwright, Page, Browser
 
 logger = logging.getLogger(__name__)
@@ -34,6 +44,49 @@ SELECTORS = {
     'condition': '.aditem-main--middle--tags .simpletag',
 }
 
+
+# SELECTORS by class token, so all fields of an article are found in one walk
+# over its subtree (see KleinanzeigenScraper._collect_fields) instead of one
+# selector evaluation per field. Keep the two in sync; the listing_item
+# selector is matched while streaming (see _iter_articles).
+FIELD_CLASSES = {
+    'ellipsis': 'title',  # a.ellipsis
+    'aditem-main--middle--price-shipping--price': 'price',
+    'aditem-main--top--left': 'location',
+    'aditem-main--middle--description': 'description',
+    'imagebox': 'image',  # container: first img inside
+    'galleryimage': 'image',
+    'aditem-main--top--right': 'posted_date',
+    'aditem-main--middle--tags': 'condition',  # container: every .simpletag inside
+}
+
+# Patterns applied to every parsed listing, compiled once
+NEGOTIABLE_PATTERN = re.compile(r'\bVB\b|VERHANDLUNGSBASIS')
+PRICE_NUMBER_PATTERN = re.compile(r'(\d[\d\.\,\s]*)')
+EXTERNAL_ID_PATTERN = re.compile(r'/(\d{9,})(?:-[\d-]+)?(?:/|$|\?)')
+POSTAL_CODE_PATTERN = re.compile(r'^\d{5}\s*')
+LOCATION_SPLIT_PATTERN = re.compile(r'[,\-]')
+TIME_PATTERN = re.compile(r'(\d{1,2}):(\d{2})')
+FULL_DATE_PATTERN = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})')
+SHORT_DATE_PATTERN = re.compile(r'(\d{2})\.(\d{2})\.')
+
+# Resource types the browser doesn't download; listings are read from the
+# HTML alone (image URLs come from src/data-src attributes)
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+# Lowercase text that marks an access block / challenge page. Checked with
+# lower() + substring search, which is several times faster than one
+# case-insensitive alternation regex over a full page.
+BLOCKED_PAGE_MARKERS_TEXT = (
+    'captcha',
+    'robot',
+    'zugriff verweigert',
+    'access denied',
+    'unusual traffic',
+    'bot detection',
+)
+BLOCKED_PAGE_MARKERS = tuple(m.encode('ascii') for m in BLOCKED_PAGE_MARKERS_TEXT)
+
 # Default User-Agent for scraping requests
 DEFAULT_USER_AGENT = (
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
@@ -41,6 +94,177 @@ DEFAULT_USER_AGENT = (
 )
 
 
+@functools.lru_cache(maxsize=64)
+def _url_origin(base_url: str) -> Optional[str]:
+    """scheme://netloc of a URL (None if it has neither), parsed once per base."""
+    parsed = urlparse(base_url)
+    if not parsed.scheme or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def _resolve_href(base_url: str, href: str) -> str:
+    """
+    urljoin(base_url, href) with a fast path for listing links.
+    
+    Listing hrefs are root-relative ("/s-anzeige/..."); without dot
+    segments those resolve to the base's origin plus the href, so neither
+    URL needs parsing per article. Anything else goes through urljoin.
+    """
+    origin = _url_origin(base_url)
+    if origin and href.startswith('/') and not href.startswith('//') and '/.' not in href:
+        return origin + href
+    return urljoin(base_url, href)
+
+
+class FetchResult(NamedTuple):
+    """Outcome of a plain HTTP request; error statuses carry an empty body."""
+    status: int
+    body: bytes
+    charset: str
+    headers: Any
+
+
+class BrowserUnavailableError(Exception):
+    """
+    The browser could not be started for a LazyPage.
+    
+    Unlike navigation errors this is not retried per page: it propagates out
+    of scrape_page() and fetch_robots() so callers can switch proxies.
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket pacing page requests.
+    
+    Holds up to `capacity` tokens and refills `rate` tokens per second, so
+    requests may burst up to capacity but average at most `rate` per second.
+    One bucket can be shared by every worker of a scrape job.
+    """
+    
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        Take tokens, sleeping until the bucket has refilled enough.
+        
+        The tokens are reserved under the lock (the balance may go negative)
+        and the wait happens outside it, so concurrent callers queue up one
+        refill interval apart instead of waking together.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class RobotsRules:
+    """
+    The robots.txt rules for the '*' user agent as a longest-match table.
+    
+    Rules are sorted once, longest path first and Allow before Disallow on
+    equal length (RFC 9309), so a check stops at the first rule that
+    matches. Paths with '*' wildcards or a '$' end anchor get a compiled
+    matcher; plain paths are prefix checks. Verdicts are memoized per path.
+    """
+    
+    MAX_MEMO = 4096
+    
+    # RFC 9309 lets parsers stop after the first 500 KiB
+    MAX_LENGTH = 500 * 1024
+    
+    def __init__(self, rules: List[Tuple[str, bool]]):
+        """
+        Args:
+            rules: (quoted path pattern, allowed) pairs in any order.
+        """
+        self.rules = sorted(rules, key=lambda rule: (-len(rule[0]), not rule[1]))
+        self._matchers = [self._compile(pattern) for pattern, _ in self.rules]
+        self._memo: Dict[str, bool] = {}
+    
+    @classmethod
+    def parse(cls, text: str) -> 'RobotsRules':
+        """
+        Parse robots.txt in one pass, keeping the rules of '*' groups.
+        
+        A group is one or more User-agent lines followed by its rules;
+        groups for the same agent are merged. Field names are
+        case-insensitive, '#' starts a comment anywhere on a line, and
+        blank lines or unknown fields (Sitemap, Crawl-delay) don't end a
+        group.
+        """
+        rules: List[Tuple[str, bool]] = []
+        agents: set = set()
+        in_rules = False
+        for raw in text[:cls.MAX_LENGTH].splitlines():
+            field, sep, value = raw.split('#', 1)[0].partition(':')
+            if not sep:
+                continue
+            field = field.strip().lower()
+            value = value.strip()
+            if field == 'user-agent':
+                if in_rules:
+                    agents = set()
+                    in_rules = False
+                agents.add(value.lower())
+            elif field in ('allow', 'disallow'):
+                in_rules = True
+                # An empty value (e.g. "Disallow:") matches nothing
+                if '*' in agents and value:
+                    rules.append((quote(unquote(value), safe='/*$'), field == 'allow'))
+        return cls(rules)
+    
+    @staticmethod
+    def _compile(pattern: str) -> Optional[Callable[[str], Any]]:
+        """Regex matcher for a wildcard pattern, None for a plain prefix."""
+        if '*' not in pattern and not pattern.endswith('$'):
+            return None
+        anchored = pattern.endswith('$')
+        body = pattern[:-1] if anchored else pattern
+        regex = '.*'.join(re.escape(part) for part in body.split('*'))
+        return re.compile(regex + ('$' if anchored else '')).match
+    
+    @staticmethod
+    def normalize(url_or_path: str) -> str:
+        """Path, params and query of a URL, quoted the way rule paths are."""
+        parsed = urlparse(unquote(url_or_path))
+        path = quote(urlunparse(('', '', parsed.path, parsed.params, parsed.query, parsed.fragment)))
+        return path or '/'
+    
+    def allows(self, url_or_path: str) -> bool:
+        """Whether the '*' agent may fetch a URL or path."""
+        path = self.normalize(url_or_path)
+        allowed = self._memo.get(path)
+        if allowed is None:
+            allowed = True
+            for (pattern, allow), matcher in zip(self.rules, self._matchers):
+                if matcher(path) if matcher else path.startswith(pattern):
+                    allowed = allow
+                    break
+            if len(self._memo) >= self.MAX_MEMO:
+                self._memo.clear()
+            self._memo[path] = allowed
+        return allowed
+
+
+# Parsed robots.txt per URL, shared by every RobotsChecker in the process:
+# (rules or None after a failed fetch, monotonic expiry time)
+ROBOTS_TTL_SECONDS = 6 * 3600
+ROBOTS_FAILURE_TTL_SECONDS = 300
+_robots_cache: Dict[str, Tuple[Optional[RobotsRules], float]] = {}
+_robots_lock = threading.Lock()
+
+
 class RobotsChecker:
     """
     Utility class to check robots.txt compliance.
@@ -58,37 +282,66 @@ class RobotsChecker:
         self.base_url = base_url
         self.parsed = urlparse(base_url)
         self.robots_url = f"{self.parsed.scheme}://{self.parsed.netloc}/robots.txt"
-        self._parser: Optional[RobotFileParser] = None
+        self._rules: Optional[RobotsRules] = None
         self._fetched = False
     
-    def fetch_robots(self, page: Page) -> None:
+    def fetch_robots(
+        self, page: Page, fetch: Optional[Callable[[str], Optional[FetchResult]]] = None
+    ) -> None:
         """
         Fetch and parse robots.txt from the target site.
         
+        The parsed file is cached per process for ROBOTS_TTL_SECONDS, so
+        repeated jobs and parallel workers reuse it instead of navigating
+        again. A failed fetch is cached for ROBOTS_FAILURE_TTL_SECONDS only.
+        
         Args:
             page: Playwright page instance to use for fetching.
+            fetch: Optional plain HTTP fetch (like KleinanzeigenScraper._fetch_html)
+                to try first; the page is only used if it gets no response.
         """
+        with _robots_lock:
+            cached = _robots_cache.get(self.robots_url)
+            if cached is not None and time.monotonic() < cached[1]:
+                rules = cached[0]
+            else:
+                rules = self._download(page, fetch)
+                ttl = ROBOTS_TTL_SECONDS if rules is not None else ROBOTS_FAILURE_TTL_SECONDS
+                _robots_cache[self.robots_url] = (rules, time.monotonic() + ttl)
+        self._rules = rules
+        self._fetched = rules is not None
+    
+    def _download(
+        self, page: Page, fetch: Optional[Callable[[str], Optional[FetchResult]]] = None
+    ) -> Optional[RobotsRules]:
+        """Load robots.txt over HTTP or through the page; None if it could not be fetched."""
+        if fetch is not None:
+            result = fetch(self.robots_url)
+            if result is not None:
+                if result.status != 200:
+                    logger.warning(f"Could not fetch robots.txt: HTTP {result.status} from {self.robots_url}")
+                    return None
+                rules = RobotsRules.parse(result.body.decode(result.charset, errors='replace'))
+                logger.info(f"Successfully fetched robots.txt from {self.robots_url}")
+                return rules
         try:
             response = page.goto(self.robots_url, wait_until='domcontentloaded', timeout=30000)
             if not response:
                 logger.warning(f"Could not fetch robots.txt: No response from {self.robots_url}")
-                self._fetched = False
-                return
+                return None
 
             if not response.ok:
                 logger.warning(f"Could not fetch robots.txt: HTTP {response.status} from {self.robots_url}")
-                self._fetched = False
-                return
-
-            robots_text = response.text()
-            parser = RobotFileParser()
-            parser.parse(robots_text.splitlines())
-            self._parser = parser
-            self._fetched = True
+                return None
+
+            rules = RobotsRules.parse(response.text())
             logger.info(f"Successfully fetched robots.txt from {self.robots_url}")
+            return rules
+        except BrowserUnavailableError:
+            raise
         except Exception as e:
             logger.warning(f"Error fetching robots.txt: {e}")
-            self._fetched = False
+            return None
     
     def is_allowed(self, url_or_path: str) -> bool:
         """
@@ -100,37 +353,129 @@ class RobotsChecker:
         Returns:
             bool: True if scraping is allowed, False otherwise.
         """
-        if not self._fetched or not self._parser:
+        if not self._fetched or not self._rules:
             logger.warning("robots.txt not fetched/parsed, assuming allowed")
             return True
         
-        # RobotFileParser works on URLs; normalize if caller passed a path.
-        if url_or_path.startswith('http://') or url_or_path.startswith('https://'):
-            url = url_or_path
-        else:
-            url = f"{self.parsed.scheme}://{self.parsed.netloc}{url_or_path}"
-
-        allowed = self._parser.can_fetch('*', url)
+        allowed = self._rules.allows(url_or_path)
         if not allowed:
             logger.warning(f"Disallowed by robots.txt: {url_or_path}")
         return allowed
 
 
+# Playwright drivers and browsers still open, by registry key. One atexit
+# hook closes whatever is left; each scraper thread removes its own entry.
+_open_browsers: Dict[int, Tuple[Any, Browser]] = {}
+_open_browsers_lock = threading.Lock()
+_browser_keys = itertools.count()
+
+
+def _stop_browser(playwright, browser: Optional[Browser]) -> None:
+    """Close a browser and stop its Playwright driver, ignoring errors."""
+    try:
+        if browser is not None:
+            browser.close()
+    except Exception as e:
+        logger.debug(f"Error closing browser: {e}")
+    try:
+        if playwright is not None:
+            playwright.stop()
+    except Exception as e:
+        logger.debug(f"Error stopping Playwright: {e}")
+
+
+def _register_browser(playwright, browser: Browser) -> int:
+    """Track an open browser until _release_browser(); returns its key."""
+    with _open_browsers_lock:
+        if not _open_browsers:
+            atexit.register(_close_open_browsers)
+        key = next(_browser_keys)
+        _open_browsers[key] = (playwright, browser)
+    return key
+
+
+def _release_browser(key: int) -> Optional[Tuple[Any, Browser]]:
+    """Stop tracking a browser, dropping the atexit hook once none are left."""
+    with _open_browsers_lock:
+        handles = _open_browsers.pop(key, None)
+        if handles is not None and not _open_browsers:
+            atexit.unregister(_close_open_browsers)
+    return handles
+
+
+def _close_open_browsers() -> None:
+    """atexit hook: close browsers whose scrapers were never closed."""
+    with _open_browsers_lock:
+        handles = list(_open_browsers.values())
+        _open_browsers.clear()
+    for playwright, browser in handles:
+        _stop_browser(playwright, browser)
+
+
+class LazyPage:
+    """
+    Stand-in for a Playwright page that opens it on first use.
+    
+    Attribute access (goto, content, ...) enters the given page factory,
+    e.g. KleinanzeigenScraper.open_page, so code written against a Page
+    works unchanged while the browser only starts once something needs it.
+    If opening fails, BrowserUnavailableError is raised.
+    """
+    
+    def __init__(self, open_page: Callable[[], ContextManager[Page]]):
+        self._open_page = open_page
+        self._stack = ExitStack()
+        self._page: Optional[Page] = None
+    
+    @property
+    def opened(self) -> bool:
+        """Whether the real page has been opened."""
+        return self._page is not None
+    
+    def __getattr__(self, name: str) -> Any:
+        if self._page is None:
+            try:
+                self._page = self._stack.enter_context(self._open_page())
+            except Exception as e:
+                raise BrowserUnavailableError(f"Could not open browser page: {e}") from e
+        return getattr(self._page, name)
+    
+    def close(self) -> None:
+        """Close the real page's context, if it was opened."""
+        self._page = None
+        self._stack.close()
+
+
 class KleinanzeigenScraper:
     """
     Scraper for Kleinanzeigen notebook listings.
     
-    Uses Playwright for rendering JavaScript-heavy pages and BeautifulSoup
+    Uses Playwright for rendering JavaScript-heavy pages and lxml
     for parsing the HTML. Implements polite scraping with rate limiting
-    and robots.txt compliance.
+    and robots.txt compliance. The browser stays open across scrape()
+    calls until close() is called from the thread that used it. That only
+    pays off for callers that scrape repeatedly on one thread: the app's
+    jobs each run on a new thread and close their browsers when done.
     
     Attributes:
         base_url: Base URL for notebook listings.
         delay_seconds: Delay between page requests.
         page_limit: Maximum pages to scrape per run.
         browser_type: Playwright browser to use (chromium, firefox, webkit).
+        concurrency: Pages fetched in parallel by scrape() (1-4).
+        rate_limiter: Token bucket every page request draws from.
+        fetch_mode: 'http' (plain request first, browser as fallback) or
+            'playwright' (browser only).
     """
     
+    # Floor for delay_seconds, i.e. at most one request per 2s on average
+    MIN_DELAY_SECONDS = 2.0
+    
+    # Longest wait before retrying a failed page
+    RETRY_BACKOFF_CAP = 120.0
+    
+    FETCH_MODES = ('http', 'playwright')
+    
     def __init__(
         self,
         base_url: str = 'https://www.kleinanzeigen.de/s-notebooks/c278',
@@ -138,6 +483,9 @@ class KleinanzeigenScraper:
         page_limit: int = 5,
         browser_type: str = 'chromium',
         proxy: Optional[Dict[str, str]] = None,
+        concurrency: int = 1,
+        rate_limiter: Optional[TokenBucket] = None,
+        fetch_mode: str = 'http',
     ):
         """
         Initialize the scraper with configuration.
@@ -148,13 +496,32 @@ class KleinanzeigenScraper:
             page_limit: Maximum number of pages to scrape per run.
             browser_type: Playwright browser type ('chromium', 'firefox', 'webkit').
             proxy: Optional proxy configuration dict with 'server', 'username', 'password'.
+            concurrency: Number of browser pages scrape() drives in parallel,
+                clamped to 1-4 like SCRAPER_CONCURRENCY.
+            rate_limiter: Shared TokenBucket for all requests (e.g. across
+                the workers of one job). Defaults to a private bucket allowing
+                a burst of 2 and one request per delay_seconds.
+            fetch_mode: 'http' to fetch result pages with a plain HTTP request
+                and use the browser only when that yields no listings, or
+                'playwright' to always render in the browser.
+        
+        Raises:
+            ValueError: If fetch_mode is not one of FETCH_MODES.
         """
+        if fetch_mode not in self.FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {self.FETCH_MODES}, got {fetch_mode!r}")
         self.base_url = base_url
-        self.delay_seconds = max(delay_seconds, 2.0)  # Enforce minimum delay
+        self.delay_seconds = max(delay_seconds, self.MIN_DELAY_SECONDS)  # Enforce minimum delay
         self.page_limit = page_limit
         self.browser_type = browser_type
         self.proxy = proxy
-        self._browser: Optional[Browser] = None
+        self.concurrency = max(1, min(concurrency, 4))
+        self.rate_limiter = rate_limiter or TokenBucket(capacity=2, rate=1 / self.delay_seconds)
+        self.fetch_mode = fetch_mode
+        self._http_opener: Optional[urllib.request.OpenerDirector] = None
+        # Browser and its _open_browsers key, started on first use and kept
+        # for later scrapes; per thread, as the sync API is bound to its thread
+        self._local = threading.local()
         self._robots_checker: Optional[RobotsChecker] = None
 
     @staticmethod
@@ -176,32 +543,94 @@ class KleinanzeigenScraper:
         base_part = base_url.rstrip('/')
         return f"{base_part}/seite:{page_num}/"
 
+    def _ensure_browser(self) -> Browser:
+        """
+        Return this thread's browser, launching Playwright on first use.
+        
+        The browser outlives open_page() so that repeated scrapes only pay
+        for a new context, not for a driver and browser cold start. A
+        browser that has crashed or disconnected is replaced.
+        """
+        browser = getattr(self._local, 'browser', None)
+        if browser is not None and browser.is_connected():
+            return browser
+        if browser is not None:
+            self.close()
+
+        playwright = sync_playwright().start()
+        launch_options = {'headless': True}
+        if self.proxy:
+            launch_options['proxy'] = self.proxy
+        try:
+            browser = getattr(playwright, self.browser_type).launch(**launch_options)
+        except Exception:
+            playwright.stop()
+            raise
+
+        self._local.browser = browser
+        self._local.browser_key = _register_browser(playwright, browser)
+        return browser
+
+    def close(self) -> None:
+        """Close the calling thread's browser and Playwright driver, if started."""
+        key = getattr(self._local, 'browser_key', None)
+        self._local.browser = None
+        self._local.browser_key = None
+        if key is None:
+            return
+        handles = _release_browser(key)
+        if handles is not None:
+            _stop_browser(*handles)
+
+    @staticmethod
+    def _block_heavy_resources(route) -> None:
+        """Route handler aborting requests for BLOCKED_RESOURCE_TYPES."""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
     @contextmanager
     def open_page(self) -> Page:
-        """Open a single Playwright page (browser+context) for reuse across many scrapes."""
-        with sync_playwright() as p:
-            browser_launcher = getattr(p, self.browser_type)
-            launch_options = {'headless': True}
-            if self.proxy:
-                launch_options['proxy'] = self.proxy
-
-            browser = browser_launcher.launch(**launch_options)
-            context = browser.new_context(
-                user_agent=DEFAULT_USER_AGENT,
-                viewport={'width': 1920, 'height': 1080},
-                locale='de-DE',
-                timezone_id='Europe/Berlin',
-                extra_http_headers={
-                    'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
-                },
-            )
+        """Open a Playwright page in a fresh context of the shared browser."""
+        context = self._ensure_browser().new_context(
+            user_agent=DEFAULT_USER_AGENT,
+            viewport={'width': 1920, 'height': 1080},
+            locale='de-DE',
+            timezone_id='Europe/Berlin',
+            extra_http_headers={
+                'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
+            },
+        )
+        try:
             page = context.new_page()
             page.set_default_timeout(30000)
-
-            try:
+            page.route('**/*', self._block_heavy_resources)
+            yield page
+        finally:
+            context.close()
+    
+    @contextmanager
+    def page_session(self) -> Iterator[Union[Page, LazyPage]]:
+        """
+        Page to hand to scrape_page() and fetch_robots() for a run of pages.
+        
+        In playwright mode this is open_page(); in http mode a LazyPage, so
+        the browser is only started if a page has to fall back to it.
+        """
+        if self.fetch_mode == 'playwright':
+            with self.open_page() as page:
                 yield page
-            finally:
-                browser.close()
+            return
+        lazy = LazyPage(self.open_page)
+        try:
+            yield lazy
+        finally:
+            lazy.close()
+    
+    def fetch_robots(self, checker: RobotsChecker, page: Union[Page, LazyPage]) -> None:
+        """Load robots.txt into checker, over plain HTTP in http fetch mode."""
+        checker.fetch_robots(page, self._fetch_html if self.fetch_mode == 'http' else None)
     
     def _extract_price(self, price_text: Optional[str]) -> tuple[Optional[float], bool]:
         """
@@ -219,14 +648,14 @@ class KleinanzeigenScraper:
         
         text = price_text.strip()
         upper = text.upper()
-        is_negotiable = bool(re.search(r'\bVB\b', upper)) or 'VERHANDLUNGSBASIS' in upper
+        is_negotiable = NEGOTIABLE_PATTERN.search(upper) is not None
 
         # Common non-numeric price labels
         if 'ZU VERSCHENKEN' in upper or 'VERSCHENKE' in upper:
             return 0.0, is_negotiable
 
         # Extract first number-like token and normalize German formatting.
-        match = re.search(r'(\d[\d\.\,\s]*)', upper)
+        match = PRICE_NUMBER_PATTERN.search(upper)
         if not match:
             return None, is_negotiable
 
@@ -248,33 +677,103 @@ class KleinanzeigenScraper:
             str: External listing ID.
         """
         # URLs like /s-anzeige/laptop-dell-xps/1234567890-278-1234
-        match = re.search(r'/(\d{9,})(?:-[\d-]+)?(?:/|$|\?)', url)
+        match = EXTERNAL_ID_PATTERN.search(url)
         if match:
             return match.group(1)
         # Fallback: deterministic ID from the URL (stable across runs)
         return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
     
-    def _parse_listing(self, article: BeautifulSoup, base_url: str) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _iter_articles(html: Union[str, bytes], encoding: str = 'utf-8') -> Iterator[etree._Element]:
+        """
+        Yield the listing articles of a result page as it is parsed.
+        
+        Once the caller moves on, each article and the siblings before it
+        are dropped, so the full tree of the page is never held at once.
+        Articles must therefore be used before the next one is requested.
+        
+        Args:
+            html: Page HTML; raw response bytes are parsed without decoding.
+            encoding: Charset of html when it is bytes.
+        """
+        if isinstance(html, str):
+            html, encoding = html.encode('utf-8'), 'utf-8'
+        events = etree.iterparse(
+            io.BytesIO(html), events=('end',), tag='article',
+            html=True, encoding=encoding,
+        )
+        try:
+            for _, elem in events:
+                if 'aditem' in (elem.get('class') or '').split():
+                    yield elem
+                elem.clear(keep_tail=True)
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        except etree.XMLSyntaxError:
+            return  # Empty document
+    
+    @staticmethod
+    def _text(elem: Optional[etree._Element]) -> str:
+        """Stripped text of an element and its descendants ('' for None)."""
+        if elem is None:
+            return ''
+        return ''.join(part.strip() for part in elem.itertext())
+    
+    @staticmethod
+    def _collect_fields(article: etree._Element) -> Dict[str, List[etree._Element]]:
+        """
+        Find the SELECTORS fields of an article in one pass over its subtree.
+        
+        Returns:
+            Dict of field name to matching elements in document order; every
+            field but condition holds at most the first match.
+        """
+        fields: Dict[str, List[etree._Element]] = {key: [] for key in set(FIELD_CLASSES.values())}
+        for elem in article.iterdescendants(etree.Element):
+            class_attr = elem.get('class')
+            if not class_attr:
+                continue
+            for name in class_attr.split():
+                key = FIELD_CLASSES.get(name)
+                if key is None:
+                    continue
+                found = fields[key]
+                if key == 'condition':
+                    found.extend(
+                        tag for tag in elem.iterdescendants(etree.Element)
+                        if 'simpletag' in (tag.get('class') or '').split() and tag not in found
+                    )
+                elif found:
+                    continue
+                elif key == 'image':
+                    found.extend(itertools.islice(elem.iterdescendants('img'), 1))
+                elif key != 'title' or elem.tag == 'a':
+                    found.append(elem)
+        return fields
+    
+    def _parse_listing(self, article: etree._Element, base_url: str) -> Optional[Dict[str, Any]]:
         """
         Parse a single listing article element into a dictionary.
         
         Args:
-            article: BeautifulSoup element for the listing article.
+            article: lxml element for the listing article.
             base_url: Base URL for resolving relative links.
         
         Returns:
             Dict with listing data, or None if parsing failed.
         """
         try:
+            fields = self._collect_fields(article)
+            
             # Extract title and URL
-            title_elem = article.select_one(SELECTORS['title'])
-            if not title_elem:
+            if not fields['title']:
                 logger.warning("Could not find title element")
                 return None
             
-            title = title_elem.get_text(strip=True)
+            title_elem = fields['title'][0]
+            title = self._text(title_elem)
             href = title_elem.get('href', '')
-            url = urljoin(base_url, href) if href else ''
+            url = _resolve_href(base_url, href) if href else ''
             
             if not url:
                 logger.warning("Could not extract listing URL")
@@ -284,36 +783,31 @@ class KleinanzeigenScraper:
             external_id = self._extract_external_id(url)
             
             # Extract price
-            price_elem = article.select_one(SELECTORS['price'])
-            price_text = price_elem.get_text(strip=True) if price_elem else ''
+            price_text = self._text(fields['price'][0]) if fields['price'] else ''
             price, price_negotiable = self._extract_price(price_text)
             
             # Extract location
-            location_elem = article.select_one(SELECTORS['location'])
-            location_text = location_elem.get_text(strip=True) if location_elem else ''
+            location_text = self._text(fields['location'][0]) if fields['location'] else ''
             city, state = self._parse_location(location_text)
             
             # Extract description
-            desc_elem = article.select_one(SELECTORS['description'])
-            description = desc_elem.get_text(strip=True) if desc_elem else None
+            description = self._text(fields['description'][0]) if fields['description'] else None
             
             # Extract image URL
-            img_elem = article.select_one(SELECTORS['image'])
             image_url = None
-            if img_elem:
+            if fields['image']:
+                img_elem = fields['image'][0]
                 image_url = img_elem.get('src') or img_elem.get('data-src')
             
             # Extract posted date
-            date_elem = article.select_one(SELECTORS['posted_date'])
-            posted_at = self._parse_date(date_elem.get_text(strip=True) if date_elem else '')
+            posted_at = self._parse_date(self._text(fields['posted_date'][0]) if fields['posted_date'] else '')
             
             # Extract condition tags
             condition = None
-            tag_elems = article.select(SELECTORS['condition'])
-            for tag in tag_elems:
-                tag_text = tag.get_text(strip=True).lower()
-                if 'neu' in tag_text or 'gebraucht' in tag_text:
-                    condition = tag.get_text(strip=True)
+            for tag in fields['condition']:
+                tag_text = self._text(tag)
+                if 'neu' in tag_text.lower() or 'gebraucht' in tag_text.lower():
+                    condition = tag_text
                     break
             
             return {
@@ -349,10 +843,10 @@ class KleinanzeigenScraper:
             return None, None
         
         # Remove postal code if present
-        cleaned = re.sub(r'^\d{5}\s*', '', location_text.strip())
+        cleaned = POSTAL_CODE_PATTERN.sub('', location_text.strip())
         
         # Try to split city and state (often separated by comma or dash)
-        parts = re.split(r'[,\-]', cleaned, maxsplit=1)
+        parts = LOCATION_SPLIT_PATTERN.split(cleaned, maxsplit=1)
         city = parts[0].strip() if parts else None
         state = parts[1].strip() if len(parts) > 1 else None
         
@@ -375,7 +869,7 @@ class KleinanzeigenScraper:
         now = datetime.now()
 
         # Extract optional time (e.g., "Heute, 14:30")
-        time_match = re.search(r'(\d{1,2}):(\d{2})', text)
+        time_match = TIME_PATTERN.search(text)
         hour = int(time_match.group(1)) if time_match else None
         minute = int(time_match.group(2)) if time_match else None
         
@@ -391,7 +885,7 @@ class KleinanzeigenScraper:
             return datetime(yesterday.year, yesterday.month, yesterday.day)
         
         # Try parsing absolute date (DD.MM.YYYY)
-        match = re.search(r'(\d{2})\.(\d{2})\.(\d{4})', text)
+        match = FULL_DATE_PATTERN.search(text)
         if match:
             day, month, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
             try:
@@ -400,7 +894,7 @@ class KleinanzeigenScraper:
                 pass
 
         # Try parsing short date without year (DD.MM.)
-        match = re.search(r'(\d{2})\.(\d{2})\.', text)
+        match = SHORT_DATE_PATTERN.search(text)
         if match:
             day, month = int(match.group(1)), int(match.group(2))
             try:
@@ -410,7 +904,7 @@ class KleinanzeigenScraper:
         
         return None
 
-    def _looks_like_blocked_page(self, html: str) -> bool:
+    def _looks_like_blocked_page(self, html: Union[str, bytes]) -> bool:
         """
         Heuristic detection for access blocks / challenge pages.
 
@@ -418,111 +912,222 @@ class KleinanzeigenScraper:
         and apply backoff when the site presents a block page.
         """
         lower = html.lower()
-        markers = (
-            'captcha',
-            'robot',
-            'zugriff verweigert',
-            'access denied',
-            'unusual traffic',
-            'bot detection',
-        )
+        markers = BLOCKED_PAGE_MARKERS if isinstance(html, bytes) else BLOCKED_PAGE_MARKERS_TEXT
         return any(m in lower for m in markers)
     
-    def scrape_page(self, page: Page, url: str, retry_count: int = 0) -> List[Dict[str, Any]]:
+    def _next_backoff(self, previous: float) -> float:
+        """
+        Wait before the next retry, using decorrelated jitter.
+        
+        A random value between delay_seconds and three times the previous
+        wait, capped at RETRY_BACKOFF_CAP: waits grow roughly exponentially,
+        but workers that failed together do not retry in lockstep.
+        """
+        return min(self.RETRY_BACKOFF_CAP, random.uniform(self.delay_seconds, previous * 3))
+    
+    @staticmethod
+    def _retry_after_seconds(response) -> Optional[float]:
+        """Seconds requested by a Retry-After header (delay or HTTP date), if any."""
+        value = response.headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    
+    def _parse_page(
+        self, html: Union[str, bytes], url: str, encoding: str = 'utf-8'
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Parse the listing articles of a result page, skipping ones that fail.
+        
+        Returns:
+            Tuple of (number of articles found, parsed listings).
+        """
+        found = 0
+        listings = []
+        for article in self._iter_articles(html, encoding):
+            found += 1
+            try:
+                listing = self._parse_listing(article, url)
+                if listing:
+                    listings.append(listing)
+            except Exception as e:
+                logger.warning(f"Failed to parse individual listing: {e}")
+                continue  # Skip bad listings, continue with others
+        return found, listings
+    
+    def _fetch_html(self, url: str) -> Optional[FetchResult]:
+        """
+        Fetch a page with a plain HTTP request (browser headers, same proxy).
+        
+        Returns:
+            FetchResult with the status, undecoded body, charset and headers
+            (HTTP errors included, for Retry-After), or None on a network error.
+        """
+        if self._http_opener is None:
+            handlers = []
+            if self.proxy:
+                proxy_url = self.proxy['server']
+                if self.proxy.get('username'):
+                    parsed = urlparse(proxy_url)
+                    credentials = quote(self.proxy['username'], safe='')
+                    if self.proxy.get('password'):
+                        credentials += ':' + quote(self.proxy['password'], safe='')
+                    proxy_url = parsed._replace(netloc=f"{credentials}@{parsed.netloc}").geturl()
+                handlers.append(urllib.request.ProxyHandler({'http': proxy_url, 'https': proxy_url}))
+            self._http_opener = urllib.request.build_opener(*handlers)
+        
+        request = urllib.request.Request(url, headers={
+            'User-Agent': DEFAULT_USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'de-DE,de;q=0.9,en;q=0.8',
+        })
+        try:
+            with self._http_opener.open(request, timeout=30) as response:
+                charset = codecs.lookup(response.headers.get_content_charset() or 'utf-8').name
+                return FetchResult(response.status, response.read(), charset, response.headers)
+        except urllib.error.HTTPError as e:
+            return FetchResult(e.code, b'', 'utf-8', e.headers)
+        except Exception as e:
+            logger.warning(f"HTTP fetch failed for {url}: {e}")
+            return None
+    
+    def scrape_page(
+        self, page: Union[Page, LazyPage], url: str, retry_count: int = 0
+    ) -> List[Dict[str, Any]]:
         """
         Scrape a single page of listings with retry logic.
         
+        In http fetch mode the page is requested without the browser first.
+        429 and 5xx responses are retried with backoff like in the browser;
+        only a block page or a page without listing articles (or a request
+        that got no response at all) moves the remaining attempts to the
+        browser.
+        
         Args:
-            page: Playwright page instance.
+            page: Playwright page instance (or LazyPage), used for browser
+                attempts only.
             url: URL of the page to scrape.
-            retry_count: Current retry attempt (for internal use).
+            retry_count: Attempt to start counting from (retries left are
+                MAX_RETRIES - retry_count).
         
         Returns:
             List of parsed listing dictionaries.
+        
+        Raises:
+            BrowserUnavailableError: If a LazyPage could not start the browser.
         """
         MAX_RETRIES = 3
-        logger.info(f"Scraping page: {url}" + (f" (retry {retry_count})" if retry_count > 0 else ""))
         
-        try:
-            # Navigate to page with timeout
-            response = page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            
-            if not response:
-                logger.error(f"No response from {url}")
-                if retry_count < MAX_RETRIES:
-                    time.sleep(self.delay_seconds * 2)
-                    return self.scrape_page(page, url, retry_count + 1)
-                return []
-            
-            # Handle rate limiting with exponential backoff
-            if response.status == 429:
-                backoff_time = self.delay_seconds * (2 ** (retry_count + 1))
-                logger.warning(f"Rate limited (429). Backing off for {backoff_time}s...")
-                time.sleep(backoff_time)
-                if retry_count < MAX_RETRIES:
-                    return self.scrape_page(page, url, retry_count + 1)
-                return []
-            
-            # Handle server errors with retry
-            if response.status >= 500:
-                logger.error(f"Server error HTTP {response.status} for {url}")
-                if retry_count < MAX_RETRIES:
-                    time.sleep(self.delay_seconds * 2)
-                    return self.scrape_page(page, url, retry_count + 1)
-                return []
-            
-            # Handle client errors (don't retry)
-            if response.status >= 400:
-                logger.error(f"Client error HTTP {response.status} for {url}")
-                return []
-            
-            # Wait for page to stabilize
-            page.wait_for_load_state('domcontentloaded')
-            time.sleep(1.5 + random.random() * 1.5)  # Allow dynamic content to load (+ jitter)
+        # Result pages are server-rendered, so a plain request usually has all listings
+        use_browser = self.fetch_mode == 'playwright'
+        reason: Optional[str] = None
+        backoff = self.delay_seconds
+        retry_after: Optional[float] = None
+        
+        for attempt in range(retry_count, MAX_RETRIES + 1):
+            if reason is not None:
+                if reason == 'empty':
+                    # Not a server failure; just give the page another look
+                    wait = self.delay_seconds
+                else:
+                    backoff = self._next_backoff(backoff)
+                    # Honor Retry-After, within the same cap
+                    wait = max(backoff, min(retry_after or 0.0, self.RETRY_BACKOFF_CAP))
+                logger.info(f"Retrying {url} in {wait:.1f}s ({reason})")
+                time.sleep(wait)
+                retry_after = None
+            reason = None
+            logger.info(f"Scraping page: {url}" + (f" (retry {attempt})" if attempt > 0 else ""))
             
-            # Try to wait for listings, but don't fail if not found
             try:
-                page.wait_for_selector(SELECTORS['listing_item'], timeout=10000)
-            except Exception:
-                logger.warning(f"Listing selector not found on page, trying to parse anyway")
-            
-            # Get page content and parse
-            html = page.content()
-            if self._looks_like_blocked_page(html):
-                logger.warning(f"Page content looks like an access block/challenge: {url}")
-                if retry_count < MAX_RETRIES:
-                    time.sleep(self.delay_seconds * (2 ** (retry_count + 1)))
-                    return self.scrape_page(page, url, retry_count + 1)
-                return []
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            listings = []
-            articles = soup.select(SELECTORS['listing_item'])
-            logger.info(f"Found {len(articles)} listings on page")
-            
-            # If no listings found, might be a page issue - try once more
-            if len(articles) == 0 and retry_count < 1:
-                logger.warning(f"No listings found, retrying page...")
-                time.sleep(self.delay_seconds)
-                return self.scrape_page(page, url, retry_count + 1)
-            
-            for article in articles:
-                try:
-                    listing = self._parse_listing(article, url)
-                    if listing:
-                        listings.append(listing)
-                except Exception as e:
-                    logger.warning(f"Failed to parse individual listing: {e}")
-                    continue  # Skip bad listings, continue with others
-            
-            return listings
-            
-        except Exception as e:
-            logger.error(f"Error scraping page {url}: {e}")
-            if retry_count < MAX_RETRIES:
-                time.sleep(self.delay_seconds * 2)
-                return self.scrape_page(page, url, retry_count + 1)
-            return []
+                # Navigate to page with timeout, paced by the shared bucket
+                self.rate_limiter.acquire()
+                if use_browser:
+                    response = page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                else:
+                    response = self._fetch_html(url)
+                
+                if not response:
+                    logger.error(f"No response from {url}")
+                    reason = 'no_response'
+                    # Plain requests may not get through at all (e.g. proxy)
+                    use_browser = True
+                    continue
+                
+                # Rate limited: retry after backoff (or Retry-After)
+                if response.status == 429:
+                    logger.warning(f"Rate limited (429) on {url}")
+                    reason = 'rate_limited'
+                    retry_after = self._retry_after_seconds(response)
+                    continue
+                
+                # Handle server errors with retry
+                if response.status >= 500:
+                    logger.error(f"Server error HTTP {response.status} for {url}")
+                    reason = 'server_error'
+                    continue
+                
+                # Handle client errors (don't retry)
+                if response.status >= 400:
+                    logger.error(f"Client error HTTP {response.status} for {url}")
+                    return []
+                
+                if use_browser:
+                    # Wait for the listings to render rather than a fixed time;
+                    # pacing between requests is the rate limiter's job
+                    page.wait_for_load_state('domcontentloaded')
+                    
+                    # Try to wait for listings, but don't fail if not found
+                    try:
+                        page.wait_for_selector(SELECTORS['listing_item'], timeout=5000)
+                    except Exception:
+                        logger.warning(f"Listing selector not found on page, trying to parse anyway")
+                    
+                    html, encoding = page.content(), 'utf-8'
+                else:
+                    html, encoding = response.body, response.charset
+                
+                if self._looks_like_blocked_page(html):
+                    logger.warning(f"Page content looks like an access block/challenge: {url}")
+                    if not use_browser:
+                        logger.info(f"Falling back to the browser for {url}")
+                        use_browser = True
+                        continue
+                    reason = 'blocked'
+                    continue
+                found, listings = self._parse_page(html, url, encoding)
+                logger.info(f"Found {found} listings on page" + ("" if use_browser else " (HTTP)"))
+                
+                if found == 0 and not use_browser:
+                    logger.info(f"No listing articles via HTTP, falling back to the browser for {url}")
+                    use_browser = True
+                    continue
+                
+                # If no listings found, might be a page issue - try once more
+                if found == 0 and attempt < 1:
+                    logger.warning(f"No listings found, retrying page...")
+                    reason = 'empty'
+                    continue
+                
+                return listings
+                
+            except BrowserUnavailableError:
+                raise
+            except Exception as e:
+                logger.error(f"Error scraping page {url}: {e}")
+                reason = 'error'
+        
+        return []
     
     def scrape(self, start_page: int = 1) -> List[Dict[str, Any]]:
         """
@@ -541,29 +1146,82 @@ class KleinanzeigenScraper:
             Exception: If scraping is not allowed by robots.txt.
         """
         all_listings = []
+        page_nums = list(range(start_page, start_page + self.page_limit))
+        workers = min(self.concurrency, len(page_nums))
+        
+        # Promoted ads repeat on later pages; keep the first copy of each
+        seen_ids: set[str] = set()
+        
+        def add_new(listings: List[Dict[str, Any]]) -> int:
+            added = 0
+            for listing in listings:
+                ext_id = listing.get('external_id')
+                if ext_id:
+                    if ext_id in seen_ids:
+                        continue
+                    seen_ids.add(ext_id)
+                all_listings.append(listing)
+                added += 1
+            return added
 
-        with self.open_page() as page:
+        with self.page_session() as page:
             # Check robots.txt compliance
             self._robots_checker = RobotsChecker(self.base_url)
-            self._robots_checker.fetch_robots(page)
+            self.fetch_robots(self._robots_checker, page)
 
             parsed_url = urlparse(self.base_url)
             if not self._robots_checker.is_allowed(parsed_url.path):
                 raise Exception(f"Scraping not allowed by robots.txt for {parsed_url.path}")
 
             # Scrape pages
-            for page_num in range(start_page, start_page + self.page_limit):
-                url = self.build_page_url(self.base_url, page_num)
+            if workers <= 1:
+                no_new_pages = 0
+                for page_num in page_nums:
+                    url = self.build_page_url(self.base_url, page_num)
 
-                listings = self.scrape_page(page, url)
-                all_listings.extend(listings)
+                    listings = self.scrape_page(page, url)
+                    no_new_pages = 0 if add_new(listings) else no_new_pages + 1
+
+                    logger.info(f"Total listings so far: {len(all_listings)}")
+
+                    # Stop early on an empty page or when pages keep repeating
+                    # listings we already have (same rule as the app's jobs)
+                    if not listings or no_new_pages >= 2:
+                        break
+
+        if workers > 1:
+            # Playwright's sync API is bound to the thread that started it, so
+            # each worker has its own page session (opened on first use in
+            # http mode), kept for all the pages it takes from the queue.
+            # Requests from all workers draw on the one rate limiter.
+            page_queue: queue.Queue = queue.Queue()
+            for page_num in page_nums:
+                page_queue.put(page_num)
+            results: Dict[int, List[Dict[str, Any]]] = {}
+
+            def worker() -> None:
+                # The pool's threads end with this call, so their browsers can't be reused
+                try:
+                    with self.page_session() as worker_page:
+                        while True:
+                            try:
+                                page_num = page_queue.get_nowait()
+                            except queue.Empty:
+                                return
+                            results[page_num] = self.scrape_page(
+                                worker_page, self.build_page_url(self.base_url, page_num)
+                            )
+                            logger.info(f"Page {page_num}: {len(results[page_num])} listings")
+                finally:
+                    self.close()
 
-                logger.info(f"Total listings so far: {len(all_listings)}")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in [executor.submit(worker) for _ in range(workers)]:
+                    future.result()
 
-                # Polite delay between pages
-                if page_num < start_page + self.page_limit - 1:
-                    logger.debug(f"Waiting {self.delay_seconds}s before next page...")
-                    time.sleep(self.delay_seconds)
+            # Keep page order regardless of which worker finished first
+            for page_num in page_nums:
+                add_new(results.get(page_num, []))
         
         logger.info(f"Scraping complete. Total listings: {len(all_listings)}")
         return all_listings
@@ -147,6 +147,12 @@ TAG_PATTERNS = {
     'os': _OS_PATTERNS,
 }
 
+# TAG_PATTERNS compiled once; extract_tags runs for every scraped listing
+_COMPILED_TAG_PATTERNS = {
+    category: [(re.compile(pattern, re.IGNORECASE), extractor) for pattern, extractor in patterns]
+    for category, patterns in TAG_PATTERNS.items()
+}
+
 
 def extract_tags(title: str, description: Optional[str] = None) -> List[Tuple[str, str]]:
     """
@@ -167,9 +173,9 @@ def extract_tags(title: str, description: Optional[str] = None) -> List[Tuple[st
     tags: List[Tuple[str, str]] = []
     seen: set = set()
     
-    for category, patterns in TAG_PATTERNS.items():
+    for category, patterns in _COMPILED_TAG_PATTERNS.items():
         for pattern, extractor in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
                 # Apply extractor to get the normalized value
                 if callable(extractor):
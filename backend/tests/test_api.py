@@ -4,6 +4,7 @@ Tests for Flask API endpoints.
 
 import pytest
 import json
+from datetime import datetime
 
 
 class TestHealthEndpoint:
@@ -96,6 +97,25 @@ class TestListingsEndpoint:
         prices = [l['price_eur'] for l in data['data'] if l['price_eur'] is not None]
         assert prices == sorted(prices)
     
+    def test_keyword_filter_and_counts(self, app, client, sample_listings):
+        """Should match whole keywords and count them across listings."""
+        with app.app_context():
+            from models import db, Listing
+            listings = Listing.query.order_by(Listing.id).limit(3).all()
+            listings[0].search_keywords = ['thinkpad', 'x1']
+            listings[1].search_keywords = ['thinkpad']
+            listings[2].search_keywords = ['thinkpad x1']
+            db.session.commit()
+        
+        response = client.get('/api/v1/listings?keyword=thinkpad')
+        data = json.loads(response.data)
+        assert data['pagination']['total_items'] == 2
+        assert all('thinkpad' in l['search_keywords'] for l in data['data'])
+        
+        counts = json.loads(client.get('/api/v1/keywords').data)['data']
+        assert {'keyword': 'thinkpad', 'count': 2} in counts
+        assert {'keyword': 'thinkpad x1', 'count': 1} in counts
+    
     def test_get_single_listing(self, client, sample_listing):
         """Should return a single listing by ID."""
         response = client.get(f'/api/v1/listings/{sample_listing.id}')
@@ -104,6 +124,73 @@ class TestListingsEndpoint:
         data = json.loads(response.data)
         assert data['data']['external_id'] == '123456789'
     
+    def test_listing_timestamps_are_iso_8601(self, client, sample_listing):
+        """Should write raw model datetimes as ISO 8601 strings."""
+        response = client.get(f'/api/v1/listings/{sample_listing.id}')
+        
+        data = json.loads(response.data)['data']
+        assert data['posted_at'] == sample_listing.posted_at.isoformat()
+        assert datetime.fromisoformat(data['scraped_at'])
+    
+    def test_get_listings_reuses_cached_payload(self, app, client, sample_listing):
+        """Should serve a stored payload while the listing's updated_at is unchanged."""
+        class DictCache:
+            def __init__(self):
+                self.store = {}
+            def get_many(self, *keys):
+                return [self.store.get(key) for key in keys]
+            def set_many(self, mapping):
+                self.store.update(mapping)
+        
+        cache = DictCache()
+        app.extensions['redis_cache'] = cache
+        
+        first = json.loads(client.get('/api/v1/listings').data)
+        assert len(cache.store) == 1
+        key = next(iter(cache.store))
+        cache.store[key] = dict(cache.store[key], title='Test Laptop - From cache')
+        
+        second = json.loads(client.get('/api/v1/listings').data)
+        assert first['data'][0]['title'] == 'Test Laptop - Dell XPS 15'
+        assert second['data'][0]['title'] == 'Test Laptop - From cache'
+    
+    def test_redis_cache_stores_json(self, app):
+        """Should write JSON bytes to Redis and decode them without unpickling."""
+        from app import RedisJSONCache
+        
+        class FakeRedis:
+            def __init__(self):
+                self.store = {}
+                self.ttls = {}
+            def get(self, key):
+                return self.store.get(key)
+            def mget(self, keys):
+                return [self.store.get(key) for key in keys]
+            def set(self, key, value, ex=None):
+                assert isinstance(value, bytes)
+                self.store[key] = value
+                self.ttls[key] = ex
+            def delete(self, key):
+                self.store.pop(key, None)
+            def pipeline(self, transaction=True):
+                return type('Pipeline', (), {
+                    'set': lambda pipe, key, value, ex=None: self.set(key, value, ex),
+                    'execute': lambda pipe: None,
+                })()
+        
+        client = FakeRedis()
+        cache = RedisJSONCache(client, app.json, key_prefix='k:', default_timeout=600)
+        cache.set_many({'a': {'title': 'ThinkPad', 'posted_at': datetime(2024, 1, 2, 3, 4)}, 'b': [1, 2]})
+        cache.set('c', {'page_limit': 5}, timeout=30)
+        
+        assert json.loads(client.store['k:a']) == {'title': 'ThinkPad', 'posted_at': '2024-01-02T03:04:00'}
+        assert cache.get_many('a', 'b', 'missing') == [
+            {'title': 'ThinkPad', 'posted_at': '2024-01-02T03:04:00'}, [1, 2], None,
+        ]
+        assert client.ttls == {'k:a': 600, 'k:b': 600, 'k:c': 30}
+        cache.delete('c')
+        assert cache.get('c') is None
+    
     def test_get_single_listing_not_found(self, client):
         """Should return 404 for non-existent listing."""
         response = client.get('/api/v1/listings/99999')
@@ -152,6 +239,81 @@ class TestScraperEndpoints:
         response = client.get('/api/v1/scraper/jobs/99999')
         
         assert response.status_code == 404
+    
+    def test_get_scraper_jobs_matches_to_dict(self, app, client):
+        """Should list jobs with the same fields as ScraperJob.to_dict."""
+        with app.app_context():
+            from models import db, ScraperJob
+            job = ScraperJob(status='failed', pages_scraped=2, error_message='Blocked')
+            db.session.add(job)
+            db.session.commit()
+            expected = json.loads(app.json.dumps(job.to_dict()))
+        
+        data = json.loads(client.get('/api/v1/scraper/jobs').data)['data']
+        
+        assert data == [expected]
+    
+    def test_get_scraper_jobs_rejects_unknown_status(self, client):
+        """Should return 400 for a status outside the known job states."""
+        response = client.get('/api/v1/scraper/jobs?status=bogus')
+        
+        assert response.status_code == 400
+        assert client.get('/api/v1/scraper/jobs?status=failed').status_code == 200
+
+
+class TestAdminConfigEndpoints:
+    """Tests for admin scraper configuration endpoints."""
+    
+    def test_config_snapshot_cached_until_update(self, app, client):
+        """Should serve the shared snapshot and drop it when the config is updated."""
+        class DictCache:
+            def __init__(self):
+                self.store = {}
+            def get(self, key):
+                return self.store.get(key)
+            def set(self, key, value, timeout=None):
+                # Round-trip through JSON like RedisJSONCache
+                self.store[key] = json.loads(app.json.dumps(value))
+            def delete(self, key):
+                self.store.pop(key, None)
+        
+        cache = DictCache()
+        app.extensions['redis_cache'] = cache
+        
+        assert client.get('/api/v1/admin/config').get_json()['data']['page_limit'] == 5
+        cache.store['scraper_config']['page_limit'] = 7
+        assert client.get('/api/v1/admin/config').get_json()['data']['page_limit'] == 7
+        
+        client.put('/api/v1/admin/config', json={'city': 'Berlin'})
+        assert 'scraper_config' not in cache.store
+        data = client.get('/api/v1/admin/config').get_json()['data']
+        assert data['page_limit'] == 5
+        assert data['city'] == 'Berlin'
+
+
+class TestArchiveEndpoints:
+    """Tests for sync code archive endpoints."""
+    
+    def test_get_archived_listing_ids(self, client, sample_listings):
+        """Should return only the archived listing IDs of the given sync code."""
+        ids = [listing.id for listing in sample_listings[:3]]
+        client.post('/api/v1/archive/bulk', json={'listing_ids': ids}, headers={'X-Sync-Code': 'ABCD1234'})
+        client.post('/api/v1/archive/bulk', json={'listing_ids': ids[:1]}, headers={'X-Sync-Code': 'ZZZZ9999'})
+        
+        data = json.loads(client.get('/api/v1/archive', headers={'X-Sync-Code': 'ABCD1234'}).data)['data']
+        
+        assert sorted(data['listing_ids']) == sorted(ids)
+        assert data['count'] == 3
+    
+    def test_generate_sync_code_format(self, client):
+        """Should return a code of 4 uppercase letters followed by 4 digits."""
+        response = client.post('/api/v1/archive/generate-code')
+        
+        assert response.status_code == 200
+        code = json.loads(response.data)['data']['sync_code']
+        assert len(code) == 8
+        assert code[:4].isalpha() and code[:4].isupper()
+        assert code[4:].isdigit()
 
 
 class TestErrorHandling:
@@ -2,7 +2,28 @@
 Tests for lightweight listing classification heuristics.
 """
 
-from classifier import classify_item_type
+import importlib.util
+import sys
+
+import pytest
+
+import classifier
+from classifier import classify_item_type, classify_laptop_category
+
+
+@pytest.fixture(params=['re2', 're'])
+def engine_classifier(request, monkeypatch):
+    """The classifier module compiled with RE2 and with the stdlib re fallback."""
+    if request.param == 're2':
+        pytest.importorskip('re2')
+        assert classifier._re.__name__ == 're2'
+        return classifier
+    monkeypatch.setitem(sys.modules, 're2', None)
+    spec = importlib.util.spec_from_file_location('classifier_stdlib_re', classifier.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module._re.__name__ == 're'
+    return module
 
 
 def test_classify_laptop_by_hardware_signals():
@@ -20,3 +41,21 @@ def test_classify_accessory_docking_station():
 def test_classify_other_tablet():
     assert classify_item_type("iPad 9. Generation 64GB") == "other"
 
+
+
+def test_classify_laptop_category_priority():
+    # Gaming signals win over business/2in1 matches in the same text
+    assert classify_laptop_category("ASUS ROG Strix G15 RTX 3060 144Hz") == "gaming"
+    assert classify_laptop_category("Lenovo ThinkPad P52 Xeon Quadro") == "workstation"
+    assert classify_laptop_category("HP Spectre x360 Touchscreen") == "2in1"
+
+
+def test_classify_laptop_category_none():
+    assert classify_laptop_category("Notebook 15 Zoll") is None
+
+
+def test_unicode_whitespace_matches_under_both_engines(engine_classifier):
+    # Scraped titles keep NBSP; RE2's \s and \b only know ASCII whitespace
+    assert engine_classifier.classify_item_type('i7\xa08650u 16\xa0gb ram 512\xa0gb ssd', '') == 'laptop'
+    assert engine_classifier.classify_laptop_category('LG\xa0Gram 17', '') == 'ultrabook'
+    assert engine_classifier.classify_item_type('Dell\u202fXPS\u200a13', 'Akku\u3000neu') == 'laptop'
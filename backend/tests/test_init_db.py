@@ -0,0 +1,97 @@
+"""
+Tests for database initialization and migrations.
+"""
+
+import init_db
+from sqlalchemy import text
+from models import db, Listing
+from init_db import (
+    TARGET_SCHEMA_VERSION,
+    apply_migrations,
+    init_database,
+    mark_schema_version,
+)
+
+
+class TestApplyMigrations:
+    """Tests for apply_migrations backfills."""
+
+    def test_backfills_item_type_and_laptop_category(self, app):
+        """Should classify listings missing item_type/laptop_category."""
+        with app.app_context():
+            db.session.add_all([
+                Listing(external_id='bf1', url='https://example.com/1',
+                        title='Lenovo Legion 5 RTX 3060 Gaming Laptop'),
+                Listing(external_id='bf2', url='https://example.com/2',
+                        title='Dell Netzteil 65W Ladekabel'),
+            ])
+            db.session.commit()
+
+            apply_migrations(app)
+            db.session.expire_all()
+
+            gaming = Listing.query.filter_by(external_id='bf1').first()
+            charger = Listing.query.filter_by(external_id='bf2').first()
+            assert gaming.item_type == 'laptop'
+            assert gaming.laptop_category == 'gaming'
+            assert charger.item_type == 'accessory'
+            assert charger.laptop_category is None
+
+    def test_backfill_spans_multiple_batches(self, app, monkeypatch):
+        """Should classify every row when the stream is read in several batches."""
+        monkeypatch.setattr(init_db, 'CLASSIFY_BATCH_SIZE', 2)
+        with app.app_context():
+            db.session.add_all([
+                Listing(external_id=f'mb{i}', url=f'https://example.com/mb{i}',
+                        title='ThinkPad T14 i5 16GB RAM')
+                for i in range(5)
+            ])
+            db.session.commit()
+
+            assert apply_migrations(app) is True
+            db.session.expire_all()
+
+            assert Listing.query.filter(Listing.item_type.is_(None)).count() == 0
+            assert Listing.query.filter_by(item_type='laptop').count() == 5
+
+    def test_failed_backfill_reports_failure(self, app, monkeypatch):
+        """Should return False so main() doesn't record the schema version."""
+        def fail(*args):
+            raise RuntimeError('classifier unavailable')
+        
+        monkeypatch.setattr(init_db, '_backfill_column', fail)
+        with app.app_context():
+            db.session.add(Listing(external_id='ff1', url='https://example.com/ff1', title='ThinkPad'))
+            db.session.commit()
+
+            assert apply_migrations(app) is False
+
+    def test_converts_csv_search_keywords(self, app):
+        """Should rewrite legacy comma-separated search_keywords as lists."""
+        with app.app_context():
+            db.session.add(Listing(external_id='kw1', url='https://example.com/kw1', title='ThinkPad'))
+            db.session.commit()
+            db.session.execute(
+                text("UPDATE listings SET search_keywords = 'thinkpad, x1,' WHERE external_id = 'kw1'")
+            )
+            db.session.commit()
+
+            apply_migrations(app)
+            db.session.expire_all()
+
+            listing = Listing.query.filter_by(external_id='kw1').one()
+            assert listing.search_keywords == ['thinkpad', 'x1']
+
+class TestSchemaVersion:
+    """Tests for the schema_meta fast path."""
+
+    def test_init_database_skips_when_version_current(self, app):
+        """Should report up to date once the target version is recorded."""
+        assert init_database(app) is False
+        mark_schema_version(app)
+        assert init_database(app) is True
+
+    def test_outdated_version_runs_migrations(self, app):
+        """Should not take the fast path for an older recorded version."""
+        mark_schema_version(app, TARGET_SCHEMA_VERSION - 1)
+        assert init_database(app) is False
@@ -0,0 +1,178 @@
+"""
+Tests for the interaction learning module.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from models import db, Listing, UserInteraction, LearnedPreference, BrandAffinity
+from ml_learning import (
+    analyze_interaction_patterns,
+    calculate_time_decay,
+    decay_all_weights,
+    get_confidence_adjusted_weight,
+    get_effective_brand_affinities,
+    get_effective_learned_weights,
+    get_effective_user_weights,
+    learn_from_interaction,
+)
+
+
+def _learn(listing, action_type='save'):
+    interaction = UserInteraction(
+        sync_code='ABCD1234',
+        listing_id=listing.id,
+        action_type=action_type,
+    )
+    db.session.add(interaction)
+    result = learn_from_interaction(
+        interaction=interaction,
+        listing=listing,
+        db_session=db.session,
+        LearnedPreferenceModel=LearnedPreference,
+        BrandAffinityModel=BrandAffinity,
+    )
+    db.session.commit()
+    return result
+
+
+class TestLearnFromInteraction:
+    """Tests for learn_from_interaction."""
+
+    def test_creates_then_updates_preferences(self, app, sample_listing):
+        """Should create keyword/brand rows once and update them afterwards."""
+        with app.app_context():
+            listing = db.session.get(Listing, sample_listing.id)
+
+            first = _learn(listing)
+            keywords = {p['keyword'] for p in first['updated_keywords']}
+            assert 'Dell' in keywords
+            assert [b['brand'] for b in first['updated_brands']] == ['Dell']
+
+            second = _learn(listing)
+            assert all(p['count'] == 2 for p in second['updated_keywords'])
+
+            dell = LearnedPreference.query.filter_by(sync_code='ABCD1234', keyword='Dell').one()
+            assert dell.interaction_count == 2
+            first_weight = next(p['weight'] for p in first['updated_keywords'] if p['keyword'] == 'Dell')
+            assert dell.learned_weight > first_weight > 0
+
+            affinity = BrandAffinity.query.filter_by(sync_code='ABCD1234', brand='Dell').one()
+            assert affinity.interaction_count == 2
+            assert 0 < affinity.affinity_score <= 1.0
+
+    def test_dismiss_lowers_weight(self, app, sample_listing):
+        """Should learn a negative weight from a dismiss."""
+        with app.app_context():
+            listing = db.session.get(Listing, sample_listing.id)
+            _learn(listing, action_type='dismiss')
+
+            dell = LearnedPreference.query.filter_by(sync_code='ABCD1234', keyword='Dell').one()
+            assert dell.learned_weight < 0
+
+
+class TestEffectiveWeights:
+    """Tests for the effective weight/affinity helpers."""
+
+    def test_matches_scalar_helpers(self, app):
+        """Should apply confidence and decay like the scalar helpers, dropping tiny weights."""
+        with app.app_context():
+            updated = datetime.utcnow() - timedelta(days=7)
+            db.session.add_all([
+                LearnedPreference(sync_code='ABCD1234', keyword='RTX 4060',
+                                  learned_weight=1.5, interaction_count=4, last_updated=updated),
+                LearnedPreference(sync_code='ABCD1234', keyword='Acer',
+                                  learned_weight=-0.8, interaction_count=2, last_updated=None),
+                LearnedPreference(sync_code='ABCD1234', keyword='HDD',
+                                  learned_weight=0.001, interaction_count=1, last_updated=updated),
+            ])
+            db.session.commit()
+
+            weights = get_effective_learned_weights('ABCD1234', LearnedPreference)
+
+            assert set(weights) == {'RTX 4060', 'Acer'}
+            expected = get_confidence_adjusted_weight(1.5, 4) * calculate_time_decay(updated)
+            assert weights['RTX 4060'] == pytest.approx(expected, rel=1e-4)
+            # No timestamp means no decay
+            assert weights['Acer'] == pytest.approx(get_confidence_adjusted_weight(-0.8, 2))
+
+    def test_user_weights_match_separate_queries(self, app):
+        """Should return the same dicts as the two single-table helpers."""
+        with app.app_context():
+            updated = datetime.utcnow() - timedelta(days=3)
+            db.session.add_all([
+                LearnedPreference(sync_code='ABCD1234', keyword='Dell',
+                                  learned_weight=1.2, interaction_count=6, last_updated=updated),
+                LearnedPreference(sync_code='ABCD1234', keyword='16GB RAM',
+                                  learned_weight=0.7, interaction_count=3, last_updated=updated),
+                BrandAffinity(sync_code='ABCD1234', brand='Dell',
+                              affinity_score=0.6, interaction_count=6, last_updated=updated),
+            ])
+            db.session.commit()
+
+            keywords, brands = get_effective_user_weights('ABCD1234', LearnedPreference, BrandAffinity)
+
+            assert keywords == pytest.approx(get_effective_learned_weights('ABCD1234', LearnedPreference))
+            assert brands == pytest.approx(get_effective_brand_affinities('ABCD1234', BrandAffinity))
+            assert set(keywords) == {'Dell', '16GB RAM'}
+            assert set(brands) == {'Dell'}
+
+
+class TestAnalyzeInteractionPatterns:
+    """Tests for analyze_interaction_patterns."""
+
+    def test_aggregates_by_action_type(self, app, sample_listing):
+        """Should count actions and average non-zero view durations."""
+        with app.app_context():
+            old = datetime.utcnow() - timedelta(days=60)
+            db.session.add_all([
+                UserInteraction(sync_code='ABCD1234', listing_id=sample_listing.id,
+                                action_type='view', duration_seconds=30),
+                UserInteraction(sync_code='ABCD1234', listing_id=sample_listing.id,
+                                action_type='view', duration_seconds=90),
+                UserInteraction(sync_code='ABCD1234', listing_id=sample_listing.id,
+                                action_type='view', duration_seconds=0),
+                UserInteraction(sync_code='ABCD1234', listing_id=sample_listing.id,
+                                action_type='save'),
+                UserInteraction(sync_code='ABCD1234', listing_id=sample_listing.id,
+                                action_type='dismiss', created_at=old),
+                UserInteraction(sync_code='ZZZZ9999', listing_id=sample_listing.id,
+                                action_type='save'),
+            ])
+            db.session.commit()
+
+            stats = analyze_interaction_patterns('ABCD1234', UserInteraction)
+
+            assert stats['total_interactions'] == 4
+            assert stats['action_counts'] == {'view': 3, 'save': 1}
+            assert stats['avg_view_duration'] == pytest.approx(60.0)
+            assert stats['save_rate'] == pytest.approx(0.25)
+            assert stats['dismiss_rate'] == 0
+
+    def test_no_interactions(self, app):
+        """Should return zeroed stats for an unknown user."""
+        with app.app_context():
+            stats = analyze_interaction_patterns('NOPE0000', UserInteraction)
+            assert stats['total_interactions'] == 0
+
+
+class TestDecayAllWeights:
+    """Tests for decay_all_weights."""
+
+    def test_decays_only_users_nonzero_weights(self, app):
+        """Should scale non-zero weights for the given user and report the count."""
+        with app.app_context():
+            db.session.add_all([
+                LearnedPreference(sync_code='ABCD1234', keyword='Dell', learned_weight=2.0),
+                LearnedPreference(sync_code='ABCD1234', keyword='HDD', learned_weight=0.0),
+                LearnedPreference(sync_code='ZZZZ9999', keyword='Dell', learned_weight=2.0),
+                BrandAffinity(sync_code='ABCD1234', brand='Dell', affinity_score=-0.5),
+            ])
+            db.session.commit()
+
+            count = decay_all_weights('ABCD1234', db.session, LearnedPreference, BrandAffinity, decay_rate=0.5)
+            db.session.expire_all()
+
+            assert count == 2
+            assert LearnedPreference.query.filter_by(sync_code='ABCD1234', keyword='Dell').one().learned_weight == 1.0
+            assert LearnedPreference.query.filter_by(sync_code='ZZZZ9999', keyword='Dell').one().learned_weight == 2.0
+            assert BrandAffinity.query.filter_by(sync_code='ABCD1234').one().affinity_score == -0.25
@@ -4,7 +4,11 @@ Tests for database models.
 
 import pytest
 from datetime import datetime
-from models import db, Listing, ScraperJob
+from sqlalchemy import event
+from models import (
+    db, ItemAnalysis, Listing, ListingView, PriceHistory, ScraperConfig, ScraperJob, Tag, UserInteraction,
+    bulk_attach_tags,
+)
 
 
 class TestListingModel:
@@ -78,6 +82,28 @@ class TestListingModel:
             assert listing.price_eur == 89999  # Converted to cents
             assert listing.location_city == 'Hamburg'
     
+    def test_bulk_from_scraped_skips_existing(self, app, sample_listing):
+        """Should insert new rows in one batch and skip known external_ids."""
+        with app.app_context():
+            rows = [
+                {'external_id': 'bulk1', 'url': 'https://example.com/bulk1',
+                 'title': 'Bulk Laptop 1', 'price': 450.5},
+                {'external_id': 'bulk2', 'url': 'https://example.com/bulk2',
+                 'title': 'Bulk Laptop 2', 'price': None, 'search_keywords': ['thinkpad']},
+                {'external_id': sample_listing.external_id, 'url': sample_listing.url,
+                 'title': 'Duplicate'},
+            ]
+            
+            ids = Listing.bulk_from_scraped(rows)
+            db.session.commit()
+            
+            assert set(ids) == {'bulk1', 'bulk2'}
+            first = db.session.get(Listing, ids['bulk1'])
+            assert first.price_eur == 45050
+            assert first.scraped_at is not None
+            assert db.session.get(Listing, ids['bulk2']).search_keywords == ['thinkpad']
+            assert Listing.query.filter_by(external_id=sample_listing.external_id).one().title != 'Duplicate'
+    
     def test_listing_unique_external_id(self, app):
         """Should enforce unique external_id constraint."""
         with app.app_context():
@@ -98,6 +124,64 @@ class TestListingModel:
             db.session.add(listing2)
             with pytest.raises(Exception):  # IntegrityError
                 db.session.commit()
+    
+    def test_listing_view_matches_to_dict(self, app, sample_listing):
+        """Should serialize a plain row exactly like the ORM listing."""
+        with app.app_context():
+            listing = db.session.get(Listing, sample_listing.id)
+            listing.tags = [Tag(category='gpu', value='RTX 3060'), Tag(category='ram', value='16GB')]
+            listing.price_history = [PriceHistory(price=80000), PriceHistory(price=75000)]
+            listing.search_keywords = ['dell']
+            db.session.commit()
+            
+            rows = db.session.execute(
+                db.select(*ListingView.columns()).where(Listing.id == listing.id)
+            ).all()
+            view = ListingView.from_rows(rows)[0]
+            
+            expected = listing.to_dict()
+            actual = view.to_dict()
+            assert sorted(actual.pop('tags'), key=str) == sorted(expected.pop('tags'), key=str)
+            assert actual == expected
+            assert len(actual['price_history']) == 2
+    
+    def test_analyses_and_interactions_load_as_lists(self, app, sample_listing):
+        """Should expose per-user rows as plain lists loaded on first access."""
+        with app.app_context():
+            db.session.add_all([
+                ItemAnalysis(listing_id=sample_listing.id, sync_code='ABCD1234', total_score=80.0),
+                UserInteraction(listing_id=sample_listing.id, sync_code='ABCD1234', action_type='save'),
+            ])
+            db.session.commit()
+            db.session.expire_all()
+            
+            listing = db.session.get(Listing, sample_listing.id)
+            assert 'analyses' not in listing.__dict__
+            assert [a.sync_code for a in listing.analyses] == ['ABCD1234']
+            assert [i.action_type for i in listing.interactions] == ['save']
+
+
+class TestTagModel:
+    """Tests for batched tag resolution and linking."""
+    
+    def test_resolve_ids_and_attach(self, app, sample_listing):
+        """Should reuse existing tags, create missing ones and skip duplicate links."""
+        with app.app_context():
+            ram = Tag(category='ram', value='16GB RAM')
+            db.session.add(ram)
+            db.session.commit()
+            
+            ids = Tag.resolve_ids([('ram', '16GB RAM'), ('gpu', 'RTX 3060'), ('ram', '16GB RAM')])
+            assert ids[('ram', '16GB RAM')] == ram.id
+            assert Tag.query.count() == 2
+            
+            pairs = [(sample_listing.id, tag_id) for tag_id in ids.values()]
+            bulk_attach_tags(pairs)
+            bulk_attach_tags(pairs[:1])
+            db.session.commit()
+            
+            listing = db.session.get(Listing, sample_listing.id)
+            assert sorted(tag.value for tag in listing.tags) == ['16GB RAM', 'RTX 3060']
 
 
 class TestScraperJobModel:
@@ -145,3 +229,38 @@ class TestScraperJobModel:
             
             assert job.created_at is not None
             assert job.started_at is not None
+
+
+class TestScraperConfigModel:
+    """Tests for the ScraperConfig model."""
+    
+    def test_list_fields_follow_column_changes(self, app):
+        """Should reuse the parsed lists until the text column changes."""
+        with app.app_context():
+            config = ScraperConfig.get_config()
+            config.keywords = ' thinkpad, ,rtx 4060 '
+            
+            first = config.to_dict()['keywords_list']
+            assert first == ['thinkpad', 'rtx 4060']
+            assert config.to_dict()['keywords_list'] is first
+            assert config.categories_list == ['c278']
+            
+            config.keywords = 'macbook'
+            assert config.to_dict()['keywords_list'] == ['macbook']
+    
+    def test_get_config_reuses_session_instance(self, app):
+        """Should return the loaded singleton without querying again."""
+        with app.app_context():
+            ScraperConfig.get_config()
+            config = ScraperConfig.get_config()
+            statements = []
+            
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+            
+            event.listen(db.engine, 'before_cursor_execute', record)
+            try:
+                assert ScraperConfig.get_config() is config
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', record)
+            assert statements == []
@@ -0,0 +1,186 @@
+"""
+Tests for the adaptive scoring engine.
+"""
+
+import itertools
+import numpy as np
+import pytest
+from sqlalchemy import event
+from datetime import datetime, timedelta
+from models import db, Listing, PriceHistory, Tag, UserPreferences, ItemAnalysis
+import scoring_engine as scoring_module
+from scoring_engine import ScoreResult, scoring_engine
+
+
+def _listings():
+    specs = [
+        ('Lenovo ThinkPad T14 16GB RAM', 'i7, SSD', 45000, 'Lenovo'),
+        ('Dell XPS 15 RTX 3050', None, 120000, 'Dell'),
+        ('Gaming Laptop RTX 4060', 'kaum benutzt', None, None),
+        ('Acer Aspire 5', 'defekt', 9000, 'Acer'),
+        ('MacBook Air M1', 'wie neu', 80000, None),
+        ('HP EliteBook 840', '32GB RAM', 61000, 'HP'),
+    ]
+    listings = []
+    for i, (title, description, price, brand) in enumerate(specs):
+        listing = Listing(external_id=f'sc{i}', url=f'https://example.com/sc{i}',
+                          title=title, description=description, price_eur=price)
+        listing.tags = [Tag(category='brand', value=brand)] if brand else []
+        listings.append(listing)
+    return listings
+
+
+class TestCalculateScores:
+    """Tests for the batch scorer."""
+
+    @pytest.mark.parametrize('use_re2', [True, False])
+    @pytest.mark.parametrize('min_price,max_price', [
+        (None, None), (40000, 60000), (None, 50000), (50000, None), (0, 0),
+    ])
+    def test_matches_single_listing_scores(self, app, monkeypatch, min_price, max_price, use_re2):
+        """Should return exactly what calculate_score returns per listing."""
+        if use_re2:
+            monkeypatch.setattr(scoring_module._KeywordSet, 'MIN_KEYWORDS', 1)
+        else:
+            monkeypatch.setattr(scoring_module, 're2', None)
+        with app.app_context():
+            listings = _listings()
+            # Overlapping keywords ('rtx' inside 'rtx 3050') must both count
+            learned = {'rtx': 1.2, 'defekt': -3.0, '16gb ram': 0.4, 'RTX 3050': 0.7}
+            brands = {'lenovo': 0.8, 'acer': -0.6}
+            for keywords, pref_brands in itertools.product(['', 'rtx,ssd', '16GB RAM, i7', 'rtx,rtx 3050'], ['', 'Dell,hp']):
+                prefs = UserPreferences(
+                    sync_code='ABCD1234', keywords=keywords, brands=pref_brands,
+                    min_price=min_price, max_price=max_price,
+                    weight_specs=0.4, weight_price=0.3, weight_brand=0.3,
+                )
+
+                batch = scoring_engine.calculate_scores(listings, prefs, learned, brands)
+
+                assert batch == [
+                    scoring_engine.calculate_score(listing, prefs, learned, brands)
+                    for listing in listings
+                ]
+
+
+class TestRound1:
+    """Tests for the batch rounding helper."""
+
+    def test_matches_python_round(self):
+        """Should agree with round(x, 1), including values near .x5 boundaries."""
+        values = [0.15, 0.25, 0.35, 2.675, -0.05, -12.25, 12.345, 99.95, 100.0, 1 / 3, 0.0]
+        values += [k / 20 for k in range(-400, 2001)]
+
+        assert scoring_module._round1(np.array(values)) == [round(v, 1) for v in values]
+
+
+class TestPriceTiers:
+    """Tests for the over-budget price tiers."""
+
+    @pytest.mark.parametrize('price,expected', [
+        (100000, 100.0), (110000, 80.0), (110001, 60.0), (120000, 60.0),
+        (120001, 30.0), (150000, 30.0), (150001, 10.0),
+    ])
+    def test_tier_boundaries(self, price, expected):
+        """Should keep a price exactly on a tier boundary in the better tier."""
+        listing = Listing(external_id='pt', url='https://example.com/pt', title='Laptop', price_eur=price)
+
+        assert scoring_engine._score_price(listing, None, 100000) == expected
+        assert scoring_engine._score_prices([price], None, 100000).tolist() == [expected]
+
+
+class TestMustSeeEndpoint:
+    """Tests for on-the-fly scoring and caching of must-see items."""
+
+    def test_scores_and_caches_matches(self, app, client):
+        """Should return must-see listings by score and store their analyses."""
+        with app.app_context():
+            db.session.add(UserPreferences(
+                sync_code='ABCD1234', keywords='thinkpad', brands='lenovo',
+                min_price=30000, max_price=50000,
+            ))
+            db.session.add_all([
+                Listing(external_id='ms1', url='https://example.com/ms1', title='Lenovo ThinkPad T14',
+                        price_eur=45000, posted_at=datetime.utcnow() - timedelta(hours=1)),
+                Listing(external_id='ms2', url='https://example.com/ms2', title='Acer Aspire',
+                        price_eur=200000, posted_at=datetime.utcnow() - timedelta(hours=1)),
+            ])
+            db.session.commit()
+
+        response = client.get('/api/v1/items/must-see', headers={'X-Sync-Code': 'ABCD1234'})
+
+        data = response.get_json()['data']
+        assert [item['external_id'] for item in data] == ['ms1']
+        assert data[0]['match_score']['classification'] == 'must_see'
+        with app.app_context():
+            analysis = ItemAnalysis.query.filter_by(sync_code='ABCD1234').one()
+            assert analysis.total_score == data[0]['match_score']['total_score']
+
+            # Re-scoring the same listing updates the row in place
+            rescored = ScoreResult(**data[0]['match_score'])._replace(total_score=99.0)
+            ItemAnalysis.bulk_upsert('ABCD1234', [(analysis.listing_id, rescored)])
+            db.session.commit()
+            db.session.expire_all()
+            assert ItemAnalysis.query.filter_by(sync_code='ABCD1234').one().total_score == 99.0
+
+    def test_loads_price_history_for_returned_page_only(self, app, client):
+        """Should not load price history for every scored listing, only the ones returned."""
+        with app.app_context():
+            db.session.add(UserPreferences(sync_code='ABCD1234', keywords='thinkpad', brands='lenovo',
+                                           min_price=30000, max_price=50000))
+            for i in range(3):
+                listing = Listing(external_id=f'ph{i}', url=f'https://example.com/ph{i}',
+                                  title='Lenovo ThinkPad T14', price_eur=45000,
+                                  posted_at=datetime.utcnow() - timedelta(hours=1))
+                listing.price_history = [PriceHistory(price=47000), PriceHistory(price=45000)]
+                db.session.add(listing)
+            db.session.commit()
+            engine = db.engine
+        
+        history_queries = []
+        
+        def record(conn, cursor, statement, parameters, *args):
+            if 'FROM price_history' in statement:
+                history_queries.append(parameters)
+        
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.get('/api/v1/items/must-see?limit=1', headers={'X-Sync-Code': 'ABCD1234'})
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        
+        data = response.get_json()['data']
+        assert len(data) == 1
+        assert [entry['price'] for entry in data[0]['price_history']] == [470.0, 450.0]
+        assert len(history_queries) == 1
+        assert len(history_queries[0]) == 1
+    
+    def test_cached_matches_load_listings_in_batches(self, app, client):
+        """Should serve cached analyses without a query per listing."""
+        with app.app_context():
+            db.session.add(UserPreferences(sync_code='ABCD1234', keywords='thinkpad'))
+            for i in range(5):
+                listing = Listing(external_id=f'c{i}', url=f'https://example.com/c{i}', title=f'ThinkPad {i}')
+                listing.tags = [Tag(category='brand', value=f'Lenovo {i}')]
+                db.session.add(listing)
+                db.session.flush()
+                db.session.add(ItemAnalysis(listing_id=listing.id, sync_code='ABCD1234',
+                                            total_score=90.0 - i, classification='must_see'))
+            db.session.commit()
+            engine = db.engine
+        
+        statements = []
+        
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+        
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            response = client.get('/api/v1/items/must-see', headers={'X-Sync-Code': 'ABCD1234'})
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+        
+        data = response.get_json()['data']
+        assert [item['external_id'] for item in data] == [f'c{i}' for i in range(5)]
+        assert data[0]['tags'][0]['value'] == 'Lenovo 0'
+        assert sum('FROM listings' in statement for statement in statements) == 1
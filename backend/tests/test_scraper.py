@@ -7,7 +7,7 @@ without making live requests to Kleinanzeigen.
 
 import pytest
 from bs4 import BeautifulSoup
-from scraper import KleinanzeigenScraper, SELECTORS
+from scraper import FetchResult, KleinanzeigenScraper, SELECTORS, TokenBucket
 from tests.conftest import SAMPLE_LISTING_HTML, SAMPLE_PAGE_HTML
 
 
@@ -121,6 +121,25 @@ class TestExternalIdExtraction:
         assert external_id == "123456789"
 
 
+class TestResolveHref:
+    """Tests for resolving listing links against the page URL."""
+    
+    @pytest.mark.parametrize('base_url', [
+        'https://www.kleinanzeigen.de/s-notebooks/seite:2/c278?keywords=x',
+        'https://www.kleinanzeigen.de',
+        'relative/base',
+    ])
+    @pytest.mark.parametrize('href', [
+        '/s-anzeige/dell-xps-15/987654321-278-1234', '/a b?x=1#y', '/a/../b', '/./c',
+        '//cdn.example.com/x', 'https://other.example.com/x', 'relative', '?page=2',
+    ])
+    def test_matches_urljoin(self, base_url, href):
+        """Should resolve every href exactly like urljoin."""
+        from urllib.parse import urljoin
+        from scraper import _resolve_href
+        
+        assert _resolve_href(base_url, href) == urljoin(base_url, href)
+
 class TestDateParsing:
     """Tests for date parsing logic."""
     
@@ -162,8 +181,7 @@ class TestListingParsing:
     def test_parse_listing_from_html(self):
         """Should correctly parse a listing from HTML fixture."""
         scraper = KleinanzeigenScraper()
-        soup = BeautifulSoup(SAMPLE_LISTING_HTML, 'html.parser')
-        article = soup.find('article', class_='aditem')
+        article = next(KleinanzeigenScraper._iter_articles(SAMPLE_LISTING_HTML))
         
         listing = scraper._parse_listing(article, 'https://www.kleinanzeigen.de')
         
@@ -179,8 +197,7 @@ class TestListingParsing:
     def test_parse_listing_extracts_url(self):
         """Should extract full URL from listing."""
         scraper = KleinanzeigenScraper()
-        soup = BeautifulSoup(SAMPLE_LISTING_HTML, 'html.parser')
-        article = soup.find('article', class_='aditem')
+        article = next(KleinanzeigenScraper._iter_articles(SAMPLE_LISTING_HTML))
         
         listing = scraper._parse_listing(article, 'https://www.kleinanzeigen.de')
         
@@ -198,6 +215,46 @@ class TestSelectors:
         
         assert len(items) == 2
     
+    def test_collected_fields_match_css_selectors(self):
+        """The single-pass field lookup should find the same elements as SELECTORS."""
+        tricky = SAMPLE_LISTING_HTML.replace('<div class="aditem-main">', """<div class="aditem-main">
+            <span class="ellipsis">Not the title link</span>
+            <span class="simpletag">Outside the tags box</span>
+            <div class="galleryimage"><p>no image</p></div>
+        """).replace('</article>', """
+            <div class="aditem-main--middle--tags extra"><i class="simpletag">Neu</i></div>
+            <div class="galleryimage"><img data-src="https://example.com/second.jpg"></div>
+            <div class="aditem-main--middle--price-shipping--price">1 €</div>
+        </article>""")
+        html = f'<html><body>{SAMPLE_PAGE_HTML}{tricky}</body></html>'
+        soup_articles = BeautifulSoup(html, 'html.parser').select(SELECTORS['listing_item'])
+        checked = 0
+        
+        def describe(tag, text, attrs):
+            return (tag, text, attrs.get('src'), attrs.get('data-src'))
+        
+        for article, soup_article in zip(KleinanzeigenScraper._iter_articles(html), soup_articles):
+            checked += 1
+            fields = KleinanzeigenScraper._collect_fields(article)
+            for key in set(SELECTORS) - {'listing_item'}:
+                expected = soup_article.select(SELECTORS[key])
+                if key != 'condition':
+                    expected = expected[:1]
+                assert [describe(e.tag, KleinanzeigenScraper._text(e), e.attrib) for e in fields[key]] == \
+                    [describe(e.name, e.get_text(strip=True), e.attrs) for e in expected]
+        assert checked == len(soup_articles) == 3
+    
+    def test_parse_page_skips_other_articles(self):
+        """Should count only aditem articles and handle an empty document."""
+        scraper = KleinanzeigenScraper()
+        html = SAMPLE_PAGE_HTML.replace('<div class="l-container">', '<div class="l-container"><article class="teaser">Ad</article>')
+        
+        found, listings = scraper._parse_page(html, 'https://www.kleinanzeigen.de')
+        
+        assert found == 2
+        assert [listing['external_id'] for listing in listings] == ['987654321', '123123123']
+        assert scraper._parse_page('', 'https://www.kleinanzeigen.de') == (0, [])
+    
     def test_title_selector(self):
         """Title selector should find title links."""
         soup = BeautifulSoup(SAMPLE_LISTING_HTML, 'html.parser')
@@ -245,3 +302,553 @@ class TestScraperConfiguration:
         scraper = KleinanzeigenScraper(delay_seconds=0.5)
         
         assert scraper.delay_seconds >= 2.0
+
+
+class TestScrapePagination:
+    """Tests for the multi-page scrape loop."""
+    
+    @pytest.mark.parametrize('concurrency', [1, 3])
+    def test_scrape_keeps_page_order(self, monkeypatch, concurrency):
+        """Should return listings in page order, one browser page per worker."""
+        import threading
+        from contextlib import contextmanager
+        import scraper as scraper_module
+        
+        opened = []
+        
+        @contextmanager
+        def fake_open_page(self):
+            opened.append(threading.get_ident())
+            yield object()
+        
+        def fake_scrape_page(self, page, url, retry_count=0):
+            return [{'url': url}]
+        
+        monkeypatch.setattr(KleinanzeigenScraper, 'open_page', fake_open_page)
+        monkeypatch.setattr(KleinanzeigenScraper, 'scrape_page', fake_scrape_page)
+        monkeypatch.setattr(scraper_module.RobotsChecker, 'fetch_robots', lambda self, page, fetch=None: None)
+        monkeypatch.setattr(scraper_module.RobotsChecker, 'is_allowed', lambda self, path: True)
+        monkeypatch.setattr(scraper_module.time, 'sleep', lambda seconds: None)
+        
+        scraper = KleinanzeigenScraper(base_url='https://example.com/c278', page_limit=5, concurrency=concurrency,
+                                       fetch_mode='playwright')
+        listings = scraper.scrape()
+        
+        assert [listing['url'] for listing in listings] == [
+            KleinanzeigenScraper.build_page_url('https://example.com/c278', n) for n in range(1, 6)
+        ]
+        assert len(opened) == (1 if concurrency == 1 else 1 + concurrency)
+
+    
+    @pytest.mark.parametrize('concurrency,pages_fetched', [(1, 4), (3, 6)])
+    def test_scrape_skips_repeated_listings(self, monkeypatch, concurrency, pages_fetched):
+        """Should keep the first copy of each listing and stop once pages only repeat."""
+        from contextlib import contextmanager
+        import scraper as scraper_module
+        
+        # Pages 1 and 2 bring new ids, pages 3-5 only repeat them
+        ids = {1: ['1', 'x'], 2: ['2', 'x'], 3: ['x', '1'], 4: ['2'], 5: ['1'], 6: ['6']}
+        fetched = []
+        
+        @contextmanager
+        def fake_open_page(self):
+            yield object()
+        
+        def fake_scrape_page(self, page, url, retry_count=0):
+            page_num = 1 if url.endswith('c278') else int(url.rstrip('/').rsplit(':', 1)[1])
+            fetched.append(page_num)
+            return [{'external_id': ext_id, 'page': page_num} for ext_id in ids[page_num]]
+        
+        monkeypatch.setattr(KleinanzeigenScraper, 'open_page', fake_open_page)
+        monkeypatch.setattr(KleinanzeigenScraper, 'scrape_page', fake_scrape_page)
+        monkeypatch.setattr(scraper_module.RobotsChecker, 'fetch_robots', lambda self, page, fetch=None: None)
+        monkeypatch.setattr(scraper_module.RobotsChecker, 'is_allowed', lambda self, path: True)
+        
+        scraper = KleinanzeigenScraper(base_url='https://example.com/c278', page_limit=6, concurrency=concurrency)
+        listings = scraper.scrape()
+        
+        expected = [('1', 1), ('x', 1), ('2', 2)] + ([('6', 6)] if concurrency > 1 else [])
+        assert [(l['external_id'], l['page']) for l in listings] == expected
+        assert len(fetched) == pages_fetched
+
+class TestScrapePageRetries:
+    """Tests for scrape_page retry handling."""
+    
+    class FakePage:
+        def __init__(self, statuses, html):
+            self.statuses = list(statuses)
+            self.html = html
+            self.visits = 0
+        
+        def goto(self, url, **kwargs):
+            self.visits += 1
+            status = self.statuses.pop(0)
+            if status is None:
+                return None
+            status, headers = status if isinstance(status, tuple) else (status, {})
+            return type('Response', (), {'status': status, 'headers': headers})()
+        
+        def wait_for_load_state(self, state):
+            pass
+        
+        def wait_for_selector(self, selector, timeout=None):
+            pass
+        
+        def content(self):
+            return self.html
+    
+    def _sleeps(self, monkeypatch):
+        import scraper as scraper_module
+        sleeps = []
+        monkeypatch.setattr(scraper_module.time, 'sleep', sleeps.append)
+        # Jitter always picks the top of its range
+        monkeypatch.setattr(scraper_module.random, 'uniform', lambda low, high: high)
+        return sleeps
+    
+    def test_retries_until_page_loads(self, monkeypatch):
+        """Should back off on each failure and return the listings once the page loads."""
+        sleeps = self._sleeps(monkeypatch)
+        page = self.FakePage([None, 429, 503, 200], SAMPLE_PAGE_HTML)
+        scraper = KleinanzeigenScraper(delay_seconds=2.0, rate_limiter=TokenBucket(capacity=10, rate=1.0),
+                                       fetch_mode='playwright')
+        
+        listings = scraper.scrape_page(page, 'https://www.kleinanzeigen.de/s-notebooks/c278')
+        
+        assert len(listings) == 2
+        assert page.visits == 4
+        # Each backoff is up to 3x the previous one
+        assert sleeps == [6.0, 18.0, 54.0]
+    
+    def test_gives_up_after_max_retries(self, monkeypatch):
+        """Should return an empty list after the last retry without a final wait."""
+        sleeps = self._sleeps(monkeypatch)
+        page = self.FakePage([500] * 4, SAMPLE_PAGE_HTML)
+        
+        scraper = KleinanzeigenScraper(delay_seconds=2.0, rate_limiter=TokenBucket(capacity=10, rate=1.0),
+                                       fetch_mode='playwright')
+        
+        assert scraper.scrape_page(page, 'https://example.com') == []
+        assert page.visits == 4
+        assert sleeps == [6.0, 18.0, 54.0]
+    
+    def test_backoff_is_capped_and_honors_retry_after(self, monkeypatch):
+        """Should wait at least Retry-After and never longer than the cap."""
+        sleeps = self._sleeps(monkeypatch)
+        page = self.FakePage([(429, {'retry-after': '30'}), (429, {'retry-after': '3600'}), 200], SAMPLE_PAGE_HTML)
+        scraper = KleinanzeigenScraper(delay_seconds=50.0, rate_limiter=TokenBucket(capacity=10, rate=1.0),
+                                       fetch_mode='playwright')
+        
+        assert len(scraper.scrape_page(page, 'https://example.com')) == 2
+        assert sleeps == [120.0, 120.0]
+        
+        sleeps.clear()
+        page = self.FakePage([(429, {'retry-after': '30'}), 200], SAMPLE_PAGE_HTML)
+        scraper = KleinanzeigenScraper(delay_seconds=2.0, rate_limiter=TokenBucket(capacity=10, rate=1.0),
+                                       fetch_mode='playwright')
+        scraper.scrape_page(page, 'https://example.com')
+        assert sleeps == [30.0]
+    
+    def test_client_error_is_not_retried(self, monkeypatch):
+        """Should give up immediately on a 4xx response."""
+        self._sleeps(monkeypatch)
+        page = self.FakePage([404], SAMPLE_PAGE_HTML)
+        
+        assert KleinanzeigenScraper(fetch_mode='playwright').scrape_page(page, 'https://example.com') == []
+        assert page.visits == 1
+
+
+class TestTokenBucket:
+    """Tests for the shared request rate limiter."""
+    
+    def test_bursts_then_paces_requests(self, monkeypatch):
+        """Should allow a burst up to capacity, then one request per refill interval."""
+        import scraper as scraper_module
+        clock = [100.0]
+        sleeps = []
+        
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+        
+        monkeypatch.setattr(scraper_module.time, 'monotonic', lambda: clock[0])
+        monkeypatch.setattr(scraper_module.time, 'sleep', fake_sleep)
+        bucket = TokenBucket(capacity=2, rate=0.5)
+        
+        for _ in range(4):
+            bucket.acquire()
+        clock[0] += 10  # idle long enough to refill (capped at capacity)
+        for _ in range(3):
+            bucket.acquire()
+        
+        assert sleeps == [2.0, 2.0, 2.0]
+
+
+class TestRobotsCache:
+    """Tests for the process-wide robots.txt cache."""
+    
+    class RobotsPage:
+        def __init__(self, ok=True):
+            self.ok = ok
+            self.visits = 0
+        
+        def goto(self, url, **kwargs):
+            self.visits += 1
+            ok = self.ok
+            return type('Response', (), {
+                'ok': ok, 'status': 200 if ok else 503,
+                'text': lambda self: 'User-agent: *\nDisallow: /m-\n',
+            })()
+    
+    @pytest.fixture(autouse=True)
+    def clear_cache(self, monkeypatch):
+        import scraper as scraper_module
+        monkeypatch.setattr(scraper_module, '_robots_cache', {})
+    
+    def test_reuses_parsed_robots_until_expiry(self, monkeypatch):
+        """Should fetch robots.txt once per TTL for all checkers of a site."""
+        import scraper as scraper_module
+        from scraper import RobotsChecker
+        clock = [1000.0]
+        monkeypatch.setattr(scraper_module.time, 'monotonic', lambda: clock[0])
+        page = self.RobotsPage()
+        
+        for _ in range(3):
+            checker = RobotsChecker('https://www.kleinanzeigen.de/s-notebooks/c278')
+            checker.fetch_robots(page)
+            assert not checker.is_allowed('/m-nachrichten.html')
+            assert checker.is_allowed('/s-notebooks/c278')
+        assert page.visits == 1
+        
+        clock[0] += scraper_module.ROBOTS_TTL_SECONDS
+        RobotsChecker('https://www.kleinanzeigen.de/').fetch_robots(page)
+        assert page.visits == 2
+    
+    def test_failed_fetch_is_retried_after_short_ttl(self, monkeypatch):
+        """Should not keep a failed fetch for the full TTL."""
+        import scraper as scraper_module
+        from scraper import RobotsChecker
+        clock = [1000.0]
+        monkeypatch.setattr(scraper_module.time, 'monotonic', lambda: clock[0])
+        page = self.RobotsPage(ok=False)
+        
+        RobotsChecker('https://www.kleinanzeigen.de/').fetch_robots(page)
+        RobotsChecker('https://www.kleinanzeigen.de/').fetch_robots(page)
+        assert page.visits == 1
+        
+        clock[0] += scraper_module.ROBOTS_FAILURE_TTL_SECONDS
+        page.ok = True
+        checker = RobotsChecker('https://www.kleinanzeigen.de/')
+        checker.fetch_robots(page)
+        assert page.visits == 2
+        assert not checker.is_allowed('/m-nachrichten.html')
+
+
+class TestRobotsRules:
+    """Tests for the longest-match robots.txt rule table."""
+    
+    @staticmethod
+    def _rules(text):
+        from scraper import RobotsRules
+        return RobotsRules.parse(text)
+    
+    def test_longest_match_wins_regardless_of_order(self):
+        """Should let the most specific rule decide, not the first listed."""
+        rules = self._rules('User-agent: *\nDisallow: /s-\nAllow: /s-notebooks/\nDisallow: /s-notebooks/intern\n')
+        
+        assert rules.allows('/s-notebooks/c278')
+        assert rules.allows('https://www.kleinanzeigen.de/s-notebooks/seite:2/c278?keywords=x')
+        assert not rules.allows('/s-autos/c216')
+        assert not rules.allows('/s-notebooks/intern/x')
+        assert rules.allows('/')
+    
+    def test_allow_wins_tie_and_other_agents_ignored(self):
+        """Should prefer Allow on equal length and only apply the '*' group."""
+        rules = self._rules('User-agent: Googlebot\nDisallow: /\n\nUser-agent: *\nDisallow: /p-\nAllow: /p-\nDisallow: /m-\n')
+        
+        assert rules.allows('/p-profile')
+        assert not rules.allows('/m-nachrichten.html')
+        assert rules.allows('/s-notebooks/c278')
+    
+    def test_grouped_agents_comments_and_case(self):
+        """Should apply rules to every agent of a group and ignore comments and field case."""
+        rules = self._rules(
+            'user-AGENT: Bingbot\n'
+            'User-agent: *   # everyone else\n'
+            '\n'
+            'DISALLOW: /m-  # messages\n'
+            'Crawl-delay: 5\n'
+            'Disallow: /s-anzeige/*/edit$\n'
+            'User-agent: Googlebot\n'
+            'Disallow: /\n'
+            'User-agent: *\n'
+            'Disallow: /p-\n'
+            'Disallow:\n'
+            '# Disallow: /s-\n'
+        )
+        
+        assert not rules.allows('/m-nachrichten.html')
+        assert not rules.allows('/p-profile')
+        assert not rules.allows('/s-anzeige/dell-xps/123-278/edit')
+        assert rules.allows('/s-anzeige/dell-xps/123-278/edit?x=1')
+        assert rules.allows('/s-notebooks/c278')
+    
+    def test_memoizes_verdicts(self):
+        """Should answer repeated paths from the memo."""
+        rules = self._rules('User-agent: *\nDisallow: /m-\n')
+        
+        assert not rules.allows('/m-nachrichten.html')
+        rules.rules = rules._matchers = []
+        assert not rules.allows('/m-nachrichten.html')
+        assert rules.allows('/m-other.html')
+
+class TestHttpFetch:
+    """Tests for the plain HTTP fetch with browser fallback."""
+    
+    @staticmethod
+    def _result(html, status=200, headers=None):
+        return FetchResult(status, html.encode('utf-8'), 'utf-8', headers or {})
+    
+    def test_uses_http_result_without_browser(self, monkeypatch):
+        """Should parse listings from the HTTP response and not touch the browser page."""
+        scraper = KleinanzeigenScraper(rate_limiter=TokenBucket(capacity=10, rate=1.0))
+        monkeypatch.setattr(scraper, '_fetch_html', lambda url: self._result(SAMPLE_PAGE_HTML))
+        
+        listings = scraper.scrape_page(None, 'https://www.kleinanzeigen.de/s-notebooks/c278')
+        
+        assert len(listings) == 2
+    
+    def test_scrape_in_http_mode_never_opens_browser(self, monkeypatch):
+        """Should fetch robots.txt and result pages over HTTP without launching Playwright."""
+        from contextlib import contextmanager
+        import scraper as scraper_module
+        monkeypatch.setattr(scraper_module, '_robots_cache', {})
+        opened = []
+        
+        @contextmanager
+        def fake_open_page(self):
+            opened.append(1)
+            yield object()
+        
+        requested = []
+        
+        def fake_fetch(url):
+            requested.append(url)
+            if url.endswith('/robots.txt'):
+                return self._result('User-agent: *\nDisallow: /m-\n')
+            return self._result(SAMPLE_PAGE_HTML)
+        
+        monkeypatch.setattr(KleinanzeigenScraper, 'open_page', fake_open_page)
+        monkeypatch.setattr(KleinanzeigenScraper, '_fetch_html', lambda self, url: fake_fetch(url))
+        
+        for concurrency in (1, 2):
+            scraper = KleinanzeigenScraper(base_url='https://www.kleinanzeigen.de/s-notebooks/c278',
+                                           page_limit=2, concurrency=concurrency,
+                                           rate_limiter=TokenBucket(capacity=10, rate=1.0))
+            assert len(scraper.scrape()) == 2
+            assert not scraper._robots_checker.is_allowed('/m-nachrichten.html')
+        
+        assert opened == []
+        assert requested[0] == 'https://www.kleinanzeigen.de/robots.txt'
+    
+    def test_browser_launch_failure_propagates_in_http_mode(self, monkeypatch):
+        """Should raise BrowserUnavailableError instead of returning no listings, so callers can switch proxies."""
+        from contextlib import contextmanager
+        import scraper as scraper_module
+        from scraper import BrowserUnavailableError, RobotsChecker
+        monkeypatch.setattr(scraper_module, '_robots_cache', {})
+        monkeypatch.setattr(scraper_module.time, 'sleep', lambda seconds: None)
+        
+        @contextmanager
+        def failing_open_page(self):
+            raise RuntimeError('proxy refused the connection')
+            yield
+        
+        monkeypatch.setattr(KleinanzeigenScraper, 'open_page', failing_open_page)
+        monkeypatch.setattr(KleinanzeigenScraper, '_fetch_html', lambda self, url: None)
+        scraper = KleinanzeigenScraper(proxy={'server': 'http://proxy:8080'},
+                                       rate_limiter=TokenBucket(capacity=10, rate=1.0))
+        
+        with scraper.page_session() as page:
+            with pytest.raises(BrowserUnavailableError):
+                scraper.fetch_robots(RobotsChecker(scraper.base_url), page)
+            with pytest.raises(BrowserUnavailableError):
+                scraper.scrape_page(page, scraper.base_url)
+        with pytest.raises(BrowserUnavailableError):
+            scraper.scrape()
+    
+    def test_retries_rate_limited_request_over_http(self, monkeypatch):
+        """Should back off on 429/5xx, honouring Retry-After, instead of falling back to the browser."""
+        sleeps = TestScrapePageRetries()._sleeps(monkeypatch)
+        responses = [self._result('', 429, {'retry-after': '30'}), self._result('', 503), self._result(SAMPLE_PAGE_HTML)]
+        scraper = KleinanzeigenScraper(delay_seconds=2.0, rate_limiter=TokenBucket(capacity=10, rate=1.0))
+        monkeypatch.setattr(scraper, '_fetch_html', lambda url: responses.pop(0))
+        page = TestScrapePageRetries.FakePage([], SAMPLE_PAGE_HTML)
+        
+        assert len(scraper.scrape_page(page, 'https://www.kleinanzeigen.de/s-notebooks/c278')) == 2
+        assert page.visits == 0
+        assert sleeps == [30.0, 18.0]
+    
+    def test_parses_response_bytes_in_their_charset(self):
+        """Should parse undecoded bodies like the decoded page."""
+        scraper = KleinanzeigenScraper()
+        html = SAMPLE_PAGE_HTML.replace('12345 Berlin', '80331 München')
+        
+        expected = scraper._parse_page(html, 'https://www.kleinanzeigen.de')
+        
+        for charset in ('utf-8', 'cp1252'):
+            assert scraper._parse_page(html.encode(charset), 'https://www.kleinanzeigen.de', charset) == expected
+        assert expected[1][0]['city'] == 'München'
+    
+    @pytest.mark.parametrize('html', [
+        None,
+        '<html><body>Bitte Captcha lösen</body></html>',
+        '<html></html>',
+    ])
+    def test_falls_back_to_browser(self, monkeypatch, html):
+        """Should render in the browser when the HTTP fetch fails, is blocked or has no listings."""
+        import scraper as scraper_module
+        monkeypatch.setattr(scraper_module.time, 'sleep', lambda seconds: None)
+        scraper = KleinanzeigenScraper(rate_limiter=TokenBucket(capacity=10, rate=1.0))
+        monkeypatch.setattr(scraper, '_fetch_html', lambda url: html and self._result(html))
+        page = TestScrapePageRetries.FakePage([200], SAMPLE_PAGE_HTML)
+        
+        listings = scraper.scrape_page(page, 'https://www.kleinanzeigen.de/s-notebooks/c278')
+        
+        assert len(listings) == 2
+        assert page.visits == 1
+    
+    def test_rejects_unknown_fetch_mode(self):
+        """Should refuse fetch modes other than http and playwright."""
+        with pytest.raises(ValueError):
+            KleinanzeigenScraper(fetch_mode='curl')
+
+
+class TestBrowserReuse:
+    """Tests for keeping the Playwright browser across open_page calls."""
+    
+    class FakePlaywright:
+        def __init__(self):
+            self.launches = 0
+            self.stopped = False
+            self.browsers = []
+            self.chromium = self
+        
+        def start(self):
+            return self
+        
+        def stop(self):
+            self.stopped = True
+        
+        def launch(self, **kwargs):
+            self.launches += 1
+            playwright = self
+            
+            class Context:
+                closed = False
+                
+                def new_page(self):
+                    return type('Page', (), {
+                        'set_default_timeout': lambda self, ms: None,
+                        'route': lambda self, pattern, handler: None,
+                    })()
+                
+                def close(self):
+                    self.closed = True
+            
+            class Browser:
+                def __init__(self):
+                    self.connected = True
+                    self.contexts = []
+                
+                def is_connected(self):
+                    return self.connected
+                
+                def new_context(self, **kwargs):
+                    self.contexts.append(Context())
+                    return self.contexts[-1]
+                
+                def close(self):
+                    self.connected = False
+            
+            playwright.browsers.append(Browser())
+            return playwright.browsers[-1]
+    
+    def test_launches_browser_once(self, monkeypatch):
+        """Should reuse the browser and only open a new context per page."""
+        import scraper as scraper_module
+        playwright = self.FakePlaywright()
+        monkeypatch.setattr(scraper_module, 'sync_playwright', lambda: playwright)
+        scraper = KleinanzeigenScraper()
+        
+        for _ in range(3):
+            with scraper.open_page():
+                pass
+        
+        assert playwright.launches == 1
+        browser = playwright.browsers[0]
+        assert len(browser.contexts) == 3
+        assert all(context.closed for context in browser.contexts)
+        
+        scraper.close()
+        assert not browser.connected
+        assert playwright.stopped
+    
+    def test_relaunches_disconnected_browser(self, monkeypatch):
+        """Should start a new browser when the cached one has gone away."""
+        import scraper as scraper_module
+        playwright = self.FakePlaywright()
+        monkeypatch.setattr(scraper_module, 'sync_playwright', lambda: playwright)
+        scraper = KleinanzeigenScraper()
+        
+        with scraper.open_page():
+            pass
+        playwright.browsers[0].connected = False
+        with scraper.open_page():
+            pass
+        
+        assert playwright.launches == 2
+        scraper.close()
+    
+    def test_closing_one_thread_keeps_other_browsers_registered(self, monkeypatch):
+        """Should let one atexit hook close browsers of threads that never called close()."""
+        import threading
+        import scraper as scraper_module
+        playwright = self.FakePlaywright()
+        monkeypatch.setattr(scraper_module, 'sync_playwright', lambda: playwright)
+        monkeypatch.setattr(scraper_module, '_open_browsers', {})
+        hooks = []
+        monkeypatch.setattr(scraper_module.atexit, 'register', hooks.append)
+        monkeypatch.setattr(scraper_module.atexit, 'unregister', hooks.remove)
+        scraper = KleinanzeigenScraper()
+        
+        with scraper.open_page():
+            pass
+        worker = threading.Thread(target=lambda: (scraper._ensure_browser(), scraper.close()))
+        worker.start()
+        worker.join()
+        
+        main_browser, worker_browser = playwright.browsers
+        assert not worker_browser.connected
+        assert main_browser.connected
+        assert hooks == [scraper_module._close_open_browsers]
+        
+        hooks[0]()
+        assert not main_browser.connected
+        assert scraper_module._open_browsers == {}
+    
+    @pytest.mark.parametrize('resource_type,aborted', [
+        ('document', False), ('script', False), ('xhr', False),
+        ('image', True), ('media', True), ('font', True), ('stylesheet', True),
+    ])
+    def test_blocks_heavy_resources(self, resource_type, aborted):
+        """Should abort images, media, fonts and stylesheets and let the rest through."""
+        calls = []
+        route = type('Route', (), {
+            'request': type('Request', (), {'resource_type': resource_type})(),
+            'abort': lambda self: calls.append('abort'),
+            'continue_': lambda self: calls.append('continue'),
+        })()
+        
+        KleinanzeigenScraper._block_heavy_resources(route)
+        
+        assert calls == (['abort'] if aborted else ['continue'])